@@ -8,6 +8,8 @@ import mimetypes
 import subprocess
 from pathlib import Path
 
+from src.utils.file_scanner import DEFAULT_SKIP_DIRS, FileScanner
+
 # Function to get the SHA256 hash of a file
 def get_file_hash(file_path):
     sha256_hash = hashlib.sha256()
@@ -35,26 +37,10 @@ def is_ignored(path, ignore_list):
 
 import sys
 
-def count_eligible_files(script_dir, ignore_list, include_hidden, skip_dirs):
-    """ Count the number of files eligible for processing. """
-    total = 0
-    for path in Path(script_dir).rglob('*'):
-        if path.is_dir() or is_ignored(path, ignore_list):
-            continue
-        if not include_hidden and path.name.startswith('.'):
-            continue
-        if any(skip_dir in path.parts for skip_dir in skip_dirs):
-            continue
-        total += 1
-    return total
-
-def update_progress_bar(total, processed):
-    """ Helper function to update the progress bar. """
-    progress = (processed / total) * 100
-    bar_length = 50  # Length of the progress bar
-    bar_filled_length = int(progress / 100 * bar_length)
-    bar = "#" * bar_filled_length + "-" * (bar_length - bar_filled_length)
-    sys.stdout.write(f'\rProgress: [{bar}] {int(progress)}%')
+def update_progress(scanner):
+    """ Report scan progress by directories and bytes; no up-front count is needed. """
+    sys.stdout.write(f'\rScanned {scanner.dirs_scanned} dirs, {scanner.files_found} files, '
+                     f'{scanner.bytes_found / (1024 * 1024):.1f} MB')
     sys.stdout.flush()
 
 
@@ -67,9 +53,9 @@ def map_files(script_dir, run_name, base_output_dir='file_tree/runs',
         ignore_list = ['archive', 'temp_files']
 
     if skip_dirs is None:
-        skip_dirs = {'bin', 'lib', 'include', '.git', '__pycache__'}
+        skip_dirs = set(DEFAULT_SKIP_DIRS)
     else:
-        skip_dirs = set(skip_dirs).union({'bin', 'lib', 'include', '.git', '__pycache__'})
+        skip_dirs = set(skip_dirs).union(DEFAULT_SKIP_DIRS)
 
     output_dir = Path(base_output_dir) / run_name
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -83,53 +69,43 @@ def map_files(script_dir, run_name, base_output_dir='file_tree/runs',
     mime_types = {}
     deep_scan_details = {}
 
-    total_files = sum(1 for path in Path(script_dir).rglob('*')
-                      if not path.is_dir() and
-                         not is_ignored(path, ignore_list) and
-                         not (not include_hidden and path.name.startswith('.')) and
-                         not any(skip_dir in path.parts for skip_dir in skip_dirs))
-
-    processed_files = 0  # Initialize processed files count
-    last_update_time = time.time()  # Initialize last update time
-
-    for path in Path(script_dir).rglob('*'):
-        if path.is_dir() or is_ignored(path, ignore_list):
-            continue
-        if not include_hidden and path.name.startswith('.'):
-            continue
-        if any(skip_dir in path.parts for skip_dir in skip_dirs):
-            continue
-        try:
-            file_stat = path.stat()
-            file_size = file_stat.st_size
-            mod_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(file_stat.st_mtime))
-            file_type = "Directory" if path.is_dir() else "File"
-            mime_type = mimetypes.guess_type(path)[0] or "Unknown"
-
-            total_files += 1
-            file_types[file_type] = file_types.get(file_type, 0) + 1
-            mime_types[mime_type] = mime_types.get(mime_type, 0) + 1
-
-            if deep_scan:
-                file_hash = get_file_hash(path)
-                git_history = get_git_commit_history(path, script_dir)
-                deep_scan_details[str(path)] = {'hash': file_hash, 'git_history': git_history}
-
-            file_detail = f'{path.relative_to(script_dir)} - Type: {file_type} MIME: {mime_type} Size: {file_size} Modified: {mod_time}'
-            with output_file.open('a') as file_out:
+    scanner = FileScanner(script_dir, skip_dirs=skip_dirs, ignore_list=ignore_list,
+                          include_hidden=include_hidden, on_directory=update_progress)
+
+    with output_file.open('w') as file_out:
+        for path, file_stat in scanner:
+            try:
+                file_size = file_stat.st_size
+                mod_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(file_stat.st_mtime))
+                file_type = "File"
+                mime_type = mimetypes.guess_type(path.name)[0] or "Unknown"
+
+                file_types[file_type] = file_types.get(file_type, 0) + 1
+                mime_types[mime_type] = mime_types.get(mime_type, 0) + 1
+
+                if deep_scan:
+                    file_hash = get_file_hash(path)
+                    git_history = get_git_commit_history(path, script_dir)
+                    deep_scan_details[str(path)] = {'hash': file_hash, 'git_history': git_history}
+
+                file_detail = f'{path.relative_to(script_dir)} - Type: {file_type} MIME: {mime_type} Size: {file_size} Modified: {mod_time}'
                 file_out.write(file_detail + '\n')
 
-            # if verbose:
-            #     print(file_detail)
+                # if verbose:
+                #     print(file_detail)
 
-        except Exception as e:
-            with error_log_file.open('a') as error_log:
-                error_log.write(f"Error processing file {path}: {e}\n")
+            except Exception as e:
+                with error_log_file.open('a') as error_log:
+                    error_log.write(f"Error processing file {path}: {e}\n")
 
-        processed_files += 1
-        update_progress_bar(total_files, processed_files)
+    if scanner.errors:
+        with error_log_file.open('a') as error_log:
+            for path, e in scanner.errors:
+                error_log.write(f"Error processing file {path}: {e}\n")
 
-    update_progress_bar(total_files, total_files)
+    update_progress(scanner)
+    print()
+    total_files = scanner.files_found
 
     with summary_file.open('w') as summary_out:
         summary_out.write(f'Total files processed: {total_files}\n')
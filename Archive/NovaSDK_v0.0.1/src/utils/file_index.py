@@ -0,0 +1,170 @@
+# src/utils/file_index.py
+# Description: Persistent stat/hash index that lets the file mappers skip rehashing unchanged files.
+
+import os
+import hashlib
+import mmap
+import sqlite3
+
+INDEX_FILENAME = '.file_index.sqlite'
+
+BLOCK_SIZE = 1024 * 1024
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    sha256 TEXT
+)
+"""
+
+
+def hash_file(file_path, block_size=BLOCK_SIZE, mmap_threshold=MMAP_THRESHOLD):
+    """
+    Calculates the SHA256 hash of a file with bounded memory.
+
+    Files smaller than mmap_threshold are read into one reused buffer of block_size bytes. Larger files
+    are memory-mapped and hashed a block at a time, so the kernel pages them in without copying.
+
+    Args:
+    file_path (str): Path to the file.
+    block_size (int): Bytes hashed per step.
+    mmap_threshold (int): Size at which the file is memory-mapped instead of read.
+
+    Returns:
+    str: The hex digest of the file contents.
+    """
+    sha256_hash = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, block_size):
+                        sha256_hash.update(view[offset:offset + block_size])
+                finally:
+                    view.release()
+        else:
+            buffer = bytearray(block_size)
+            view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                sha256_hash.update(view[:read])
+    return sha256_hash.hexdigest()
+
+
+class FileIndex:
+    """
+    Persistent (size, mtime_ns, inode, sha256) index of a scanned tree, stored in SQLite.
+
+    A scan calls check() for every file it visits and finish() once at the end. Files whose stat tuple
+    matches the stored one reuse the stored hash; only new or changed files are rehashed. finish()
+    drops files that were not seen, saves the index and returns the diff against the previous run.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(SCHEMA)
+        self.entries = {row[0]: row[1:] for row in self.conn.execute(
+            'SELECT path, size, mtime_ns, inode, sha256 FROM files')}
+        self.seen = set()
+        self.pending = []
+        self.diff = {'added': [], 'removed': [], 'modified': []}
+        self.rehashed = 0
+
+    def lookup(self, rel_path, stats):
+        """
+        Marks a file as seen and returns its indexed hash if the stat tuple is unchanged.
+
+        Args:
+        rel_path (str): Index key, usually the path relative to the scan root.
+        stats (os.stat_result): Stat result for the file.
+
+        Returns:
+        str or None: The indexed SHA256 hash, or None if the file is new, changed or was never hashed.
+        """
+        self.seen.add(rel_path)
+        previous = self.entries.get(rel_path)
+        if previous is not None and previous[:3] == (stats.st_size, stats.st_mtime_ns, stats.st_ino):
+            return previous[3]
+        return None
+
+    def record(self, rel_path, stats, sha256=None):
+        """
+        Stores the current stat tuple (and hash, if known) for a file and updates the diff.
+
+        Args:
+        rel_path (str): Index key, usually the path relative to the scan root.
+        stats (os.stat_result): Stat result for the file.
+        sha256 (str): Hash of the file, or None if it was not computed.
+        """
+        stat_key = (stats.st_size, stats.st_mtime_ns, stats.st_ino)
+        previous = self.entries.get(rel_path)
+        if sha256 is not None:
+            self.rehashed += 1
+        if previous is None:
+            self.diff['added'].append(rel_path)
+        elif previous[:3] != stat_key and (sha256 is None or previous[3] is None or previous[3] != sha256):
+            self.diff['modified'].append(rel_path)
+        elif previous[:3] == stat_key and (sha256 is None or previous[3] == sha256):
+            return
+        self.pending.append((rel_path,) + stat_key + (sha256,))
+
+    def check(self, rel_path, file_path, stats, want_hash=False, hasher=hash_file):
+        """
+        Records a visited file and returns its hash, hashing it only if the index cannot supply it.
+
+        Args:
+        rel_path (str): Index key, usually the path relative to the scan root.
+        file_path (str): Path used to read the file if it has to be hashed.
+        stats (os.stat_result): Stat result for the file.
+        want_hash (bool): Compute the hash when the index cannot supply it.
+        hasher (callable): Function used to hash the file.
+
+        Returns:
+        str or None: The SHA256 hash, or None if it was not requested and is not indexed.
+        """
+        sha256 = self.lookup(rel_path, stats)
+        previous = self.entries.get(rel_path)
+        unchanged = previous is not None and previous[:3] == (stats.st_size, stats.st_mtime_ns, stats.st_ino)
+        if unchanged and (sha256 is not None or not want_hash):
+            return sha256
+        if want_hash:
+            sha256 = hasher(file_path)
+        self.record(rel_path, stats, sha256)
+        return sha256
+
+    def finish(self):
+        """
+        Removes unseen files from the index, writes pending updates and closes the database.
+
+        Returns:
+        dict: Lists of 'added', 'removed' and 'modified' paths relative to the previous run.
+        """
+        removed = sorted(set(self.entries) - self.seen)
+        self.diff['removed'] = removed
+        with self.conn:
+            self.conn.executemany('DELETE FROM files WHERE path = ?', ((path,) for path in removed))
+            self.conn.executemany('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)', self.pending)
+        self.conn.close()
+        self.pending = []
+        return self.diff
+
+
+def write_diff(diff, output_file):
+    """Writes an index diff as a plain text report."""
+    with open(output_file, 'w') as diff_out:
+        for change in ('added', 'removed', 'modified'):
+            diff_out.write(f'{change.capitalize()}: {len(diff[change])}\n')
+            for path in diff[change]:
+                diff_out.write(f'  {path}\n')
@@ -1,38 +1,38 @@
 # srs/utils/file_mapper.py
 # Description: A Python script that maps a file structure for a given directory.
-# Use: python3 file_mapper.py -d <directory> -o <output_dir> -n <run_name> -v -s -i -r
+# Use: python3 -m src.utils.file_mapper -d <directory> -o <output_dir> -n <run_name> -v -s -i -r -w <workers>
 
 from tqdm import tqdm
 import argparse
 import time
-import hashlib
 import mimetypes
 import subprocess
 import sys
 from pathlib import Path
 
+from src.utils.deep_scan import DeepScanPool
+from src.utils.file_index import INDEX_FILENAME, FileIndex, hash_file, write_diff
+from src.utils.file_scanner import DEFAULT_SKIP_DIRS, FileScanner
+from src.utils.git_history import GitHistory
+
 class FileMapper:
     def __init__(self, script_dir, ignore_list=None, skip_dirs=None):
         self.script_dir = Path(script_dir)
         self.ignore_list = ignore_list if ignore_list else ['archive', 'temp_files']
-        self.skip_dirs = set(skip_dirs).union({'bin', 'lib', 'include', '.git', '__pycache__'}) if skip_dirs else {'bin', 'lib', 'include', '.git', '__pycache__'}
+        self.skip_dirs = set(skip_dirs).union(DEFAULT_SKIP_DIRS) if skip_dirs else set(DEFAULT_SKIP_DIRS)
 
     @staticmethod
     def get_file_hash(file_path):
         """ Calculate the SHA256 hash of a file. """
-        sha256_hash = hashlib.sha256()
-        with file_path.open("rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        return hash_file(str(file_path))
 
     @staticmethod
     def get_git_commit_history(file_path, script_dir):
         """ Get the git commit history for a file. """
         try:
-            cmd = f"git log -n 3 --pretty=format:'%h - %s (%cr)' -- {file_path}"
-            process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=script_dir)
-            stdout = process.communicate()
+            cmd = ["git", "log", "-n", "3", "--pretty=format:%h - %s (%cr)", "--", str(file_path)]
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=script_dir)
+            stdout, _ = process.communicate()
             return stdout.decode().strip() if stdout else "Not available"
         except Exception as e:
             return str(e)
@@ -63,7 +63,7 @@ class FileMapper:
                     file.write(f"File: {file_path} Hash: {details['hash']} Git History: {details['git_history']}\n")
 
 
-    def map_files(self, run_name, base_output_dir='file_tree/runs', target_dir=None, include_hidden=False, deep_scan=False, verbose=False):
+    def map_files(self, run_name, base_output_dir='file_tree/runs', target_dir=None, include_hidden=False, deep_scan=False, verbose=False, use_index=True, workers=None):
         """ Map the files in a directory. """
         if not target_dir:
           current_dir = Path.cwd()
@@ -82,59 +82,77 @@ class FileMapper:
         output_dir = self.script_dir / base_output_dir / run_name
         output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Persistent stat/hash index shared by every run under base_output_dir
+        index = FileIndex(str(self.script_dir / base_output_dir / INDEX_FILENAME)) if use_index else None
+        # One git log pass for the whole repo instead of a subprocess per file
+        git_history = GitHistory(self.script_dir) if deep_scan else None
+        hash_pool = DeepScanPool(workers=workers)
+
         file_types = {}
         mime_types = {}
         deep_scan_details = {}
         # file_details = []
 
-        total_files = sum(1 for path in self.script_dir.rglob('*')
-                          if not path.is_dir() and
-                             not self.is_ignored(path) and
-                             not (not include_hidden and path.name.startswith('.')) and
-                             not any(skip_dir in path.parts for skip_dir in self.skip_dirs))
+        # Single scandir pass; the bar advances by bytes so nothing is counted up front. Earlier runs' outputs
+        # and the index live under base_output_dir, so it is never scanned
+        scanner = FileScanner(self.script_dir, skip_dirs=self.skip_dirs, ignore_list=self.ignore_list + [str(base_output_dir)],
+                              include_hidden=include_hidden,
+                              on_directory=lambda scan: pbar.set_postfix(dirs=scan.dirs_scanned, files=scan.files_found))
 
-        # Use tqdm for the progress bar
-        with tqdm(total=total_files, desc="Processing Files", unit="file", leave=True) as pbar:
+        def jobs():
+            # Runs on the main thread; only files the index cannot supply a hash for go to the pool
+            for path, file_stat in scanner:
+                rel_path = str(path.relative_to(self.script_dir))
+                cached_hash = index.lookup(rel_path, file_stat) if index is not None else None
+                needs_hash = deep_scan and cached_hash is None
+                yield (path, rel_path, file_stat, cached_hash), str(path) if needs_hash else None, file_stat.st_size
 
-            for path in self.script_dir.rglob('*'):
-                if path.is_dir() or self.is_ignored(path):
-                    continue
-                if not include_hidden and path.name.startswith('.'):
-                    continue
-                if any(skip_dir in path.parts for skip_dir in self.skip_dirs):
-                    continue
+        with tqdm(desc="Processing Files", unit="B", unit_scale=True, leave=True) as pbar:
 
+            for (path, rel_path, file_stat, cached_hash), new_hash, error in hash_pool.map_ordered(jobs()):
                 pbar.set_description(f"Processing {path.name}")
 
                 try:
-                    file_stat = path.stat()
-                    file_size = file_stat.st_size
-                    mod_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(file_stat.st_mtime))
-                    file_type = "Directory" if path.is_dir() else "File"
-                    mime_type = mimetypes.guess_type(path)[0] or "Unknown"
+                    if error is not None:
+                        raise error
 
-                    pbar.set_postfix(file_type=file_type, mime_type=mime_type, file_size=file_size, mod_time=mod_time)
+                    file_type = "File"
+                    mime_type = mimetypes.guess_type(path.name)[0] or "Unknown"
 
                     file_types[file_type] = file_types.get(file_type, 0) + 1
                     mime_types[mime_type] = mime_types.get(mime_type, 0) + 1
 
+                    if index is not None:
+                        index.record(rel_path, file_stat, new_hash)
+
                     if deep_scan:
-                        file_hash = self.get_file_hash(path)
-                        git_history = self.get_git_commit_history(path, self.script_dir)
-                        deep_scan_details[str(path)] = {'hash': file_hash, 'git_history': git_history}
+                        deep_scan_details[str(path)] = {'hash': new_hash or cached_hash, 'git_history': git_history.get(str(path))}
 
 
                 except Exception as e:
                     tqdm.write(f"\nError processing file {path}: {e}")
 
-                pbar.update(1)
+                pbar.update(file_stat.st_size)
+
+        for path, e in scanner.errors:
+            tqdm.write(f"\nError processing file {path}: {e}")
+        total_files = scanner.files_found
+
         # Call write_file_details after processing all files
         self.write_file_details(output_dir, file_types, mime_types, deep_scan_details, verbose, deep_scan)
 
+        diff = None
+        if index is not None:
+            diff = index.finish()
+            write_diff(diff, output_dir / 'changes.txt')
+
         # self.update_progress_bar(total_files, total_files, last_update_time)
         print("\n\n=== File Processing Complete ===\n")
 
         if deep_scan:
+            stats = hash_pool.throughput()
+            print(f"Deep scan throughput: {stats['mb_per_sec']:.2f} MB/s, {stats['files_per_sec']:.1f} files/s "
+                  f"({stats['files']} files, {stats['workers']} workers)\n")
             print("=== Deep Scan Details ===\n")
             # for file, details in deep_scan_details.items():
             #     print(f"File: {file} Hash: {details['hash']} Git History: {details['git_history']}")
@@ -150,6 +168,9 @@ class FileMapper:
             print(f"File Type '{file_type}': {count} files")
         for mime_type, count in mime_types.items():
             print(f"MIME Type '{mime_type}': {count} files")
+        if diff is not None:
+            print(f"Index Changes: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+                  f"{len(diff['modified'])} modified, {index.rehashed} files hashed")
 
     @staticmethod
     def update_progress_bar(total, processed, last_update_time):
@@ -181,6 +202,8 @@ if __name__ == '__main__':
     parser.add_argument('-v', '--verbose', help='Verbose output', action='store_true')
     parser.add_argument('-s', '--deep_scan', help='Perform a deep scan', action='store_true')
     parser.add_argument('-i', '--include_hidden', help='Include hidden files', action='store_true')
+    parser.add_argument('--no_index', help='Ignore the persistent file index and rescan everything', action='store_true')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Threads used to hash files during a deep scan')
 
     # Parse arguments
     args, unknown = parser.parse_known_args()
@@ -194,4 +217,4 @@ if __name__ == '__main__':
     file_mapper = FileMapper(directory)
     file_mapper.map_files(name, base_output_dir=output, target_dir=directory,
                           include_hidden=args.include_hidden, deep_scan=args.deep_scan,
-                          verbose=args.verbose)
\ No newline at end of file
+                          verbose=args.verbose, use_index=not args.no_index, workers=args.workers)
\ No newline at end of file
@@ -0,0 +1,74 @@
+# src/utils/file_scanner.py
+# Description: Single-pass os.scandir walker shared by the file mappers.
+
+import os
+from pathlib import Path
+
+DEFAULT_SKIP_DIRS = {'bin', 'lib', 'include', '.git', '__pycache__'}
+
+
+class FileScanner:
+    """
+    Walks a directory tree once with os.scandir, yielding (path, stat_result) for every eligible file.
+
+    Skipped and ignored directories are pruned before they are opened, so nothing beneath them is listed.
+    Each DirEntry's cached is_dir()/stat() results are used, so no path is stat'ed twice. The scanner keeps
+    running totals (dirs_scanned, files_found, bytes_found) that callers can use to drive a progress bar
+    without counting the tree up front.
+    """
+
+    def __init__(self, root, skip_dirs=None, ignore_list=None, include_hidden=False, on_directory=None):
+        self.root = Path(root)
+        self.skip_dirs = set(skip_dirs) if skip_dirs is not None else set(DEFAULT_SKIP_DIRS)
+        self.ignore_list = list(ignore_list or [])
+        self.include_hidden = include_hidden
+        self.on_directory = on_directory
+        self.dirs_scanned = 0
+        self.files_found = 0
+        self.bytes_found = 0
+        self.errors = []
+
+    def is_ignored(self, path):
+        """ Check if a path matches the ignore list. """
+        for ignore_path in self.ignore_list:
+            if path.match(ignore_path):
+                return True
+        return False
+
+    def __iter__(self):
+        stack = [str(self.root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                # Symlinked directories are neither followed nor reported as files
+                                if entry.is_symlink() or entry.name in self.skip_dirs:
+                                    continue
+                                if self.ignore_list and self.is_ignored(Path(entry.path)):
+                                    continue
+                                subdirs.append(entry.path)
+                                continue
+                            if not self.include_hidden and entry.name.startswith('.'):
+                                continue
+                            path = Path(entry.path)
+                            if self.ignore_list and self.is_ignored(path):
+                                continue
+                            file_stat = entry.stat()
+                        except OSError as e:
+                            self.errors.append((entry.path, e))
+                            continue
+                        self.files_found += 1
+                        self.bytes_found += file_stat.st_size
+                        yield path, file_stat
+            except OSError as e:
+                self.errors.append((directory, e))
+                continue
+            # Reversed so the stack visits subdirectories in listing order
+            stack.extend(reversed(subdirs))
+            self.dirs_scanned += 1
+            if self.on_directory:
+                self.on_directory(self)
@@ -0,0 +1,39 @@
+import os
+import tempfile
+
+from src.utils.file_scanner import FileScanner
+
+
+def make_tree(root):
+    layout = ['a.py', '.hidden', 'pkg/b.py', 'pkg/__pycache__/b.pyc', 'archive/old.py', 'lib/x.so', 'pkg/deep/c.txt']
+    for rel in layout:
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(rel)
+
+
+def test_prunes_skipped_and_ignored_dirs():
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root)
+        scanner = FileScanner(root, ignore_list=['archive'])
+        found = sorted(os.path.relpath(path, root) for path, _ in scanner)
+        assert found == ['a.py', os.path.join('pkg', 'b.py'), os.path.join('pkg', 'deep', 'c.txt')]
+        assert scanner.dirs_scanned == 3
+        assert scanner.bytes_found == sum(len(name) for name in ['a.py', 'pkg/b.py', 'pkg/deep/c.txt'])
+
+
+def test_include_hidden_and_stat_results():
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root)
+        files = {os.path.relpath(path, root): file_stat for path, file_stat in FileScanner(root, include_hidden=True)}
+        assert '.hidden' in files
+        assert files['a.py'].st_size == os.stat(os.path.join(root, 'a.py')).st_size
+
+
+def test_directory_callback():
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root)
+        seen = []
+        list(FileScanner(root, on_directory=lambda scan: seen.append(scan.dirs_scanned)))
+        assert seen == [1, 2, 3, 4]
@@ -0,0 +1,63 @@
+# benchmark_stream_to_console.py
+# Compares the characters/second of the compiled-style stc() path against the
+# original per-character escape assembly. Pacing is disabled on both paths so
+# only formatting and write costs are measured.
+
+import argparse
+import io
+import time
+
+from stream_to_console import COLOR_CODES, RAINBOW_COLORS, stc
+
+
+def legacy_stc(message, foreground_color=None, background_color=None, rainbow_effect=False, bold=False, file=None):
+    """The pre-compilation stc() loop: style dict rebuilt per call, prefix rebuilt and printed per character."""
+    color_codes = {key: dict(value) for key, value in COLOR_CODES.items()}
+    rainbow_colors = list(RAINBOW_COLORS)
+
+    def apply_color(text, color_type, color_name):
+        return color_codes[color_type].get(color_name, color_codes[color_type]["default"]) + text
+
+    for i, char in enumerate(str(message)):
+        char_styles = ""
+        if rainbow_effect:
+            char_styles += apply_color("", "foreground", rainbow_colors[i % len(rainbow_colors)])
+        else:
+            if foreground_color:
+                char_styles += apply_color("", "foreground", foreground_color)
+            if background_color:
+                char_styles += apply_color("", "background", background_color)
+        if bold:
+            char_styles += "\033[1m"
+        print(char_styles + char + "\033[0m", end='', flush=True, file=file)
+    print(file=file)
+    print("\033[0m\033[49m", end='', flush=True, file=file)
+
+
+def measure(label, func, message, repeat, **style):
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(message, file=buffer, **style)
+    elapsed = time.perf_counter() - start
+    chars_per_sec = len(message) * repeat / elapsed
+    print(f"{label:<10} {chars_per_sec:>16,.0f} chars/sec")
+    return chars_per_sec
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark stc() rendering throughput.")
+    parser.add_argument("--length", type=int, default=200, help="Characters per message")
+    parser.add_argument("--repeat", type=int, default=2000, help="Messages per measurement")
+    args = parser.parse_args()
+
+    message = ("NovaSystem log line " * (args.length // 20 + 1))[:args.length]
+    for style in ({"foreground_color": "cyan", "bold": True}, {"rainbow_effect": True}):
+        print(f"Style: {style}")
+        legacy = measure("legacy", legacy_stc, message, args.repeat, **style)
+        compiled = measure("compiled", lambda m, **kw: stc(m, delay=0, **kw), message, args.repeat, **style)
+        print(f"Speedup: {compiled / legacy:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,160 @@
+import atexit
+import functools
+import os
+import queue
 import sys
+import threading
 import time
 
+COLOR_CODES = {
+    "foreground": {
+        "black": "\033[30m", "red": "\033[31m", "green": "\033[32m", "yellow": "\033[33m",
+        "blue": "\033[34m", "magenta": "\033[35m", "cyan": "\033[36m", "white": "\033[37m",
+        "bright_black": "\033[90m", "bright_red": "\033[91m", "bright_green": "\033[92m",
+        "bright_yellow": "\033[93m", "bright_blue": "\033[94m", "bright_magenta": "\033[95m",
+        "bright_cyan": "\033[96m", "bright_white": "\033[97m", "default": "\033[39m"
+    },
+    "background": {
+        "black": "\033[40m", "red": "\033[41m", "green": "\033[42m", "yellow": "\033[43m",
+        "blue": "\033[44m", "magenta": "\033[45m", "cyan": "\033[46m", "white": "\033[47m",
+        "bright_black": "\033[100m", "bright_red": "\033[101m", "bright_green": "\033[102m",
+        "bright_yellow": "\033[103m", "bright_blue": "\033[104m", "bright_magenta": "\033[105m",
+        "bright_cyan": "\033[106m", "bright_white": "\033[107m", "default": "\033[49m"
+    }
+}
+
+RAINBOW_COLORS = ("red", "green", "yellow", "blue", "magenta", "cyan")
+
+RESET = "\033[0m"
+
+STYLE_OPTIONS = (
+    "foreground_color", "background_color", "rainbow_effect", "bold", "underline", "invert_colors",
+    "double_underline", "hidden", "font_size", "italic", "strikethrough", "background_intensity",
+    "foreground_intensity"
+)
+
+
+def _color(color_type, color_name):
+    return COLOR_CODES[color_type].get(color_name, COLOR_CODES[color_type]["default"])
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_style(style):
+    options = dict(zip(STYLE_OPTIONS, style))
+
+    effects = ""
+    if options["bold"]:
+        effects += "\033[1m"
+    if options["underline"]:
+        effects += "\033[4m"
+    if options["invert_colors"]:
+        effects += "\033[7m"
+    if options["double_underline"]:
+        effects += "\033[21m"
+    if options["hidden"]:
+        effects += "\033[8m"
+    if options["font_size"] is not None:
+        effects += f"\033[{options['font_size']}m"
+    if options["italic"]:
+        effects += "\033[3m"
+    if options["strikethrough"]:
+        effects += "\033[9m"
+    if options["foreground_intensity"] == "high":
+        effects += "\033[1m"
+    elif options["foreground_intensity"] == "low":
+        effects += "\033[2m"
+    if options["background_intensity"] == "high":
+        effects += "\033[101m"
+    elif options["background_intensity"] == "low":
+        effects += "\033[100m"
+
+    if options["rainbow_effect"]:
+        return tuple(_color("foreground", color) + effects for color in RAINBOW_COLORS)
+
+    colors = ""
+    if options["foreground_color"]:
+        colors += _color("foreground", options["foreground_color"])
+    if options["background_color"]:
+        colors += _color("background", options["background_color"])
+    return (colors + effects,)
+
+
+# Codes that color the cell background; a newline written while one is active fills the rest of the line
+_BACKGROUND_CODES = tuple(code for name, code in COLOR_CODES["background"].items() if name != "default")
+_BACKGROUND_CODES += ("\033[7m",)
+
+
+@functools.lru_cache(maxsize=256)
+def _fills_background(prefixes):
+    return any(code in prefix for prefix in prefixes for code in _BACKGROUND_CODES)
+
+
+def compile_style(**style):
+    """
+    Resolves stc() style options into the ANSI prefixes used to render text.
+
+    The result is cached by style, so repeated calls with the same options are a dictionary lookup.
+
+    Parameters:
+        **style: Any of the stc() style keyword arguments (foreground_color, bold, rainbow_effect, ...).
+
+    Returns:
+        tuple: One prefix per rainbow color when rainbow_effect is set, otherwise a single prefix.
+    """
+    unknown = set(style) - set(STYLE_OPTIONS)
+    if unknown:
+        raise TypeError(f"Unknown style option(s): {', '.join(sorted(unknown))}")
+    defaults = {"font_size": None, "foreground_color": None, "background_color": None,
+                "background_intensity": None, "foreground_intensity": None}
+    return _compile_style(tuple(style.get(name, defaults.get(name, False)) for name in STYLE_OPTIONS))
+
+
+def write_styled(text, prefixes, delay=0, file=sys.stdout):
+    """
+    Writes text using compiled style prefixes, emitting a single prefix/reset pair per run.
+
+    Parameters:
+        text (str): The text to write.
+        prefixes (tuple): Prefixes returned by compile_style().
+        delay (float): Delay between each character in seconds. 0 writes the whole run at once.
+        file (object): The file object to write the output to. Default is sys.stdout.
+
+    Returns:
+        None
+    """
+    if not text:
+        return
+
+    if len(prefixes) == 1:
+        if not delay:
+            file.write(prefixes[0] + text + RESET)
+            return
+        file.write(prefixes[0])
+        for char in text:
+            file.write(char)
+            file.flush()
+            time.sleep(delay)
+        file.write(RESET)
+        return
+
+    count = len(prefixes)
+    if not delay:
+        file.write("".join(prefixes[i % count] + char for i, char in enumerate(text)) + RESET)
+        return
+    for i, char in enumerate(text):
+        file.write(prefixes[i % count] + char)
+        file.flush()
+        time.sleep(delay)
+    file.write(RESET)
+
+
 def stc(message, delay=0.035, foreground_color=None, background_color=None, rainbow_effect=False, bold=False, underline=False, invert_colors=False, double_underline=False, hidden=False, font_size=None, italic=False, strikethrough=False, background_intensity=None, foreground_intensity=None, end='\n', flush=False, file=sys.stdout):
     """
     Streams a message to the console character by character with optional delay, colors, and effects.
 
     Parameters:
         message (str): The message to be streamed.
-        delay (float): Delay between each character display in seconds. Default is 0.035 seconds.
+        delay (float): Delay between each character display in seconds. Default is 0.035 seconds. 0 disables pacing.
         foreground_color (str): Optional foreground color for the text.
         background_color (str): Optional background color for the text.
         rainbow_effect (bool): If True, applies a dynamic rainbow color effect to the text.
@@ -28,74 +175,18 @@ def stc(message, delay=0.035, foreground_color=None, background_color=None, rain
     Returns:
         None
     """
-    color_codes = {
-        "foreground": {
-            "black": "\033[30m", "red": "\033[31m", "green": "\033[32m", "yellow": "\033[33m",
-            "blue": "\033[34m", "magenta": "\033[35m", "cyan": "\033[36m", "white": "\033[37m",
-            "bright_black": "\033[90m", "bright_red": "\033[91m", "bright_green": "\033[92m",
-            "bright_yellow": "\033[93m", "bright_blue": "\033[94m", "bright_magenta": "\033[95m",
-            "bright_cyan": "\033[96m", "bright_white": "\033[97m", "default": "\033[39m"
-        },
-        "background": {
-            "black": "\033[40m", "red": "\033[41m", "green": "\033[42m", "yellow": "\033[43m",
-            "blue": "\033[44m", "magenta": "\033[45m", "cyan": "\033[46m", "white": "\033[47m",
-            "bright_black": "\033[100m", "bright_red": "\033[101m", "bright_green": "\033[102m",
-            "bright_yellow": "\033[103m", "bright_blue": "\033[104m", "bright_magenta": "\033[105m",
-            "bright_cyan": "\033[106m", "bright_white": "\033[107m", "default": "\033[49m"
-        }
-    }
-
-    rainbow_colors = ["red", "green", "yellow", "blue", "magenta", "cyan"]
-
-    def apply_color(text, color_type, color_name):
-        return color_codes[color_type].get(color_name, color_codes[color_type]["default"]) + text
-
-
     try:
         message = str(message)
-        delay = max(0.0001, min(delay, 1.0))
+        delay = max(0.0001, min(delay, 1.0)) if delay > 0 else 0
 
-        for i, char in enumerate(message):
-            char_styles = ""
-
-            if rainbow_effect:
-                fg_color = rainbow_colors[i % len(rainbow_colors)]
-                char_styles += apply_color("", "foreground", fg_color)
-            else:
-                if foreground_color:
-                    char_styles += apply_color("", "foreground", foreground_color)
-                if background_color:
-                    char_styles += apply_color("", "background", background_color)
-
-            if bold:
-                char_styles += "\033[1m"
-            if underline:
-                char_styles += "\033[4m"
-            if invert_colors:
-                char_styles += "\033[7m"
-            if double_underline:
-                char_styles += "\033[21m"
-            if hidden:
-                char_styles += "\033[8m"
-            if font_size is not None:
-                char_styles += f"\033[{font_size}m"
-            if italic:
-                char_styles += "\033[3m"
-            if strikethrough:
-                char_styles += "\033[9m"
-            if foreground_intensity == "high":
-                char_styles += "\033[1m"
-            elif foreground_intensity == "low":
-                char_styles += "\033[2m"
-            if background_intensity == "high":
-                char_styles += "\033[101m"
-            elif background_intensity == "low":
-                char_styles += "\033[100m"
-
-            print(char_styles + char + "\033[0m", end='', flush=True, file=file)
-            time.sleep(delay)
-
-        print(end=end, file=file)
+        prefixes = compile_style(
+            foreground_color=foreground_color, background_color=background_color, rainbow_effect=rainbow_effect,
+            bold=bold, underline=underline, invert_colors=invert_colors, double_underline=double_underline,
+            hidden=hidden, font_size=font_size, italic=italic, strikethrough=strikethrough,
+            background_intensity=background_intensity, foreground_intensity=foreground_intensity
+        )
+        write_styled(message, prefixes, delay=delay, file=file)
+        file.write(end)
 
     except Exception as e:
         print(f"Error in stc: {e}", file=sys.stderr)
@@ -104,6 +195,193 @@ def stc(message, delay=0.035, foreground_color=None, background_color=None, rain
         # Reset all styles
         print("\033[0m\033[49m", end='', flush=True, file=file)
 
+def is_headless(file=sys.stdout):
+    """
+    Returns True when output should not be paced: the file is not a TTY, or we are running under CI or pytest.
+    """
+    if os.environ.get("CI") or "PYTEST_CURRENT_TEST" in os.environ:
+        return True
+    isatty = getattr(file, "isatty", None)
+    return not (isatty and isatty())
+
+
+class StreamRenderer:
+    """
+    Renders stc() messages on a background thread so callers never sleep.
+
+    Messages are queued by submit() and the renderer thread writes them at chars_per_frame characters every
+    frame_interval seconds. Whatever is queued when a frame starts is coalesced, so adjacent messages with the
+    same style share one prefix/reset pair. The end of a message with a background color is written after its
+    reset, so the color stops at the text. In headless mode everything queued is written immediately.
+
+    Parameters:
+        chars_per_frame (int): Characters written per frame. Default is 1.
+        frame_interval (float): Seconds between frames. Default is 0.035 seconds, matching stc().
+        file (object): The file object to write the output to. Default is sys.stdout.
+        headless (bool): Skip pacing. Default is None, which detects it with is_headless().
+    """
+
+    def __init__(self, chars_per_frame=1, frame_interval=0.035, file=None, headless=None):
+        self.chars_per_frame = max(1, int(chars_per_frame))
+        self.frame_interval = max(0.0, frame_interval)
+        self.file = file if file is not None else sys.stdout
+        self.headless = is_headless(self.file) if headless is None else headless
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, message, end='\n', **style):
+        """
+        Queues a message for rendering and returns immediately.
+
+        Parameters:
+            message (str): The message to be streamed.
+            end (str): The end character(s) written after the message. Default is '\n'.
+            **style: Any of the stc() style keyword arguments.
+
+        Returns:
+            None
+        """
+        item = (compile_style(**style), str(message), end)
+        # Checked and queued under the lock close() takes, so nothing can land behind its stop sentinel
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("StreamRenderer is closed")
+            self._ensure_started()
+            self._queue.put(item)
+
+    def drain(self, timeout=None):
+        """
+        Blocks until every message submitted so far has been written.
+
+        Parameters:
+            timeout (float): Maximum seconds to wait. Default is None (wait forever).
+
+        Returns:
+            bool: True if the queue drained, False if the timeout expired first.
+        """
+        if timeout is None:
+            self._queue.join()
+            return True
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    flush = drain
+
+    def close(self):
+        """Drains pending output and stops the renderer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            thread.join()
+
+    def _ensure_started(self):
+        # Called with self._lock held
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="stc-renderer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            try:
+                self._render([item for item in batch if item is not None])
+            except Exception as e:
+                print(f"Error in stc renderer: {e}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _render(self, items):
+        segments = []
+        for prefixes, text, end in items:
+            if end and not _fills_background(prefixes):
+                # end joins the styled run so it never splits a run of same-style messages
+                text, end = text + end, ""
+            if text:
+                if segments and len(prefixes) == 1 and segments[-1][0] == prefixes:
+                    segments[-1] = (prefixes, segments[-1][1] + text)
+                else:
+                    segments.append((prefixes, text))
+            if end:
+                # Written unstyled, after the reset, so the background stops at the end of the message
+                if segments and segments[-1][0] is None:
+                    segments[-1] = (None, segments[-1][1] + end)
+                else:
+                    segments.append((None, end))
+
+        file = self.file
+        for prefixes, text in segments:
+            if prefixes is None:
+                file.write(text)
+                continue
+            if self.headless or not self.frame_interval:
+                write_styled(text, prefixes, file=file)
+                continue
+            if len(prefixes) == 1:
+                opening, cells = prefixes[0], text
+            else:
+                opening, cells = "", [prefixes[i % len(prefixes)] + char for i, char in enumerate(text)]
+            file.write(opening)
+            for i in range(0, len(cells), self.chars_per_frame):
+                file.write("".join(cells[i:i + self.chars_per_frame]))
+                file.flush()
+                time.sleep(self.frame_interval)
+            file.write(RESET)
+        file.flush()
+
+
+_default_renderer = None
+_default_renderer_lock = threading.Lock()
+
+
+def get_renderer():
+    """Returns the shared StreamRenderer used by stc_async(), creating it on first use."""
+    global _default_renderer
+    if _default_renderer is None:
+        with _default_renderer_lock:
+            if _default_renderer is None:
+                _default_renderer = StreamRenderer()
+                atexit.register(_default_renderer.close)
+    return _default_renderer
+
+
+def stc_async(message, end='\n', **style):
+    """
+    Non-blocking stc(): queues the message on the shared renderer and returns immediately.
+
+    Call drain() before exiting or reading the output back if ordering with other writes matters.
+    """
+    get_renderer().submit(message, end=end, **style)
+
+
+def drain(timeout=None):
+    """Waits until everything queued with stc_async() has been written."""
+    if _default_renderer is None:
+        return True
+    return _default_renderer.drain(timeout)
+
+
 def tutorial():
     stc("Welcome to the Stream to Console (stc) Tutorial!", delay=0.02, foreground_color="magenta", bold=True)
     stc("This tutorial will guide you on how to use the stc function in your own projects.", delay=0.02)
@@ -0,0 +1,119 @@
+import io
+import re
+import threading
+import time
+import unittest
+
+from stream_to_console import RESET, StreamRenderer, compile_style, is_headless, stc, write_styled
+
+ANSI = re.compile(r"\033\[\d+m")
+
+
+class TestCompiledStyles(unittest.TestCase):
+    def test_prefix_matches_style_order(self):
+        prefixes = compile_style(foreground_color="red", background_color="blue", bold=True, italic=True)
+        self.assertEqual(prefixes, ("\033[31m\033[44m\033[1m\033[3m",))
+
+    def test_unknown_color_falls_back_to_default(self):
+        self.assertEqual(compile_style(foreground_color="nope"), ("\033[39m",))
+
+    def test_compiled_styles_are_cached(self):
+        self.assertIs(compile_style(foreground_color="green", bold=True),
+                      compile_style(bold=True, foreground_color="green"))
+
+    def test_rainbow_has_one_prefix_per_color(self):
+        prefixes = compile_style(rainbow_effect=True, underline=True)
+        self.assertEqual(len(prefixes), 6)
+        self.assertTrue(all(prefix.endswith("\033[4m") for prefix in prefixes))
+
+    def test_unknown_option_raises(self):
+        with self.assertRaises(TypeError):
+            compile_style(sparkle=True)
+
+
+class TestWriter(unittest.TestCase):
+    def test_run_uses_single_prefix_and_reset(self):
+        buffer = io.StringIO()
+        write_styled("hello", compile_style(foreground_color="cyan"), file=buffer)
+        self.assertEqual(buffer.getvalue(), "\033[36mhello" + RESET)
+
+    def test_rainbow_run(self):
+        buffer = io.StringIO()
+        write_styled("ab", compile_style(rainbow_effect=True), file=buffer)
+        self.assertEqual(buffer.getvalue(), "\033[31ma\033[32mb" + RESET)
+
+    def test_stc_visible_text_unchanged(self):
+        for delay in (0, 0.0001):
+            buffer = io.StringIO()
+            stc("Hello, World!", delay=delay, foreground_color="green", bold=True, file=buffer)
+            self.assertEqual(ANSI.sub("", buffer.getvalue()), "Hello, World!\n")
+
+
+class TestStreamRenderer(unittest.TestCase):
+    def test_headless_when_not_a_tty(self):
+        self.assertTrue(is_headless(io.StringIO()))
+
+    def test_submit_returns_before_paced_output_is_written(self):
+        buffer = io.StringIO()
+        renderer = StreamRenderer(frame_interval=0.01, file=buffer, headless=False)
+        start = time.perf_counter()
+        renderer.submit("x" * 50)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertTrue(renderer.drain(timeout=5))
+        self.assertEqual(ANSI.sub("", buffer.getvalue()), "x" * 50 + "\n")
+        renderer.close()
+
+    def test_messages_render_in_submission_order(self):
+        buffer = io.StringIO()
+        renderer = StreamRenderer(file=buffer, headless=True)
+        for i in range(100):
+            renderer.submit(i, end=" ", foreground_color="red")
+        renderer.close()
+        self.assertEqual(ANSI.sub("", buffer.getvalue()), " ".join(str(i) for i in range(100)) + " ")
+
+    def test_same_style_lines_share_one_reset(self):
+        buffer = io.StringIO()
+        renderer = StreamRenderer(file=buffer, headless=True)
+        red = compile_style(foreground_color="red")
+        renderer._render([(red, "one", "\n"), (red, "two", "\n"), (compile_style(), "plain", "\n")])
+        self.assertEqual(buffer.getvalue(), "\033[31mone\ntwo\n" + RESET + "plain\n" + RESET)
+
+    def test_end_is_written_after_reset_when_background_is_set(self):
+        buffer = io.StringIO()
+        renderer = StreamRenderer(file=buffer, headless=True)
+        on_blue = compile_style(background_color="blue")
+        renderer._render([(on_blue, "one", "\n"), (on_blue, "two", "\n")])
+        self.assertEqual(buffer.getvalue(), "\033[44mone" + RESET + "\n\033[44mtwo" + RESET + "\n")
+
+    def test_submit_racing_close_never_strands_messages(self):
+        renderer = StreamRenderer(file=io.StringIO(), headless=True)
+        rejected = []
+
+        def submit_many():
+            for i in range(200):
+                try:
+                    renderer.submit(i)
+                except RuntimeError:
+                    rejected.append(i)
+                    return
+
+        threads = [threading.Thread(target=submit_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        renderer.close()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(renderer.drain(timeout=5))
+        with self.assertRaises(RuntimeError):
+            renderer.submit("late")
+
+    def test_drain_timeout(self):
+        renderer = StreamRenderer(frame_interval=0.05, file=io.StringIO(), headless=False)
+        renderer.submit("slow message")
+        self.assertFalse(renderer.drain(timeout=0.01))
+        self.assertTrue(renderer.drain())
+        renderer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
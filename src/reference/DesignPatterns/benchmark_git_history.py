@@ -0,0 +1,75 @@
+# benchmark_git_history.py
+# Builds a synthetic repository and compares one `git log` per file against a
+# single GitHistory pass over the whole log.
+# Use: python3 benchmark_git_history.py --files 3000 --commits 2000
+
+import argparse
+import random
+import subprocess
+import tempfile
+import time
+
+from git_history import GitHistory
+
+
+def build_repo(repo_dir, files, commits, files_per_commit=5, seed=0):
+    """Creates `commits` commits over `files` files with git fast-import, so setup takes seconds."""
+    rng = random.Random(seed)
+    subprocess.run(['git', 'init', '-q', repo_dir], check=True)
+    paths = [f'pkg{i % 50}/module {i}.py' for i in range(files)]
+    stream = []
+    for n in range(commits):
+        touched = paths if n == 0 else rng.sample(paths, files_per_commit)
+        message = f'commit {n}'
+        stream.append(f'commit refs/heads/main\ncommitter Bench <bench@example.com> {1700000000 + n} +0000\n'
+                      f'data {len(message)}\n{message}\n')
+        for path in touched:
+            content = f'# {path} revision {n}\n'
+            stream.append(f'M 100644 inline "{path}"\ndata {len(content)}\n{content}\n')
+    subprocess.run(['git', 'fast-import', '--quiet'], cwd=repo_dir, input=''.join(stream).encode(), check=True)
+    subprocess.run(['git', 'checkout', '-q', 'main'], cwd=repo_dir, check=True)
+    return paths
+
+
+def per_file_history(repo_dir, paths):
+    results = {}
+    for path in paths:
+        cmd = ['git', 'log', '-n', '3', '--pretty=format:%h - %s (%cr)', '--', path]
+        results[path] = subprocess.run(cmd, cwd=repo_dir, stdout=subprocess.PIPE, text=True).stdout.strip()
+    return results
+
+
+def batch_history(repo_dir, paths):
+    history = GitHistory(repo_dir)
+    return {path: history.get(path) for path in paths}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-file git log against GitHistory.')
+    parser.add_argument('--files', type=int, default=3000)
+    parser.add_argument('--commits', type=int, default=2000)
+    parser.add_argument('--sample', type=int, default=None, help='Time the per-file path on this many files and extrapolate')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as repo_dir:
+        start = time.perf_counter()
+        paths = build_repo(repo_dir, args.files, args.commits)
+        print(f"Built repo with {args.files} files and {args.commits} commits in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        batch = batch_history(repo_dir, paths)
+        batch_time = time.perf_counter() - start
+
+        sample = paths[:args.sample] if args.sample else paths
+        start = time.perf_counter()
+        per_file = per_file_history(repo_dir, sample)
+        per_file_time = (time.perf_counter() - start) * len(paths) / len(sample)
+
+        mismatches = sum(1 for path in sample if per_file[path] != batch[path])
+        print(f"Per-file git log: {per_file_time:8.2f}s" + (" (extrapolated)" if args.sample else ""))
+        print(f"GitHistory:       {batch_time:8.2f}s")
+        print(f"Speedup:          {per_file_time / batch_time:8.1f}x ({mismatches} mismatching files)")
+
+
+if __name__ == '__main__':
+    main()
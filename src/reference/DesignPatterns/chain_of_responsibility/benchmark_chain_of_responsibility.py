@@ -0,0 +1,59 @@
+# benchmark_chain_of_responsibility.py
+# Measures routing cost through a 100-handler chain, linked versus compiled,
+# for requests handled at the head, at the tail, and left unhandled.
+# Use: python3 benchmark_chain_of_responsibility.py --handlers 100 --requests 100000
+
+import argparse
+import random
+import time
+
+from chain_of_responsibility import AIModelHandler, DataPreprocessingHandler, VisualizationHandler
+
+
+def build_chain(count):
+    """A chain cycling through the three concrete handler kinds, each accepting its own numbered operation."""
+    kinds = [(AIModelHandler, "Train"), (DataPreprocessingHandler, "Preprocess"), (VisualizationHandler, "Visualize")]
+    handlers = []
+    for i in range(count):
+        kind, operation = kinds[i % len(kinds)]
+        handler = kind()
+        handler.accepts = (f"{operation}-{i}",)
+        handlers.append(handler)
+    for handler, next_handler in zip(handlers, handlers[1:]):
+        handler.set_next(next_handler)
+    return handlers
+
+
+def measure(route, requests):
+    start = time.perf_counter()
+    route(requests)
+    return (time.perf_counter() - start) / len(requests) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark linked versus compiled handler chains")
+    parser.add_argument("--handlers", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=100000)
+    args = parser.parse_args()
+
+    handlers = build_chain(args.handlers)
+    head = handlers[0]
+    compiled = head.compile()
+    keys = [handler.accepts[0] for handler in handlers]
+    workloads = {
+        "head": [keys[0]] * args.requests,
+        "tail": [keys[-1]] * args.requests,
+        "random": [random.choice(keys) for _ in range(args.requests)],
+        "unhandled": ["Deploy"] * args.requests,
+    }
+
+    print(f"{'workload':>10} {'linked ns':>10} {'compiled ns':>12} {'handle_many ns':>15}")
+    for name, requests in workloads.items():
+        linked = measure(lambda batch: [head.handle(request) for request in batch], requests)
+        single = measure(lambda batch: [compiled.handle(request) for request in batch], requests)
+        many = measure(compiled.handle_many, requests)
+        print(f"{name:>10} {linked:>10.0f} {single:>12.0f} {many:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Hashable, Iterable, List, Optional, Tuple
 
 class Handler(ABC):
     """
@@ -16,39 +16,126 @@ class Handler(ABC):
 class AbstractHandler(Handler):
     """
     Default chaining behavior implementation.
+
+    Handlers declare what they accept either as request keys in `accepts` or, for anything a key cannot
+    express, by overriding can_handle(). process() does the work for an accepted request. handle() walks
+    the linked chain; compile() builds a CompiledChain that routes keyed requests with one dict lookup.
     """
     _next_handler: Handler = None
+    accepts: Tuple[Hashable, ...] = ()
 
     def set_next(self, handler: 'Handler') -> 'Handler':
         self._next_handler = handler
         return handler
 
+    def can_handle(self, request: Any) -> bool:
+        return request in self.accepts
+
+    def process(self, request: Any) -> Optional[str]:
+        return None
+
     def handle(self, request: Any) -> Optional[str]:
+        if self.can_handle(request):
+            return self.process(request)
         if self._next_handler:
             return self._next_handler.handle(request)
         return None
 
+    def compile(self) -> 'CompiledChain':
+        return CompiledChain.from_chain(self)
+
+class CompiledChain:
+    """
+    A handler chain flattened into a dispatch index.
+
+    Each key in a keyed handler's `accepts` maps to the first handler in chain order that accepts it, so
+    routing a keyed request is a dict lookup rather than a walk. Handlers that override can_handle() keep
+    their chain position: a request is offered to the predicate handlers that come before its keyed
+    handler (or to all of them if no key matches), in order, which gives the same answer as the linked
+    chain. Unhandled keyed requests only pay for the predicate handlers, not the whole chain.
+
+    The index is built once; recompile after changing the chain.
+    """
+
+    def __init__(self, handlers: Iterable[AbstractHandler]) -> None:
+        self.handlers: List[AbstractHandler] = list(handlers)
+        self._index = {}
+        self._predicates = []
+        for position, handler in enumerate(self.handlers):
+            if type(handler).handle is not AbstractHandler.handle:
+                raise TypeError(f"{type(handler).__name__} overrides handle(); declare accepts or can_handle() "
+                                f"and implement process() to use it in a compiled chain")
+            if type(handler).can_handle is AbstractHandler.can_handle:
+                for key in handler.accepts:
+                    self._index.setdefault(key, (position, handler))
+            else:
+                self._predicates.append((position, handler))
+        self._unreachable = (len(self.handlers), None)
+
+    @classmethod
+    def from_chain(cls, head: AbstractHandler) -> 'CompiledChain':
+        handlers = []
+        handler = head
+        while handler is not None:
+            handlers.append(handler)
+            handler = handler._next_handler
+        return cls(handlers)
+
+    def handle(self, request: Any) -> Optional[str]:
+        try:
+            position, handler = self._index.get(request, self._unreachable)
+        except TypeError:
+            # Unhashable requests can only be matched by predicates
+            position, handler = self._unreachable
+        for predicate_position, predicate in self._predicates:
+            if predicate_position > position:
+                break
+            if predicate.can_handle(request):
+                return predicate.process(request)
+        if handler is not None:
+            return handler.process(request)
+        return None
+
+    def handle_many(self, requests: Iterable[Any]) -> List[Optional[str]]:
+        """
+        Routes a batch of requests.
+
+        Returns:
+        list: One result per request, in order (None where the request was unhandled).
+        """
+        if self._predicates:
+            handle = self.handle
+            return [handle(request) for request in requests]
+        # Without predicates each request is a single lookup
+        index_get = self._index.get
+        unreachable = self._unreachable
+        results = []
+        for request in requests:
+            try:
+                handler = index_get(request, unreachable)[1]
+            except TypeError:
+                handler = None
+            results.append(handler.process(request) if handler is not None else None)
+        return results
+
 # Concrete Handlers
 class AIModelHandler(AbstractHandler):
-    def handle(self, request: Any) -> str:
-        if request == "Train":
-            return f"AIModelHandler: Training model with {request}"
-        else:
-            return super().handle(request)
+    accepts = ("Train",)
+
+    def process(self, request: Any) -> str:
+        return f"AIModelHandler: Training model with {request}"
 
 class DataPreprocessingHandler(AbstractHandler):
-    def handle(self, request: Any) -> str:
-        if request == "Preprocess":
-            return f"DataPreprocessingHandler: Preprocessing {request}"
-        else:
-            return super().handle(request)
+    accepts = ("Preprocess",)
+
+    def process(self, request: Any) -> str:
+        return f"DataPreprocessingHandler: Preprocessing {request}"
 
 class VisualizationHandler(AbstractHandler):
-    def handle(self, request: Any) -> str:
-        if request == "Visualize":
-            return f"VisualizationHandler: Visualizing data with {request}"
-        else:
-            return super().handle(request)
+    accepts = ("Visualize",)
+
+    def process(self, request: Any) -> str:
+        return f"VisualizationHandler: Visualizing data with {request}"
 
 # Client code example
 def client_code(handler: Handler) -> None:
@@ -70,3 +157,6 @@ if __name__ == "__main__":
 
     print("Chain: AI Model > Data Preprocessing > Visualization")
     client_code(ai_model_handler)
+
+    print("\n\nCompiled chain: AI Model > Data Preprocessing > Visualization")
+    client_code(ai_model_handler.compile())
@@ -1,4 +1,7 @@
+import unittest
+
 from chain_of_responsibility import AIModelHandler, DataPreprocessingHandler, VisualizationHandler, AbstractHandler
+from chain_of_responsibility import CompiledChain
 
 def test_individual_handler(handler: AbstractHandler, request: str):
     result = handler.handle(request)
@@ -15,6 +18,53 @@ def test_full_chain(chain_head: AbstractHandler, request: str):
     else:
         print("Request was left unhandled by the full chain.")
 
+class LongPromptHandler(AbstractHandler):
+    """ A predicate handler: accepts any string request longer than ten characters. """
+    def can_handle(self, request):
+        return isinstance(request, str) and len(request) > 10
+
+    def process(self, request):
+        return f"LongPromptHandler: {len(request)} characters"
+
+class TestCompiledChain(unittest.TestCase):
+    def build(self, *handlers):
+        for handler, next_handler in zip(handlers, handlers[1:]):
+            handler.set_next(next_handler)
+        return handlers[0]
+
+    def assert_same_as_linked(self, head, requests):
+        compiled = head.compile()
+        expected = [head.handle(request) for request in requests]
+        self.assertEqual([compiled.handle(request) for request in requests], expected)
+        self.assertEqual(compiled.handle_many(requests), expected)
+
+    def test_keyed_chain_matches_linked_chain(self):
+        head = self.build(AIModelHandler(), DataPreprocessingHandler(), VisualizationHandler())
+        self.assert_same_as_linked(head, ["Train", "Preprocess", "Visualize", "Deploy", ["unhashable"]])
+
+    def test_predicate_handlers_keep_their_position(self):
+        """ A predicate before a keyed handler wins; one after it only sees what the keys miss. """
+        head = self.build(AIModelHandler(), LongPromptHandler(), VisualizationHandler())
+        requests = ["Train", "Visualize", "Visualize everything", "Summarize this text", "short", ["x"]]
+        self.assert_same_as_linked(head, requests)
+        self.assertTrue(head.compile().handle("Visualize everything").startswith("LongPromptHandler"))
+
+    def test_first_handler_for_a_key_wins(self):
+        class SecondTrainer(AIModelHandler):
+            def process(self, request):
+                return "second"
+
+        head = self.build(AIModelHandler(), SecondTrainer())
+        self.assertEqual(head.compile().handle("Train"), "AIModelHandler: Training model with Train")
+
+    def test_handlers_overriding_handle_are_rejected(self):
+        class LegacyHandler(AbstractHandler):
+            def handle(self, request):
+                return "legacy" if request == "Old" else super().handle(request)
+
+        with self.assertRaises(TypeError):
+            CompiledChain([AIModelHandler(), LegacyHandler()])
+
 def main():
     # Setting up individual handlers
     ai_model_handler = AIModelHandler()
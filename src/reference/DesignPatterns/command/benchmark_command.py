@@ -0,0 +1,57 @@
+# Measures QueuedInvoker throughput for small commands with and without batching.
+# Use: python benchmark_command.py --commands 100000 --workers 1 4 --max_batch 1 64
+
+import argparse
+import threading
+import time
+
+from command import Command, QueuedInvoker
+
+class Increment(Command):
+    def __init__(self, target, batchable):
+        self.target = target
+        self.batchable = batchable
+
+    def execute(self):
+        with self.target["lock"]:
+            self.target["value"] += 1
+
+    def batch_key(self):
+        return id(self.target) if self.batchable else None
+
+    @classmethod
+    def execute_batch(cls, commands):
+        target = commands[0].target
+        with target["lock"]:
+            target["value"] += len(commands)
+        return [None] * len(commands)
+
+def run(commands, workers, max_batch, receivers):
+    targets = [{"value": 0, "lock": threading.Lock()} for _ in range(receivers)]
+    invoker = QueuedInvoker(workers=workers, max_batch=max_batch)
+    start = time.perf_counter()
+    for i in range(commands):
+        invoker.submit(Increment(targets[i % receivers], max_batch > 1), priority=i % 4)
+    invoker.join()
+    elapsed = time.perf_counter() - start
+    invoker.shutdown()
+    assert sum(t["value"] for t in targets) == commands
+    metrics = invoker.metrics()["Increment"]
+    return elapsed, metrics["batches"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark QueuedInvoker throughput.")
+    parser.add_argument("--commands", type=int, default=100000, help="Commands to queue per run")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="Worker pool sizes")
+    parser.add_argument("--max_batch", type=int, nargs="+", default=[1, 64], help="Batch limits (1 = no batching)")
+    parser.add_argument("--receivers", type=int, default=8, help="Distinct receivers commands are spread over")
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        for max_batch in args.max_batch:
+            elapsed, batches = run(args.commands, workers, max_batch, args.receivers)
+            print(f"workers={workers} max_batch={max_batch}: {args.commands / elapsed:,.0f} commands/s "
+                  f"({batches} batches, {elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,37 @@
+import heapq
+import itertools
+import json
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, List, Optional
 
 class Command(ABC):
     """
     The Command interface declares a method for executing a command.
+
+    Commands can opt into batching by returning a batch key: queued commands of the same class with equal
+    keys may be run together through execute_batch(). Commands that set undoable = True and override undo()
+    are recorded in the QueuedInvoker's journal.
     """
+    undoable = False
+
     @abstractmethod
     def execute(self) -> None:
         pass
 
+    def undo(self) -> None:
+        """Reverses execute(). Only called on commands whose class sets undoable = True."""
+
+    def batch_key(self) -> Optional[Hashable]:
+        return None
+
+    @classmethod
+    def execute_batch(cls, commands: List['Command']) -> List[Any]:
+        return [command.execute() for command in commands]
+
 class SimpleCommand(Command):
     """
     Some commands can implement simple operations on their own.
@@ -32,6 +56,16 @@ class ComplexCommand(Command):
         self._receiver.do_something(self._a)
         self._receiver.do_something_else(self._b)
 
+    def batch_key(self) -> Hashable:
+        # Complex commands aimed at the same receiver can share one delegation
+        return id(self._receiver)
+
+    @classmethod
+    def execute_batch(cls, commands: List['ComplexCommand']) -> List[Any]:
+        print(f"ComplexCommand: Delegating {len(commands)} complex tasks to a receiver object at once")
+        commands[0]._receiver.do_batch([(command._a, command._b) for command in commands])
+        return [None] * len(commands)
+
 class Receiver:
     """
     The Receiver class contains important business logic.
@@ -42,6 +76,11 @@ class Receiver:
     def do_something_else(self, b: str) -> None:
         print(f"Receiver: Also working on ({b}).")
 
+    def do_batch(self, work: List[tuple]) -> None:
+        for a, b in work:
+            self.do_something(a)
+            self.do_something_else(b)
+
 class Invoker:
     """
     The Invoker is associated with commands and sends requests to the command.
@@ -66,6 +105,215 @@ class Invoker:
         if isinstance(self._on_finish, Command):
             self._on_finish.execute()
 
+class _Batch:
+    __slots__ = ("key", "entries", "priority", "taken")
+
+    def __init__(self, key, priority):
+        self.key = key
+        self.entries = []
+        self.priority = priority
+        self.taken = False
+
+class QueuedInvoker:
+    """
+    Command-execution engine: a priority queue drained by a pool of worker threads.
+
+    submit() returns a Future. Lower priority numbers run first, ties run in submission order. While a
+    batchable command waits, later commands of the same class with the same batch_key() (up to max_batch)
+    join it and run together through execute_batch(); the batch runs at the best priority among its members.
+    execute_batch() must return exactly one result per command; otherwise every future in the batch fails.
+
+    Successfully executed commands whose class is undoable go into a bounded journal; undo() and redo()
+    walk it. The journal is in completion order, which with several workers may differ from submission
+    order. metrics() reports per-command-type counts, batches, run time and queue wait.
+    """
+
+    def __init__(self, workers: int = 4, max_batch: int = 64, journal_size: int = 10000) -> None:
+        self.max_batch = max_batch
+        self._heap = []
+        self._open_batches: Dict[Hashable, _Batch] = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._journal = deque(maxlen=journal_size)
+        self._redo = []
+        self._journal_lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._metrics_lock = threading.Lock()
+        self._workers = [threading.Thread(target=self._work, name=f"invoker-{i}", daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, command: Command, priority: int = 0) -> Future:
+        future = Future()
+        key = command.batch_key()
+        if key is not None:
+            # execute_batch runs on the first command's class, so subclasses never share a batch
+            key = (type(command), key)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("QueuedInvoker is shut down")
+            batch = self._open_batches.get(key) if key is not None else None
+            if batch is None or len(batch.entries) >= self.max_batch:
+                batch = _Batch(key, priority)
+                if key is not None:
+                    self._open_batches[key] = batch
+                heapq.heappush(self._heap, (priority, next(self._sequence), batch))
+            elif priority < batch.priority:
+                # The stale heap entry is skipped once the batch has been taken
+                batch.priority = priority
+                heapq.heappush(self._heap, (priority, next(self._sequence), batch))
+            batch.entries.append((command, future, time.perf_counter()))
+            self._pending += 1
+            self._condition.notify()
+        return future
+
+    def join(self, timeout: float = None) -> bool:
+        """Waits until every submitted command has finished. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending == 0, timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if wait:
+            self.join()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def undo(self) -> Optional[Command]:
+        """Undoes the most recently completed undoable command, or returns None if there is none."""
+        with self._journal_lock:
+            if not self._journal:
+                return None
+            command = self._journal.pop()
+            command.undo()
+            self._redo.append(command)
+            return command
+
+    def redo(self) -> Optional[Command]:
+        with self._journal_lock:
+            if not self._redo:
+                return None
+            command = self._redo.pop()
+            command.execute()
+            self._journal.append(command)
+            return command
+
+    def journal(self) -> List[Command]:
+        with self._journal_lock:
+            return list(self._journal)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns:
+        dict: Per command type: commands, batches, total_seconds, mean_ms, max_batch_ms, mean_wait_ms.
+        """
+        with self._metrics_lock:
+            report = {}
+            for name, m in self._metrics.items():
+                report[name] = {
+                    "commands": m["commands"],
+                    "batches": m["batches"],
+                    "errors": m["errors"],
+                    "total_seconds": m["total"],
+                    "mean_ms": m["total"] / m["commands"] * 1000,
+                    "max_batch_ms": m["max"] * 1000,
+                    "mean_wait_ms": m["wait"] / m["commands"] * 1000,
+                }
+            return report
+
+    def export_metrics(self, path: str = None) -> str:
+        """Returns the metrics as JSON, also writing them to path if given."""
+        data = json.dumps(self.metrics(), indent=2, sort_keys=True)
+        if path:
+            with open(path, "w") as f:
+                f.write(data)
+        return data
+
+    def _take(self):
+        with self._condition:
+            while True:
+                while self._heap:
+                    _, _, batch = heapq.heappop(self._heap)
+                    if batch.taken:
+                        continue
+                    batch.taken = True
+                    if batch.key is not None and self._open_batches.get(batch.key) is batch:
+                        del self._open_batches[batch.key]
+                    return batch
+                if self._closed:
+                    return None
+                self._condition.wait()
+
+    def _work(self):
+        while True:
+            batch = self._take()
+            if batch is None:
+                return
+            self._run(batch)
+
+    def _run(self, batch):
+        entries = batch.entries
+        commands = [command for command, _, _ in entries]
+        try:
+            start = time.perf_counter()
+            error = None
+            try:
+                if len(commands) == 1:
+                    results = [commands[0].execute()]
+                else:
+                    results = list(type(commands[0]).execute_batch(commands))
+                if len(results) != len(commands):
+                    # Results cannot be matched to commands, so nothing in the batch is known to have succeeded
+                    raise RuntimeError(f"{type(commands[0]).__name__}.execute_batch returned {len(results)} "
+                                       f"results for {len(commands)} commands")
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - start
+
+            if error is not None:
+                failed = len(entries)
+                for _, future, _ in entries:
+                    future.set_exception(error)
+            else:
+                failed = 0
+                undoable = [command for command in commands if command.undoable]
+                if undoable:
+                    with self._journal_lock:
+                        self._journal.extend(undoable)
+                        self._redo.clear()
+                for (_, future, _), result in zip(entries, results):
+                    future.set_result(result)
+            self._record(type(commands[0]).__name__, entries, start, elapsed, failed)
+        finally:
+            # Even a BaseException out of a command must not leave waiters or join() hanging
+            for _, future, _ in entries:
+                if not future.done():
+                    future.set_exception(RuntimeError("Command batch was interrupted"))
+            with self._condition:
+                self._pending -= len(commands)
+                if self._pending == 0:
+                    self._condition.notify_all()
+
+    def _record(self, name, entries, start, elapsed, failed):
+        wait = sum(start - submitted for _, _, submitted in entries)
+        with self._metrics_lock:
+            m = self._metrics.get(name)
+            if m is None:
+                m = self._metrics[name] = {"commands": 0, "batches": 0, "errors": 0, "total": 0.0, "max": 0.0,
+                                           "wait": 0.0}
+            m["commands"] += len(entries)
+            m["batches"] += 1
+            m["errors"] += failed
+            m["total"] += elapsed
+            m["max"] = max(m["max"], elapsed)
+            m["wait"] += wait
+
 # Example usage
 if __name__ == "__main__":
     invoker = Invoker()
@@ -74,3 +322,11 @@ if __name__ == "__main__":
     invoker.set_on_finish(ComplexCommand(receiver, "Send email", "Save report"))
 
     invoker.do_something_important()
+
+    print("\nQueuedInvoker: running queued commands on a worker pool")
+    queued = QueuedInvoker(workers=1)
+    queued.submit(SimpleCommand("Queued operation"), priority=1)
+    for task in range(3):
+        queued.submit(ComplexCommand(receiver, f"Task {task}", f"Report {task}"))
+    queued.shutdown()
+    print(queued.export_metrics())
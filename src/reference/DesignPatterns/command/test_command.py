@@ -1,4 +1,65 @@
-from command import SimpleCommand, ComplexCommand, Receiver, Invoker
+import threading
+
+import pytest
+
+from command import Command, SimpleCommand, ComplexCommand, Receiver, Invoker, QueuedInvoker
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self.batches = 0
+        self.lock = threading.Lock()
+
+class Add(Command):
+    """Quiet, undoable, batchable command used for queue tests."""
+    undoable = True
+
+    def __init__(self, counter, amount=1):
+        self.counter = counter
+        self.amount = amount
+
+    def execute(self):
+        with self.counter.lock:
+            self.counter.value += self.amount
+        return self.counter.value
+
+    def undo(self):
+        with self.counter.lock:
+            self.counter.value -= self.amount
+
+    def batch_key(self):
+        return id(self.counter)
+
+    @classmethod
+    def execute_batch(cls, commands):
+        counter = commands[0].counter
+        with counter.lock:
+            counter.batches += 1
+            for command in commands:
+                counter.value += command.amount
+        return [None] * len(commands)
+
+class Record(Command):
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def execute(self):
+        self.log.append(self.name)
+        return self.name
+
+class Wait(Command):
+    """Holds a worker until the gate opens, so the queue behind it fills up first."""
+
+    def __init__(self, gate):
+        self.gate = gate
+
+    def execute(self):
+        self.gate.wait(5)
+
+class Boom(Command):
+    def execute(self):
+        raise ValueError("boom")
 
 def test_simple_command():
     print("Testing SimpleCommand:")
@@ -22,6 +83,163 @@ def test_invoker():
 
     invoker.do_something_important()
 
+def test_queued_invoker_priority_order():
+    log = []
+    invoker = QueuedInvoker(workers=1)
+    gate = threading.Event()
+    invoker.submit(Wait(gate))
+    for name, priority in [("low", 5), ("high", -1), ("mid", 0), ("mid2", 0)]:
+        invoker.submit(Record(log, name), priority=priority)
+    gate.set()
+    assert invoker.join(timeout=5)
+    invoker.shutdown()
+    assert log == ["high", "mid", "mid2", "low"]
+
+def test_queued_invoker_batches_same_receiver():
+    receiver = Receiver()
+    calls = []
+    receiver.do_batch = calls.append
+    invoker = QueuedInvoker(workers=1)
+    gate = threading.Event()
+    invoker.submit(Wait(gate))
+    futures = [invoker.submit(ComplexCommand(receiver, f"a{i}", f"b{i}")) for i in range(5)]
+    gate.set()
+    invoker.shutdown()
+    assert calls == [[(f"a{i}", f"b{i}") for i in range(5)]]
+    assert all(f.result() is None for f in futures)
+    assert invoker.metrics()["ComplexCommand"]["batches"] == 1
+
+def test_queued_invoker_max_batch():
+    counter = Counter()
+    invoker = QueuedInvoker(workers=1, max_batch=4)
+    gate = threading.Event()
+    invoker.submit(Wait(gate))
+    for _ in range(10):
+        invoker.submit(Add(counter))
+    gate.set()
+    invoker.shutdown()
+    assert counter.value == 10
+    assert invoker.metrics()["Add"]["batches"] == 3
+
+def test_queued_invoker_errors_reach_futures():
+    invoker = QueuedInvoker(workers=2)
+    future = invoker.submit(Boom())
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+    invoker.shutdown()
+    assert invoker.metrics()["Boom"]["errors"] == 1
+    with pytest.raises(RuntimeError):
+        invoker.submit(Boom())
+
+class ShortBatch(Add):
+    @classmethod
+    def execute_batch(cls, commands):
+        super().execute_batch(commands)
+        return [None]
+
+class LongBatch(Add):
+    @classmethod
+    def execute_batch(cls, commands):
+        return super().execute_batch(commands) + [None]
+
+class Double(Add):
+    def execute(self):
+        with self.counter.lock:
+            self.counter.value += 2 * self.amount
+
+    @classmethod
+    def execute_batch(cls, commands):
+        return [command.execute() for command in commands]
+
+class Interrupt(Command):
+    def execute(self):
+        raise KeyboardInterrupt
+
+@pytest.mark.parametrize("command_class", [ShortBatch, LongBatch])
+def test_queued_invoker_fails_batches_with_the_wrong_number_of_results(command_class):
+    counter = Counter()
+    invoker = QueuedInvoker(workers=1)
+    gate = threading.Event()
+    invoker.submit(Wait(gate))
+    futures = [invoker.submit(command_class(counter)) for _ in range(3)]
+    gate.set()
+    assert invoker.join(timeout=5)
+    invoker.shutdown()
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result()
+    assert invoker.metrics()[command_class.__name__]["errors"] == 3
+    assert invoker.journal() == []
+
+def test_queued_invoker_never_batches_different_classes():
+    counter = Counter()
+    invoker = QueuedInvoker(workers=1)
+    gate = threading.Event()
+    invoker.submit(Wait(gate))
+    for _ in range(3):
+        invoker.submit(Add(counter))
+        invoker.submit(Double(counter))
+    gate.set()
+    invoker.shutdown()
+    assert counter.value == 9
+    metrics = invoker.metrics()
+    assert metrics["Add"]["batches"] == 1 and metrics["Double"]["batches"] == 1
+
+# The interrupted worker thread exits with the KeyboardInterrupt, which pytest reports as a warning
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_queued_invoker_base_exception_does_not_hang_join():
+    invoker = QueuedInvoker(workers=2)
+    future = invoker.submit(Interrupt())
+    assert invoker.join(timeout=5)
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    assert invoker.submit(Record([], "after")).result(timeout=5) == "after"
+    invoker.shutdown()
+
+def test_queued_invoker_undo_redo():
+    counter = Counter()
+    invoker = QueuedInvoker(workers=1)
+    assert invoker.submit(Add(counter, 2)).result(timeout=5) == 2
+    assert invoker.submit(Add(counter, 3)).result(timeout=5) == 5
+    invoker.submit(SimpleCommand("not undoable")).result(timeout=5)
+    assert len(invoker.journal()) == 2
+
+    assert invoker.undo().amount == 3
+    assert counter.value == 2
+    assert invoker.redo().amount == 3
+    assert counter.value == 5
+    invoker.undo()
+    invoker.undo()
+    assert counter.value == 0
+    assert invoker.undo() is None
+    invoker.shutdown()
+
+def test_queued_invoker_metrics_export(tmp_path):
+    invoker = QueuedInvoker(workers=2)
+    log = []
+    for i in range(10):
+        invoker.submit(Record(log, i))
+    invoker.shutdown()
+    path = tmp_path / "metrics.json"
+    data = invoker.export_metrics(str(path))
+    assert path.read_text() == data
+    metrics = invoker.metrics()["Record"]
+    assert metrics["commands"] == 10
+    assert metrics["batches"] == 10
+    assert metrics["mean_ms"] >= 0
+
+def test_queued_invoker_throughput_100k():
+    counters = [Counter() for _ in range(8)]
+    invoker = QueuedInvoker(workers=4, max_batch=256)
+    for i in range(100000):
+        invoker.submit(Add(counters[i % 8]), priority=i % 3)
+    assert invoker.join(timeout=120)
+    invoker.shutdown()
+    assert sum(c.value for c in counters) == 100000
+    metrics = invoker.metrics()["Add"]
+    assert metrics["commands"] == 100000
+    assert metrics["batches"] < 100000
+
 def main():
     test_simple_command()
     test_complex_command()
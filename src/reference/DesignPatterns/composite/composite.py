@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 
 class Component(ABC):
@@ -13,6 +13,7 @@ class Component(ABC):
 
     def __init__(self) -> None:
         self._parent: Component = None
+        self._cache: Optional[str] = None
 
     @property
     def parent(self) -> Component:
@@ -31,6 +32,18 @@ class Component(ABC):
     def is_composite(self) -> bool:
         return False
 
+    def invalidate(self) -> None:
+        """
+        Marks this component and its ancestors as needing recomputation.
+
+        A dirty component's ancestors are always dirty too, so the walk stops at the first ancestor that
+        already is.
+        """
+        node = self
+        while node is not None and (node._cache is not None or node is self):
+            node._cache = None
+            node = node._parent
+
     @abstractmethod
     def operation(self) -> str:
         pass
@@ -42,8 +55,21 @@ class Leaf(Component):
     have any children. Usually, it's the Leaf objects that do the actual work.
     """
 
+    def __init__(self, name: str = "Leaf") -> None:
+        super().__init__()
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        self._name = name
+        self.invalidate()
+
     def operation(self) -> str:
-        return "Leaf"
+        return self._name
 
 
 class Composite(Component):
@@ -59,18 +85,41 @@ class Composite(Component):
     def add(self, component: Component) -> None:
         self._children.append(component)
         component.parent = self
+        self.invalidate()
 
     def remove(self, component: Component) -> None:
         self._children.remove(component)
         component.parent = None
+        self.invalidate()
 
     def is_composite(self) -> bool:
         return True
 
-    def operation(self) -> str:
-        results = [child.operation() for child in self._children]
+    def combine(self, results: List[str]) -> str:
+        """Sums up the children's results; override this rather than operation() to change the format."""
         return f"Branch({'+'.join(results)})"
 
+    def operation(self) -> str:
+        """
+        Returns the aggregated result, recomputing only composites marked dirty since the last call.
+
+        The tree is walked with an explicit stack, so depth is not limited by the recursion limit.
+        """
+        if self._cache is not None:
+            return self._cache
+        stack = [(self, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                node._cache = node.combine([child._cache if child.is_composite() else child.operation()
+                                            for child in node._children])
+                continue
+            stack.append((node, True))
+            for child in node._children:
+                if child.is_composite() and child._cache is None:
+                    stack.append((child, False))
+        return self._cache
+
 
 def client_code(component: Component) -> None:
     print(f"RESULT: {component.operation()}", end="")
@@ -32,6 +32,70 @@ def test_composite_multiple_children():
     assert composite.operation() == "Branch(Leaf+Leaf)", "Composite operation with multiple children did not return expected result."
     print("PASS: Composite multiple children test")
 
+class CountingComposite(Composite):
+    """ Composite that counts how often it recomputes. """
+    def __init__(self):
+        super().__init__()
+        self.recomputed = 0
+
+    def combine(self, results):
+        self.recomputed += 1
+        return super().combine(results)
+
+def test_composite_caches_result():
+    """
+    Test that a clean composite returns its cached result without recomputing.
+    """
+    composite = CountingComposite()
+    composite.add(Leaf())
+    assert composite.operation() == composite.operation() == "Branch(Leaf)"
+    assert composite.recomputed == 1
+    print("PASS: Composite caching test")
+
+def test_only_changed_path_is_recomputed():
+    """
+    Test that add, remove and leaf changes recompute only the affected ancestors.
+    """
+    root = CountingComposite()
+    left, right = CountingComposite(), CountingComposite()
+    leaf = Leaf()
+    root.add(left)
+    root.add(right)
+    left.add(leaf)
+    right.add(Leaf())
+    assert root.operation() == "Branch(Branch(Leaf)+Branch(Leaf))"
+
+    leaf.name = "Task"
+    assert root.operation() == "Branch(Branch(Task)+Branch(Leaf))"
+    assert (root.recomputed, left.recomputed, right.recomputed) == (2, 2, 1)
+
+    extra = Leaf("Extra")
+    right.add(extra)
+    assert root.operation() == "Branch(Branch(Task)+Branch(Leaf+Extra))"
+    right.remove(extra)
+    assert root.operation() == "Branch(Branch(Task)+Branch(Leaf))"
+    assert (root.recomputed, left.recomputed, right.recomputed) == (4, 2, 3)
+    print("PASS: Dirty path recomputation test")
+
+def test_deep_tree_does_not_recurse():
+    """
+    Test that a tree much deeper than the recursion limit can be built, changed and aggregated.
+    """
+    depth = 5000
+    root = Composite()
+    node = root
+    for _ in range(depth):
+        child = Composite()
+        node.add(child)
+        node = child
+    leaf = Leaf()
+    node.add(leaf)
+    result = root.operation()
+    assert result == "Branch(" * (depth + 1) + "Leaf" + ")" * (depth + 1)
+    leaf.name = "Done"
+    assert "Done" in root.operation()
+    print("PASS: Deep tree test")
+
 def main():
     """
     Main function to run the composite pattern tests.
@@ -40,6 +104,9 @@ def main():
     test_leaf_operation()
     test_composite_single_child()
     test_composite_multiple_children()
+    test_composite_caches_result()
+    test_only_changed_path_is_recomputed()
+    test_deep_tree_does_not_recurse()
 
 if __name__ == "__main__":
     main()
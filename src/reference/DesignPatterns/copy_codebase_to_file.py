@@ -3,48 +3,121 @@ import argparse
 import logging
 from datetime import datetime
 import zipfile
+import gzip
+import io
 import json
+import hashlib
 import xml.etree.ElementTree as ET
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 
-def write_to_pdf(file_data, output_file):
-    c = canvas.Canvas(output_file, pagesize=letter)
-    width, height = letter
-    c.drawString(30, height - 30, "Extracted Code Report")
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
 
-    y_position = height - 50
-    for file_path, content in file_data.items():
-        c.drawString(30, y_position, file_path)
-        y_position -= 20
-        for line in content.split('\n'):
-            c.drawString(40, y_position, line)
-            y_position -= 15
-            if y_position < 40:
-                c.showPage()
-                y_position = height - 50
+# Stands in for the content of a file whose bytes were already written under another path
+DuplicateOf = namedtuple('DuplicateOf', ['path'])
 
-    c.save()
+class Deduplicator:
+    """Replaces repeated file contents with DuplicateOf references and counts the bytes saved."""
+
+    def __init__(self):
+        self.blobs = {}
+        self.files = 0
+        self.duplicates = 0
+        self.bytes_saved = 0
+
+    def dedup(self, file_data):
+        for file_path, content in iter_items(file_data):
+            self.files += 1
+            digest = hashlib.sha256(content.encode('utf-8', 'surrogatepass')).digest()
+            original = self.blobs.setdefault(digest, file_path)
+            if original == file_path:
+                yield file_path, content
+            else:
+                self.duplicates += 1
+                self.bytes_saved += len(content.encode('utf-8', 'surrogatepass'))
+                yield file_path, DuplicateOf(original)
+
+    def summary(self):
+        return (f"Deduplicated {self.files} files: {self.files - self.duplicates} unique, "
+                f"{self.duplicates} duplicates, {self.bytes_saved} bytes saved")
+
+def iter_items(file_data):
+    return file_data.items() if isinstance(file_data, dict) else file_data
+
+def open_output(output_file, compression=None, binary=False):
+    """Opens an output stream, optionally gzip- or zstd-compressed."""
+    if compression == 'gzip':
+        return gzip.open(output_file, 'wb' if binary else 'wt', encoding=None if binary else 'utf-8')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        stream = zstandard.ZstdCompressor().stream_writer(open(output_file, 'wb'))
+        return stream if binary else io.TextIOWrapper(stream, encoding='utf-8')
+    return open(output_file, 'wb' if binary else 'w')
+
+def write_to_pdf(file_data, output_file, compression=None):
+    ensure_directory_exists(os.path.dirname(output_file))
+    with open_output(output_file, compression, binary=True) as pdf_out:
+        c = canvas.Canvas(pdf_out, pagesize=letter)
+        width, height = letter
+        c.drawString(30, height - 30, "Extracted Code Report")
+
+        y_position = height - 50
+        for file_path, content in iter_items(file_data):
+            if isinstance(content, DuplicateOf):
+                c.drawString(30, y_position, f"{file_path} (duplicate of {content.path})")
+                y_position -= 20
+                if y_position < 40:
+                    c.showPage()
+                    y_position = height - 50
+                continue
+            c.drawString(30, y_position, file_path)
+            y_position -= 20
+            for line in content.split('\n'):
+                c.drawString(40, y_position, line)
+                y_position -= 15
+                if y_position < 40:
+                    c.showPage()
+                    y_position = height - 50
+
+        c.save()
 
 def ensure_directory_exists(directory):
-    if not os.path.exists(directory):
+    if directory and not os.path.exists(directory):
         os.makedirs(directory)
 
-def write_to_json(file_data, output_file):
+def write_to_json(file_data, output_file, compression=None):
+    """Streams a {path: content} object with the same layout as json.dump(..., indent=4)."""
     ensure_directory_exists(os.path.dirname(output_file))
-    with open(output_file, 'w') as json_file:
-        json.dump(file_data, json_file, indent=4)
+    with open_output(output_file, compression) as json_file:
+        separator = '{\n    '
+        for file_path, content in iter_items(file_data):
+            if isinstance(content, DuplicateOf):
+                content = {'duplicate_of': content.path}
+            json_file.write(f"{separator}{json.dumps(file_path)}: {json.dumps(content)}")
+            separator = ',\n    '
+        json_file.write('{}' if separator == '{\n    ' else '\n}')
 
-def write_to_xml(file_data, output_file):
+def write_to_xml(file_data, output_file, compression=None):
+    """Streams <files><file path=...><content>...</content></file>...</files>, one element at a time."""
     ensure_directory_exists(os.path.dirname(output_file))
-    root = ET.Element("files")
-    for file_path, content in file_data.items():
-        file_elem = ET.SubElement(root, "file", path=file_path)
-        content_elem = ET.SubElement(file_elem, "content")
-        content_elem.text = content
-
-    tree = ET.ElementTree(root)
-    tree.write(output_file)
+    with open_output(output_file, compression, binary=True) as xml_file:
+        empty = True
+        for file_path, content in iter_items(file_data):
+            if empty:
+                xml_file.write(b'<files>')
+                empty = False
+            if isinstance(content, DuplicateOf):
+                file_elem = ET.Element("file", path=file_path, duplicate_of=content.path)
+            else:
+                file_elem = ET.Element("file", path=file_path)
+                ET.SubElement(file_elem, "content").text = content
+            xml_file.write(ET.tostring(file_elem, encoding='us-ascii'))
+        xml_file.write(b'<files />' if empty else b'</files>')
 
 def setup_logging(log_level, log_file=None):
     log_format = '%(asctime)s - %(levelname)s - %(message)s'
@@ -63,6 +136,13 @@ def parse_arguments():
     parser.add_argument('--before_date', type=str, default=None, help='Filter files modified before this date (YYYY-MM-DD)')
     parser.add_argument('--format', type=str, default='txt', choices=['txt', 'json', 'xml', 'pdf'],
                         help='Output format: txt, json, xml, or pdf (default: txt)')
+    parser.add_argument('--compress', type=str, default=None, choices=list(COMPRESSION_SUFFIXES),
+                        help='Compress the output stream with gzip or zstd')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Threads used to stat, filter and read files; 1 reads sequentially (default: 1). '
+                             'Threads may help on slow or network filesystems')
+    parser.add_argument('--dedup', action='store_true',
+                        help='Write each unique file content once and record identical files as references')
     return parser.parse_args()
 
 def is_python_file(file_path):
@@ -83,13 +163,18 @@ def filter_files(file_path, min_size, max_size, before_date):
         logging.error(f"Error filtering file {file_path}: {e}")
         return False
 
-def recursive_traverse_directory(directory, min_size, max_size, before_date):
+def iter_candidate_paths(directory):
     for root, dirs, files in os.walk(directory):
         for file in files:
             file_path = os.path.join(root, file)
-            if is_python_file(file_path) and filter_files(file_path, min_size, max_size, before_date):
+            if is_python_file(file_path):
                 yield file_path
 
+def recursive_traverse_directory(directory, min_size, max_size, before_date):
+    for file_path in iter_candidate_paths(directory):
+        if filter_files(file_path, min_size, max_size, before_date):
+            yield file_path
+
 def read_file(file_path):
     try:
         with open(file_path, 'r') as infile:
@@ -100,16 +185,69 @@ def read_file(file_path):
         return None
 
 def write_to_single_file(file_path, content, outfile):
+    if isinstance(content, DuplicateOf):
+        outfile.write(f"\n\n# File: {file_path}\n# Duplicate of: {content.path}\n")
+        return
     outfile.write(f"\n\n# File: {file_path}\n\n")
     outfile.write(content)
 
-def extract_python_code(directory, output_file, min_size, max_size, before_date):
+def write_to_txt(file_data, output_file, compression=None):
+    ensure_directory_exists(os.path.dirname(output_file))
+    with open_output(output_file, compression) as outfile:
+        for file_path, content in iter_items(file_data):
+            write_to_single_file(file_path, content, outfile)
+
+def load_files(file_paths, min_size, max_size, before_date):
+    results = []
+    for file_path in file_paths:
+        if filter_files(file_path, min_size, max_size, before_date):
+            content = read_file(file_path)
+            if content:
+                results.append((file_path, content))
+    return results
+
+def iter_path_chunks(directory, chunk_size):
+    chunk = []
+    for file_path in iter_candidate_paths(directory):
+        chunk.append(file_path)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_file_contents(directory, min_size, max_size, before_date, workers=1, max_pending=None, chunk_size=32):
+    """
+    Yields (file_path, content) for every matching Python file, in walk order.
+
+    With workers > 1 the walk stays on this thread while a pool stats, filters and reads files in chunks of
+    chunk_size paths. At most max_pending chunks (default workers * 4) are in flight, so a slow consumer
+    holds the walker back.
+    """
+    if workers <= 1:
+        for file_path in recursive_traverse_directory(directory, min_size, max_size, before_date):
+            content = read_file(file_path)
+            if content:
+                yield file_path, content
+        return
+
+    max_pending = max_pending or workers * 4
+    window = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk in iter_path_chunks(directory, chunk_size):
+            window.append(executor.submit(load_files, chunk, min_size, max_size, before_date))
+            while len(window) >= max_pending:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
+
+def extract_python_code(directory, output_file, min_size, max_size, before_date, compression=None, workers=1,
+                        deduplicator=None):
     try:
-        with open(output_file, 'w') as outfile:
-            for file_path in recursive_traverse_directory(directory, min_size, max_size, before_date):
-                content = read_file(file_path)
-                if content:
-                    write_to_single_file(file_path, content, outfile)
+        file_data = iter_file_contents(directory, min_size, max_size, before_date, workers)
+        if deduplicator is not None:
+            file_data = deduplicator.dedup(file_data)
+        write_to_txt(file_data, output_file, compression)
     except Exception as e:
         logging.error(f"Error while writing to file {output_file}: {e}")
 
@@ -146,6 +284,7 @@ if __name__ == '__main__':
     # Generate output filename based on chosen format
     args.format = args.format or 'txt'
     output_file = os.path.join(args.output_folder, f"extracted_code_{timestamp}.{args.format}")
+    output_file += COMPRESSION_SUFFIXES.get(args.compress, '')
 
     setup_logging(args.log_level, args.log)
 
@@ -153,21 +292,25 @@ if __name__ == '__main__':
     before_date = convert_date_string(args.before_date) if args.before_date else None
 
     # Process files based on the chosen format
+    # Files are streamed straight into the writer, so memory is bounded by the largest file
+    deduplicator = Deduplicator() if args.dedup else None
     if args.format in ['json', 'xml', 'pdf']:
-        file_data = {}
-        for file_path in recursive_traverse_directory(args.directory, args.min_size, args.max_size, before_date):
-            content = read_file(file_path)
-            if content:
-                file_data[file_path] = content
+        file_data = iter_file_contents(args.directory, args.min_size, args.max_size, before_date, args.workers)
+        if deduplicator is not None:
+            file_data = deduplicator.dedup(file_data)
 
         if args.format == 'json':
-            write_to_json(file_data, output_file)
+            write_to_json(file_data, output_file, args.compress)
         elif args.format == 'xml':
-            write_to_xml(file_data, output_file)
+            write_to_xml(file_data, output_file, args.compress)
         elif args.format == 'pdf':
-            write_to_pdf(file_data, output_file)
+            write_to_pdf(file_data, output_file, args.compress)
     else:
         # Default to text format
-        extract_python_code(args.directory, output_file, args.min_size, args.max_size, before_date)
+        extract_python_code(args.directory, output_file, args.min_size, args.max_size, before_date, args.compress,
+                            args.workers, deduplicator)
+
+    if deduplicator is not None:
+        print(deduplicator.summary())
 
     print("Script execution completed.")
@@ -0,0 +1,76 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from file_index import hash_file
+
+
+def default_workers():
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class DeepScanPool:
+    """
+    Hashes files on a bounded thread pool while the caller keeps walking the tree.
+
+    hashlib releases the GIL while hashing, so threads scale across cores without the pickling cost of a
+    process pool. At most max_pending hashes are in flight, which bounds memory to max_pending read buffers
+    however large the tree or its files are. Results come back in submission order.
+    """
+
+    def __init__(self, workers=None, max_pending=None, hasher=hash_file):
+        self.workers = workers or default_workers()
+        self.max_pending = max_pending or self.workers * 4
+        self.hasher = hasher
+        self.files_hashed = 0
+        self.bytes_hashed = 0
+        self.elapsed = 0.0
+
+    def map_ordered(self, jobs):
+        """
+        Hashes the files of a job stream and yields the results in order.
+
+        Args:
+        jobs (iterable): (item, file_path, size) tuples. A file_path of None passes the item through unhashed.
+
+        Yields:
+        tuple: (item, sha256, error) where sha256 is None for pass-through items or failures.
+        """
+        start = time.perf_counter()
+        window = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for item, file_path, size in jobs:
+                future = executor.submit(self.hasher, file_path) if file_path is not None else None
+                window.append((item, future, size))
+                while len(window) > self.max_pending:
+                    yield self._resolve(*window.popleft())
+            while window:
+                yield self._resolve(*window.popleft())
+        self.elapsed += time.perf_counter() - start
+
+    def _resolve(self, item, future, size):
+        if future is None:
+            return item, None, None
+        try:
+            sha256 = future.result()
+        except Exception as e:
+            return item, None, e
+        self.files_hashed += 1
+        self.bytes_hashed += size
+        return item, sha256, None
+
+    def throughput(self):
+        """
+        Returns:
+        dict: Files and bytes hashed with MB/s and files/s over the pipeline's wall-clock time.
+        """
+        elapsed = self.elapsed or float('inf')
+        return {
+            'files': self.files_hashed,
+            'bytes': self.bytes_hashed,
+            'seconds': self.elapsed,
+            'workers': self.workers,
+            'mb_per_sec': self.bytes_hashed / (1024 * 1024) / elapsed,
+            'files_per_sec': self.files_hashed / elapsed,
+        }
@@ -1,9 +1,18 @@
 import json
-from typing import Dict, List
+import sys
+import weakref
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
 
 class Flyweight:
-    def __init__(self, shared_state: List[str]) -> None:
-        self._shared_state = shared_state
+    __slots__ = ("_shared_state", "key", "nbytes", "__weakref__")
+
+    def __init__(self, shared_state: Iterable[str], key: Optional[Tuple[str, ...]] = None) -> None:
+        self._shared_state = tuple(shared_state)
+        self.key = key if key is not None else tuple(sorted(self._shared_state))
+        # Rough footprint of one copy of the shared state, used to estimate what interning saves
+        self.nbytes = sys.getsizeof(self._shared_state) + sum(sys.getsizeof(s) for s in self._shared_state)
 
     def operation(self, unique_state: List[str]) -> None:
         shared = json.dumps(self._shared_state)
@@ -11,28 +20,95 @@ class Flyweight:
         print(f"Flyweight: Shared ({shared}) and unique ({unique}) state.")
 
 class FlyweightFactory:
-    _flyweights: Dict[str, Flyweight] = {}
+    """
+    Interning pool that hands out one shared Flyweight per distinct shared state.
+
+    Each factory has its own pool. By default the pool holds flyweights weakly, so a flyweight disappears
+    once no agent uses it; with max_size set it instead keeps at most max_size flyweights alive and
+    evicts the least recently used. Flyweights passed as initial_flyweights are pinned for the factory's
+    lifetime. get_flyweight is safe to call from many threads and never creates duplicates.
+    """
 
-    def __init__(self, initial_flyweights: List[List[str]]) -> None:
+    def __init__(self, initial_flyweights: Iterable[Iterable[str]] = (), max_size: Optional[int] = None,
+                 verbose: bool = False) -> None:
+        self.max_size = max_size
+        self.verbose = verbose
+        self._pinned: Dict[Tuple[str, ...], Flyweight] = {}
+        self._flyweights = OrderedDict() if max_size is not None else weakref.WeakValueDictionary()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
         for state in initial_flyweights:
-            self._flyweights[self.get_key(state)] = Flyweight(state)
+            flyweight = Flyweight(state)
+            self._pinned[flyweight.key] = flyweight
+
+    def get_key(self, state: Iterable[str]) -> Tuple[str, ...]:
+        return tuple(sorted(state))
+
+    def get_flyweight(self, shared_state: Iterable[str], key: Optional[Tuple[str, ...]] = None) -> Flyweight:
+        """
+        Returns the flyweight for a shared state, creating it on first use.
+
+        Args:
+        shared_state (Iterable[str]): The intrinsic state to share.
+        key (tuple): A key previously returned by get_key(), to skip re-sorting the state.
 
-    def get_key(self, state: List[str]) -> str:
-        return "_".join(sorted(state))
+        Returns:
+        Flyweight: The pooled flyweight.
+        """
+        # A generator would be used up by get_key() and leave the new Flyweight empty
+        shared_state = tuple(shared_state)
+        if key is None:
+            key = self.get_key(shared_state)
+        with self._lock:
+            flyweight = self._pinned.get(key)
+            if flyweight is None:
+                flyweight = self._flyweights.get(key)
+                if flyweight is not None and self.max_size is not None:
+                    self._flyweights.move_to_end(key)
+            created = flyweight is None
+            if not created:
+                self.hits += 1
+                self.bytes_saved += flyweight.nbytes
+            else:
+                self.misses += 1
+                flyweight = Flyweight(shared_state, key)
+                self._flyweights[key] = flyweight
+                if self.max_size is not None and len(self._flyweights) > self.max_size:
+                    self._flyweights.popitem(last=False)
+                    self.evictions += 1
+        if self.verbose:
+            print("FlyweightFactory: Creating new flyweight." if created else
+                  "FlyweightFactory: Reusing existing flyweight.")
+        return flyweight
 
-    def get_flyweight(self, shared_state: List[str]) -> Flyweight:
-        key = self.get_key(shared_state)
-        if not self._flyweights.get(key):
-            print("FlyweightFactory: Creating new flyweight.")
-            self._flyweights[key] = Flyweight(shared_state)
-        else:
-            print("FlyweightFactory: Reusing existing flyweight.")
-        return self._flyweights[key]
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns:
+        dict: Lookups, hits, misses, hit rate, live and pinned flyweights, evictions and the estimated
+        bytes saved by returning shared flyweights instead of storing a copy of the state per caller.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "lookups": lookups,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "live": len(self._pinned) + len(self._flyweights),
+                "pinned": len(self._pinned),
+                "evictions": self.evictions,
+                "bytes_saved": self.bytes_saved,
+            }
 
     def list_flyweights(self) -> None:
-        print(f"FlyweightFactory: I have {len(self._flyweights)} flyweights:")
-        for key in self._flyweights:
-            print(key)
+        with self._lock:
+            keys = list(self._pinned) + list(self._flyweights.keys())
+        print(f"FlyweightFactory: I have {len(keys)} flyweights:")
+        for key in keys:
+            print("_".join(key))
 
 # Client code example
 def add_ai_component_to_system(factory: FlyweightFactory, data: List[str]) -> None:
@@ -44,7 +120,7 @@ if __name__ == "__main__":
     factory = FlyweightFactory([
         ["NeuralNet", "Classifier", "Image"],
         ["NeuralNet", "Regressor", "TimeSeries"]
-    ])
+    ], verbose=True)
 
     factory.list_flyweights()
 
@@ -52,3 +128,4 @@ if __name__ == "__main__":
     add_ai_component_to_system(factory, ["NeuralNet", "Classifier", "Audio", "AudioSetB"])
 
     factory.list_flyweights()
+    print(factory.stats())
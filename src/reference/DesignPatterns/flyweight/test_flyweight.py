@@ -1,3 +1,6 @@
+import gc
+import threading
+
 from flyweight import FlyweightFactory, add_ai_component_to_system
 
 def test_flyweight_pattern():
@@ -25,8 +28,78 @@ def test_flyweight_pattern():
     print("\nFinal flyweights in the factory:")
     factory.list_flyweights()
 
+def test_factories_are_isolated():
+    first = FlyweightFactory([["NeuralNet", "Classifier"]])
+    second = FlyweightFactory()
+    assert first.stats()["live"] == 1
+    assert second.stats()["live"] == 0
+    assert first.get_flyweight(["Classifier", "NeuralNet"]) is not second.get_flyweight(["NeuralNet", "Classifier"])
+
+def test_weak_pool_releases_unused_flyweights():
+    factory = FlyweightFactory()
+    flyweight = factory.get_flyweight(["GPT", "Prompt"])
+    assert factory.get_flyweight(["Prompt", "GPT"]) is flyweight
+    del flyweight
+    gc.collect()
+    assert factory.stats()["live"] == 0
+
+def test_bounded_pool_evicts_least_recently_used():
+    factory = FlyweightFactory(max_size=2)
+    a = factory.get_flyweight(["a"])
+    factory.get_flyweight(["b"])
+    factory.get_flyweight(["a"])
+    factory.get_flyweight(["c"])
+    assert factory.get_flyweight(["a"]) is a
+    stats = factory.stats()
+    assert stats["live"] == 2
+    assert stats["evictions"] == 1
+
+def test_precomputed_key():
+    factory = FlyweightFactory()
+    key = factory.get_key(["b", "a"])
+    assert key == ("a", "b")
+    assert factory.get_flyweight(["a", "b"], key=key) is factory.get_flyweight(["b", "a"])
+
+def test_generator_state_is_kept():
+    factory = FlyweightFactory()
+    flyweight = factory.get_flyweight(part for part in ["b", "a"])
+    assert flyweight._shared_state == ("b", "a")
+    assert flyweight.key == ("a", "b")
+
+def test_concurrent_get_or_create_returns_one_instance():
+    factory = FlyweightFactory()
+    results = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        results.extend(factory.get_flyweight(["shared", "config"]) for _ in range(100))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(flyweight) for flyweight in results}) == 1
+    assert factory.stats()["misses"] == 1
+
+def test_stats_report_hit_rate_and_bytes_saved():
+    factory = FlyweightFactory()
+    flyweight = factory.get_flyweight(["system prompt"])
+    for _ in range(3):
+        factory.get_flyweight(["system prompt"])
+    stats = factory.stats()
+    assert stats["hit_rate"] == 0.75
+    assert stats["bytes_saved"] == 3 * flyweight.nbytes
+
 def main():
     test_flyweight_pattern()
+    test_factories_are_isolated()
+    test_weak_pool_releases_unused_flyweights()
+    test_bounded_pool_evicts_least_recently_used()
+    test_precomputed_key()
+    test_concurrent_get_or_create_returns_one_instance()
+    test_stats_report_hit_rate_and_bytes_saved()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,70 @@
+import os
+import subprocess
+
+NOT_AVAILABLE = "Not available"
+
+
+class GitHistory:
+    """
+    Recent commits for every file in a repository, read with a single `git log --name-only` pass.
+
+    The log is loaded on the first lookup and kept in memory as a map from repository-relative path to its
+    last max_commits commits, formatted like `git log --pretty=format:'%h - %s (%cr)'`.
+    """
+
+    def __init__(self, repo_dir, max_commits=3):
+        self.repo_dir = os.path.abspath(repo_dir)
+        self.max_commits = max_commits
+        self.toplevel = None
+        self.commits = None
+        self.error = None
+
+    def load(self):
+        """Runs git once and builds the path-to-commits map. Safe to call repeatedly."""
+        if self.commits is not None:
+            return
+        self.commits = {}
+        try:
+            self.toplevel = self._git('rev-parse', '--show-toplevel').strip()
+            log = self._git('-c', 'core.quotepath=off', 'log', '-z', '--name-only', '--no-renames',
+                            '--pretty=format:%x1e%h - %s (%cr)')
+        except (OSError, subprocess.CalledProcessError) as e:
+            self.error = str(e)
+            return
+
+        max_commits = self.max_commits
+        commits = self.commits
+        for record in log.split('\x1e'):
+            header, _, paths = record.partition('\n')
+            if not header:
+                continue
+            for path in paths.split('\0'):
+                if not path:
+                    continue
+                history = commits.get(path)
+                if history is None:
+                    commits[path] = [header]
+                elif len(history) < max_commits:
+                    history.append(header)
+
+    def get(self, file_path):
+        """
+        Returns the recent commits of a file, newest first, one per line.
+
+        Args:
+        file_path (str): Absolute path, or path relative to repo_dir.
+
+        Returns:
+        str: The formatted commits, or "Not available" if the file has no history.
+        """
+        self.load()
+        if self.toplevel is None:
+            return NOT_AVAILABLE
+        full_path = os.path.realpath(os.path.join(self.repo_dir, file_path))
+        rel_path = os.path.relpath(full_path, os.path.realpath(self.toplevel)).replace(os.sep, '/')
+        history = self.commits.get(rel_path)
+        return '\n'.join(history) if history else NOT_AVAILABLE
+
+    def _git(self, *args):
+        return subprocess.run(['git', *args], cwd=self.repo_dir, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              check=True, text=True, errors='replace').stdout
@@ -3,13 +3,15 @@ import time
 import argparse
 import pwd
 import grp
-import hashlib
 import mimetypes
 import subprocess
 import stat
 from pathlib import Path
 
 from helpers.stream_to_console import stc
+from file_index import INDEX_FILENAME, FileIndex, hash_file, write_diff
+from deep_scan import DeepScanPool
+from git_history import GitHistory
 
 
 
@@ -39,17 +41,12 @@ def get_file_details(file_path):
         file_info["gid"] = stats.st_gid
 
         # File hash for integrity
-        hasher = hashlib.sha256()
-        with open(file_path, 'rb') as file:
-            buf = file.read()
-            hasher.update(buf)
-        file_info["hash"] = hasher.hexdigest()
+        file_info["hash"] = hash_file(file_path)
 
         # Additional details based on file type
         if file_path.endswith('.py'):  # Example for Python files
             with open(file_path, 'r') as file:
-                lines = file.readlines()
-                file_info["line_count"] = len(lines)
+                file_info["line_count"] = sum(1 for _ in file)
                 # Additional Python-specific analysis can be done here
 
         return file_info
@@ -62,6 +59,8 @@ def parse_arguments():
     parser = argparse.ArgumentParser(description='Generate file structure with optional verbosity and deep scan')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
     parser.add_argument('-d', '--deep_scan', action='store_true', help='Enable deep scanning for additional file details')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Threads used to hash files during a deep scan')
+    parser.add_argument('--no_index', action='store_true', help='Ignore the persistent file index and rescan everything')
     return parser.parse_args()
 
 def print_verbose(message, status):
@@ -104,11 +103,7 @@ def get_file_owner(file_path):
     return user, group
 
 def get_file_hash(file_path):
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+    return hash_file(file_path)
 
 def get_file_type(file_path):
     if os.path.islink(file_path):
@@ -125,9 +120,10 @@ def get_mime_type(file_path):
     return mime_type if mime_type else "Unknown"
 
 def get_git_commit_history(file_path, script_dir):
+    # One subprocess per file; generate_file_structure() uses GitHistory instead
     try:
-        cmd = f"git log -n 3 --pretty=format:'%h - %s (%cr)' -- {file_path}"
-        process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=script_dir)
+        cmd = ["git", "log", "-n", "3", "--pretty=format:%h - %s (%cr)", "--", file_path]
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=script_dir)
         stdout, stderr = process.communicate()
         return stdout.decode().strip() if stdout else "Not available"
     except Exception as e:
@@ -146,6 +142,11 @@ def print_summary(total_files, file_types, mime_types):
         print_verbose(f"  \033[32m{m_type}: \033[34m{count}\033[32m", "info")
     print('')
 
+def print_throughput(stats):
+    print_verbose(f"Deep scan throughput: \033[34m{stats['mb_per_sec']:.2f}\033[32m MB/s, \033[34m{stats['files_per_sec']:.1f}\033[32m files/s "
+                  f"(\033[34m{stats['files']}\033[32m files hashed, \033[34m{format_file_size(stats['bytes'])}\033[32m, "
+                  f"\033[34m{stats['workers']}\033[32m workers)", "info")
+
 def print_deep_scan_summary(deep_scan_details):
     if deep_scan_details:  # Check if there are any deep scan details
         print_verbose("Deep scan details:", "info")
@@ -157,12 +158,19 @@ def print_deep_scan_summary(deep_scan_details):
         print('')
 
 
+def print_index_diff(diff, rehashed):
+    print_verbose(f"Index changes: \033[34m{len(diff['added'])}\033[32m added, \033[34m{len(diff['removed'])}\033[32m removed, "
+                  f"\033[34m{len(diff['modified'])}\033[32m modified, \033[34m{rehashed}\033[32m files hashed", "info")
+
+
 def generate_file_structure(script_dir, run_name, base_output_dir='file_tree/runs',
-                            skip_dirs=None, include_hidden=False, deep_scan=False, verbose=False):
+                            skip_dirs=None, include_hidden=False, deep_scan=False, verbose=False, use_index=True, workers=None):
     if skip_dirs is None:
         skip_dirs = ['bin', 'lib', 'include', 'your_lib_folder', 'archive', '.git', '__pycache__']
 
     output_dir = os.path.join(base_output_dir, run_name)
+    # Earlier runs and the index live under base_output_dir; scanning them would report them as changes
+    output_root = os.path.abspath(base_output_dir)
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
@@ -170,6 +178,11 @@ def generate_file_structure(script_dir, run_name, base_output_dir='file_tree/run
     summary_file = os.path.join(output_dir, 'summary.txt')
     error_log_file = os.path.join(output_dir, 'error_log.txt')
 
+    # The index lives beside the runs so every run can diff against the previous one
+    index = FileIndex(os.path.join(base_output_dir, INDEX_FILENAME)) if use_index else None
+    hash_pool = DeepScanPool(workers=workers)
+    git_history = GitHistory(script_dir) if deep_scan else None
+
     total_files = 0
     file_types = {}
     mime_types = {}
@@ -182,53 +195,74 @@ def generate_file_structure(script_dir, run_name, base_output_dir='file_tree/run
         mime_types[mime_type] = mime_types.get(mime_type, 0) + 1
 
     with open(output_file, 'w') as file_out, open(summary_file, 'w') as summary_out, open(error_log_file, 'w') as error_log:
-        for root, dirs, files in os.walk(script_dir):
-            if not include_hidden:
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
-                files = [f for f in files if not f.startswith('.')]
-            dirs[:] = [d for d in dirs if d not in skip_dirs]
-
-            for f in files:
-                file_path = os.path.join(root, f)
-                try:
-                    file_stat = os.stat(file_path)
-                    file_size = format_file_size(file_stat.st_size)
-                    mod_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(file_stat.st_mtime))
-                    file_type = get_file_type(file_path)
-                    mime_type = get_mime_type(file_path)
-                    update_distributions(file_type, mime_type)
-
+        def log_error(file_path, e):
+            error_log.write(f"Error processing file {file_path}: {e}\n")
+            if verbose:
+                print_verbose(f"\rError processing file {file_path}: {e}", "error")
+
+        def walk_files():
+            # Runs on the main thread; only files that need hashing are handed to the pool
+            for root, dirs, files in os.walk(script_dir):
+                if not include_hidden:
+                    dirs[:] = [d for d in dirs if not d.startswith('.')]
+                    files = [f for f in files if not f.startswith('.')]
+                dirs[:] = [d for d in dirs if d not in skip_dirs and os.path.abspath(os.path.join(root, d)) != output_root]
+
+                for f in files:
+                    file_path = os.path.join(root, f)
+                    try:
+                        file_stat = os.stat(file_path)
+                    except Exception as e:
+                        log_error(file_path, e)
+                        continue
+                    rel_path = os.path.relpath(file_path, script_dir)
+                    cached_hash = index.lookup(rel_path, file_stat) if index is not None else None
+                    needs_hash = deep_scan and cached_hash is None
+                    yield ((root, f, file_path, rel_path, file_stat, cached_hash),
+                           file_path if needs_hash else None, file_stat.st_size)
+
+        for (root, f, file_path, rel_path, file_stat, cached_hash), new_hash, error in hash_pool.map_ordered(walk_files()):
+            if error is not None:
+                log_error(file_path, error)
+                continue
+            try:
+                if index is not None:
+                    index.record(rel_path, file_stat, new_hash)
+
+                file_size = format_file_size(file_stat.st_size)
+                mod_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(file_stat.st_mtime))
+                file_type = get_file_type(file_path)
+                mime_type = get_mime_type(file_path)
+                update_distributions(file_type, mime_type)
+
+                details = {}
+                if deep_scan:
+                    file_hash = new_hash or cached_hash
+                    details = deep_scan_details[file_path] = {'hash': file_hash, 'git_history': git_history.get(file_path)}
+
+                file_detail = f'{os.path.join(root.replace(script_dir, ""), f)} - Type: {file_type} MIME: {mime_type} Size: {file_size}'
+                file_out.write(f'{file_detail} | {details} Modified: {mod_time}\n')
+
+                if verbose:
+                    print_verbose_label("Name: ")
+                    print_verbose_info(f"{os.path.basename(file_path)}, ")
+                    print_verbose_label("Type: ")
+                    print_verbose_info(f"{file_type} ")
+                    print_verbose_label("MIME: ")
+                    print_verbose_info(f"{mime_type} ")
+                    print_verbose_label("Size: ")
+                    print_verbose_info(f"{file_size} ")
+                    print_verbose_label("Last Modified: ")
+                    print_verbose_info(f"{mod_time} ")
                     if deep_scan:
-                        file_hash = get_file_hash(file_path) if deep_scan else "N/A"
-                        git_history = get_git_commit_history(file_path, script_dir) if deep_scan else "N/A"
-                        deep_scan_details[file_path] = {'hash': file_hash, 'git_history': git_history}
-
-                    file_detail = f'{os.path.join(root.replace(script_dir, ""), f)} - Type: {file_type} MIME: {mime_type} Size: {file_size}'
-                    file_out.write(f'{file_detail} | {deep_scan_details} Modified: {mod_time}\n')
-
-                    if verbose:
-                        print_verbose_label("Name: ")
-                        print_verbose_info(f"{os.path.basename(file_path)}, ")
-                        print_verbose_label("Type: ")
-                        print_verbose_info(f"{file_type} ")
-                        print_verbose_label("MIME: ")
-                        print_verbose_info(f"{mime_type} ")
-                        print_verbose_label("Size: ")
-                        print_verbose_info(f"{file_size} ")
-                        print_verbose_label("Last Modified: ")
-                        print_verbose_info(f"{mod_time} ")
-                        if deep_scan:
-                            for file_path, details in deep_scan_details.items():
-                                detail_parts = [color_text(f"File: {os.path.basename(file_path)}", 34)]
-                                for key, value in details.items():
-                                    detail_parts.append(color_text(f"{key.capitalize()}: {value}", 34))
-                                print_verbose(", ".join(detail_parts), "info")
-                        print('')
-
-                except Exception as e:
-                    error_log.write(f"Error processing file {file_path}: {e}\n")
-                    if verbose:
-                        print_verbose(f"\rError processing file {file_path}: {e}", "error")
+                        detail_parts = [color_text(f"File: {os.path.basename(file_path)}", 34)]
+                        for key, value in details.items():
+                            detail_parts.append(color_text(f"{key.capitalize()}: {value}", 34))
+                        print_verbose(", ".join(detail_parts), "info")
+                    print('')
+
+            except Exception as e:
+                log_error(file_path, e)
 
         summary_out.write(f'Total files processed: {total_files}\n')
         summary_out.write('File types distribution:\n')
@@ -237,7 +271,15 @@ def generate_file_structure(script_dir, run_name, base_output_dir='file_tree/run
         summary_out.write('MIME types distribution:\n')
         for m_type, count in mime_types.items():
             summary_out.write(f'  {m_type}: {count}\n')
+        if deep_scan:
+            stats = hash_pool.throughput()
+            summary_out.write(f"Deep scan throughput: {stats['mb_per_sec']:.2f} MB/s, {stats['files_per_sec']:.1f} files/s "
+                              f"({stats['files']} files, {format_file_size(stats['bytes'])}, {stats['workers']} workers)\n")
 
+        if index is not None:
+            diff = index.finish()
+            write_diff(diff, os.path.join(output_dir, 'changes.txt'))
+            print_index_diff(diff, index.rehashed)
 
         if deep_scan:
             print_verbose("Deep scan details:", "info")
@@ -251,6 +293,9 @@ def generate_file_structure(script_dir, run_name, base_output_dir='file_tree/run
         if verbose and deep_scan:
             print_deep_scan_summary(deep_scan_details)
 
+        if deep_scan:
+            print_throughput(hash_pool.throughput())
+
         # At the end, just print the total files processed
         print(f"File map complete. Total files processed: {total_files}")
 
@@ -261,4 +306,5 @@ if __name__ == '__main__':
     script_directory = os.getcwd()
     current_time = time.strftime("%Y%m%d_%H%M%S")
     run_name = f'run_{current_time}'
-    generate_file_structure(script_directory, run_name, deep_scan=deep_scan, verbose=verbose)
+    generate_file_structure(script_directory, run_name, deep_scan=deep_scan, verbose=verbose, use_index=not args.no_index,
+                            workers=args.workers)
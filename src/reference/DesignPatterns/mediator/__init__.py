@@ -1 +1,2 @@
-from .mediator import *
\ No newline at end of file
+from .mediator import *
+from .event_bus import *
\ No newline at end of file
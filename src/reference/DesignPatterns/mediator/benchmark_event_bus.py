@@ -0,0 +1,55 @@
+# benchmark_event_bus.py
+# Measures EventBus throughput (events and deliveries per second) as the
+# number of subscribers per topic grows, for exact and wildcard routes.
+# Use: python3 benchmark_event_bus.py --events 100000 --fan_out 1 10 100
+
+import argparse
+import asyncio
+import time
+
+from event_bus import EventBus
+
+
+async def measure(events, fan_out, topics, wildcard):
+    bus = EventBus(maxsize=events)
+    counts = [0]
+
+    def handler(event):
+        counts[0] += 1
+
+    for i in range(fan_out):
+        if wildcard:
+            bus.subscribe("agent.*.reply", handler)
+        else:
+            for topic in range(topics):
+                bus.subscribe(f"agent.{topic}.reply", handler)
+    names = [f"agent.{topic}.reply" for topic in range(topics)]
+
+    start = time.perf_counter()
+    for i in range(events):
+        bus.publish(names[i % topics], i)
+    publish = time.perf_counter() - start
+    await bus.drain()
+    total = time.perf_counter() - start
+    await bus.close()
+    return publish, total, counts[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EventBus fan-out")
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--fan_out", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--topics", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'route':>8} {'fan-out':>8} {'events/s':>12} {'deliveries/s':>14} {'publish s':>10}")
+    for wildcard in (False, True):
+        for fan_out in args.fan_out:
+            events = max(1000, args.events // fan_out)
+            publish, total, deliveries = asyncio.run(measure(events, fan_out, args.topics, wildcard))
+            print(f"{'wildcard' if wildcard else 'exact':>8} {fan_out:>8} {events / total:>12,.0f} "
+                  f"{deliveries / total:>14,.0f} {publish:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import asyncio
+import inspect
+from collections import OrderedDict, namedtuple
+
+Event = namedtuple("Event", ["topic", "payload", "sender", "reply"])
+
+def topic_matches(pattern, topic):
+    """
+    Checks a dotted topic against a subscription pattern.
+
+    Args:
+    pattern (str): Dotted pattern where "*" matches exactly one segment and "#" matches any number,
+        including none (e.g. "agent.*.reply", "agent.#").
+    topic (str): Dotted topic of a published event.
+
+    Returns:
+    bool: True if the pattern matches the topic.
+    """
+    return _match(pattern.split("."), topic.split("."))
+
+def _match(pattern, topic):
+    if not pattern:
+        return not topic
+    head = pattern[0]
+    if head == "#":
+        return any(_match(pattern[1:], topic[i:]) for i in range(len(topic) + 1))
+    if not topic:
+        return False
+    return (head == "*" or head == topic[0]) and _match(pattern[1:], topic[1:])
+
+class Subscription:
+    """
+    One subscriber's bounded asyncio queue of events.
+
+    With a handler, a consumer task calls it for every event (sync or async); without one, read events
+    with `await subscription.get()` or `async for event in subscription`. When the queue is full further
+    events are dropped and counted, so one slow subscriber never blocks publishers or other subscribers.
+    """
+
+    def __init__(self, bus, pattern, handler=None, maxsize=1000):
+        self.bus = bus
+        self.pattern = pattern
+        self.handler = handler
+        self.queue = asyncio.Queue(maxsize)
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self._task = None
+        if handler is not None:
+            self._is_async = inspect.iscoroutinefunction(handler)
+            self._task = asyncio.get_running_loop().create_task(self._consume())
+
+    def offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    async def get(self):
+        event = await self.queue.get()
+        self.queue.task_done()
+        self.delivered += 1
+        return event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+    def unsubscribe(self):
+        self.bus.unsubscribe(self)
+
+    async def _consume(self):
+        while True:
+            event = await self.queue.get()
+            try:
+                result = self.handler(event)
+                if self._is_async:
+                    result = await result
+                self.delivered += 1
+                if event.reply is not None and not event.reply.done():
+                    event.reply.set_result(result)
+            except Exception as e:
+                self.errors += 1
+                if event.reply is not None and not event.reply.done():
+                    event.reply.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+class EventBus:
+    """
+    Topic-indexed asyncio event bus for wiring components without call-stack coupling.
+
+    Exact subscriptions live in a topic-to-subscribers table. Wildcard patterns are matched once per
+    distinct topic and the full subscriber tuple is cached in a routing table, so publishing is a dict
+    lookup followed by a put_nowait per subscriber. The routing table is rebuilt when subscriptions change
+    and holds at most max_routes topics, evicting the least recently published one.
+
+    publish() is fire-and-forget. request() publishes with a reply future and awaits the first handler's
+    return value (or the first reply set by a queue reader).
+    """
+
+    def __init__(self, maxsize=1000, max_routes=4096):
+        self.maxsize = maxsize
+        self.max_routes = max_routes
+        self._exact = {}
+        self._wildcards = []
+        self._routes = OrderedDict()
+        self.published = 0
+        self.unrouted = 0
+
+    def subscribe(self, pattern, handler=None, maxsize=None):
+        subscription = Subscription(self, pattern, handler, maxsize if maxsize is not None else self.maxsize)
+        if "*" in pattern or "#" in pattern:
+            self._wildcards.append(subscription)
+        else:
+            self._exact.setdefault(pattern, []).append(subscription)
+        self._routes.clear()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self._wildcards:
+            self._wildcards.remove(subscription)
+        else:
+            subscribers = self._exact.get(subscription.pattern, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._exact.pop(subscription.pattern, None)
+        self._routes.clear()
+        if subscription._task is not None:
+            subscription._task.cancel()
+
+    def route(self, topic):
+        """Returns the subscriptions that receive events on topic."""
+        subscribers = self._routes.get(topic)
+        if subscribers is not None:
+            self._routes.move_to_end(topic)
+            return subscribers
+        subscribers = tuple(self._exact.get(topic, ())) + tuple(
+            s for s in self._wildcards if topic_matches(s.pattern, topic))
+        self._routes[topic] = subscribers
+        if len(self._routes) > self.max_routes:
+            self._routes.popitem(last=False)
+        return subscribers
+
+    def publish(self, topic, payload=None, sender=None):
+        """
+        Delivers an event to every matching subscriber without waiting for them.
+
+        Returns:
+        int: The number of subscribers the event was queued for.
+        """
+        return self._dispatch(Event(topic, payload, sender, None))
+
+    async def request(self, topic, payload=None, sender=None, timeout=None):
+        """
+        Publishes an event and waits for the first reply.
+
+        Raises:
+        LookupError: If no subscriber matches the topic.
+        asyncio.TimeoutError: If no reply arrives within timeout seconds.
+        """
+        reply = asyncio.get_running_loop().create_future()
+        if not self._dispatch(Event(topic, payload, sender, reply)):
+            raise LookupError(f"No subscriber accepted a request on {topic!r}")
+        return await asyncio.wait_for(reply, timeout)
+
+    async def drain(self):
+        """Waits until every event queued for a handler subscription has been handled."""
+        for subscription in self._subscriptions():
+            if subscription._task is not None:
+                await subscription.queue.join()
+
+    async def close(self):
+        tasks = [s._task for s in self._subscriptions() if s._task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._exact.clear()
+        self._wildcards.clear()
+        self._routes.clear()
+
+    def _subscriptions(self):
+        return [s for subscribers in self._exact.values() for s in subscribers] + self._wildcards
+
+    def _dispatch(self, event):
+        self.published += 1
+        subscribers = self.route(event.topic)
+        queued = 0
+        for subscription in subscribers:
+            if subscription.offer(event):
+                queued += 1
+        if not subscribers:
+            self.unrouted += 1
+        return queued
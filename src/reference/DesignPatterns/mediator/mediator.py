@@ -14,15 +14,18 @@ class ConcreteMediator(Mediator):
         self._component1.mediator = self
         self._component2 = component2
         self._component2.mediator = self
+        # Reactions are looked up by event instead of walking an if/elif chain of string comparisons
+        self._reactions = {
+            "A": (self._component2.do_c,),
+            "D": (self._component1.do_b, self._component2.do_c),
+        }
 
     def notify(self, sender: object, event: str) -> None:
-        if event == "A":
-            print("Mediator reacts on A and triggers:")
-            self._component2.do_c()
-        elif event == "D":
-            print("Mediator reacts on D and triggers:")
-            self._component1.do_b()
-            self._component2.do_c()
+        reactions = self._reactions.get(event)
+        if reactions:
+            print(f"Mediator reacts on {event} and triggers:")
+            for reaction in reactions:
+                reaction()
 
 class BaseComponent:
     """
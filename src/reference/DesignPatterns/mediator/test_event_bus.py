@@ -0,0 +1,119 @@
+import asyncio
+import unittest
+
+from mediator import EventBus, topic_matches
+
+class TestTopicMatching(unittest.TestCase):
+    def test_wildcards(self):
+        """Test that * matches one segment and # matches any number."""
+        self.assertTrue(topic_matches("agent.*.reply", "agent.critic.reply"))
+        self.assertFalse(topic_matches("agent.*.reply", "agent.critic.x.reply"))
+        self.assertTrue(topic_matches("agent.#", "agent"))
+        self.assertTrue(topic_matches("agent.#", "agent.critic.reply"))
+        self.assertTrue(topic_matches("#.reply", "agent.critic.reply"))
+        self.assertFalse(topic_matches("agent.critic", "agent.critic.reply"))
+
+class TestEventBus(unittest.TestCase):
+    def test_fire_and_forget_fan_out(self):
+        """Test that exact and wildcard subscribers all receive a published event."""
+        async def run():
+            bus = EventBus()
+            seen = []
+            bus.subscribe("agent.critic.reply", lambda event: seen.append(("exact", event.payload)))
+            bus.subscribe("agent.*.reply", lambda event: seen.append(("star", event.payload)))
+            bus.subscribe("agent.#", lambda event: seen.append(("hash", event.payload)))
+            bus.subscribe("other", lambda event: seen.append(("other", event.payload)))
+            self.assertEqual(bus.publish("agent.critic.reply", 1), 3)
+            await bus.drain()
+            await bus.close()
+            return sorted(seen)
+
+        self.assertEqual(asyncio.run(run()), [("exact", 1), ("hash", 1), ("star", 1)])
+
+    def test_queue_subscriber_receives_in_order(self):
+        """Test that a handlerless subscription can be read as an async iterator."""
+        async def run():
+            bus = EventBus()
+            subscription = bus.subscribe("ticks")
+            for i in range(5):
+                bus.publish("ticks", i)
+            return [(await subscription.get()).payload for _ in range(5)]
+
+        self.assertEqual(asyncio.run(run()), [0, 1, 2, 3, 4])
+
+    def test_request_reply(self):
+        """Test that request() returns the handler's result, sync or async."""
+        async def run():
+            bus = EventBus()
+
+            async def double(event):
+                await asyncio.sleep(0)
+                return event.payload * 2
+
+            bus.subscribe("math.double", double)
+            bus.subscribe("math.negate", lambda event: -event.payload)
+            results = await asyncio.gather(bus.request("math.double", 21), bus.request("math.negate", 3))
+            await bus.close()
+            return results
+
+        self.assertEqual(asyncio.run(run()), [42, -3])
+
+    def test_request_errors(self):
+        """Test that handler errors reach the requester and unrouted requests fail fast."""
+        async def run():
+            bus = EventBus()
+
+            def fail(event):
+                raise ValueError("bad input")
+
+            subscription = bus.subscribe("fail", fail)
+            with self.assertRaises(ValueError):
+                await bus.request("fail", timeout=1)
+            with self.assertRaises(LookupError):
+                await bus.request("nobody")
+            self.assertEqual(subscription.errors, 1)
+            await bus.close()
+
+        asyncio.run(run())
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test per-subscriber backpressure: a full queue drops new events and counts them."""
+        async def run():
+            bus = EventBus()
+            slow = bus.subscribe("events", maxsize=2)
+            fast = []
+            bus.subscribe("events", lambda event: fast.append(event.payload))
+            for i in range(5):
+                bus.publish("events", i)
+            await bus.drain()
+            await bus.close()
+            return slow.dropped, fast
+
+        self.assertEqual(asyncio.run(run()), (3, [0, 1, 2, 3, 4]))
+
+    def test_unsubscribe_updates_routes(self):
+        async def run():
+            bus = EventBus()
+            subscription = bus.subscribe("agent.*")
+            self.assertEqual(bus.publish("agent.a"), 1)
+            subscription.unsubscribe()
+            self.assertEqual(bus.publish("agent.a"), 0)
+
+        asyncio.run(run())
+
+    def test_route_cache_is_bounded(self):
+        async def run():
+            bus = EventBus(max_routes=2)
+            bus.subscribe("agent.*")
+            for topic in ("agent.a", "agent.b", "other.c", "agent.a"):
+                bus.publish(topic)
+            self.assertEqual(list(bus._routes), ["other.c", "agent.a"])
+            self.assertEqual(bus.publish("agent.b"), 1)
+
+        asyncio.run(run())
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
 # memento.py
+import pickle
+import struct
+import tempfile
+import zlib
+from collections import deque
 from datetime import datetime
-from typing import List
+from typing import Iterator, List
 
 class Memento:
     """
@@ -14,9 +19,9 @@ class Memento:
         pass
 
 class ConcreteMemento(Memento):
-    def __init__(self, state: str) -> None:
+    def __init__(self, state: str, date: str = None) -> None:
         self._state = state
-        self._date = str(datetime.now())[:19]
+        self._date = date or str(datetime.now())[:19]
 
     def get_state(self) -> str:
         return self._state
@@ -50,13 +55,170 @@ class Originator:
         self._state = memento.get_state()
         print(f"Originator: My state has changed to: {self._state}")
 
+_KEYFRAME, _DELTA = 0, 1
+_STR, _BYTES, _PICKLE = 0, 1, 2
+_COMPARE_CHUNK = 64 * 1024
+_LENGTH = struct.Struct("<I")
+
+def _encode_state(state):
+    if isinstance(state, str):
+        return _STR, state.encode("utf-8", "surrogatepass")
+    if isinstance(state, bytes):
+        return _BYTES, state
+    return _PICKLE, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _decode_state(tag, data):
+    if tag == _STR:
+        return data.decode("utf-8", "surrogatepass")
+    if tag == _BYTES:
+        return data
+    return pickle.loads(data)
+
+def _common_prefix(a, b):
+    limit = min(len(a), len(b))
+    start = 0
+    # Skip whole equal chunks first, then binary search inside the first differing one
+    while start + _COMPARE_CHUNK <= limit and a[start:start + _COMPARE_CHUNK] == b[start:start + _COMPARE_CHUNK]:
+        start += _COMPARE_CHUNK
+    lo, hi = start, min(limit, start + _COMPARE_CHUNK)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[start:mid] == b[start:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def _common_suffix(a, b, limit):
+    end = 0
+    while end + _COMPARE_CHUNK <= limit and \
+            a[len(a) - end - _COMPARE_CHUNK:len(a) - end] == b[len(b) - end - _COMPARE_CHUNK:len(b) - end]:
+        end += _COMPARE_CHUNK
+    lo, hi = end, min(limit, end + _COMPARE_CHUNK)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - end] == b[len(b) - mid:len(b) - end]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+class MementoHistory:
+    """
+    Bounded-memory, delta-compressed store of mementos.
+
+    Every keyframe_interval-th snapshot is a zlib-compressed keyframe. The others store only what changed
+    since the previous snapshot: the lengths of the unchanged prefix and suffix plus the compressed middle,
+    which for append-mostly states such as conversations is just the new turn. Restoring any snapshot
+    decompresses its keyframe and replays at most keyframe_interval - 1 deltas.
+
+    The newest max_in_memory records stay in a ring; older ones are appended to spill_path (a temporary
+    file by default) and only their file offsets are kept in memory.
+    """
+
+    def __init__(self, keyframe_interval: int = 32, max_in_memory: int = 64, spill_path: str = None,
+                 level: int = 6) -> None:
+        if keyframe_interval < 1 or max_in_memory < 1:
+            raise ValueError("keyframe_interval and max_in_memory must be at least 1")
+        self.keyframe_interval = keyframe_interval
+        self.max_in_memory = max_in_memory
+        self.level = level
+        self._ring = deque()
+        self._offsets = []
+        self._spill = open(spill_path, "w+b") if spill_path else tempfile.TemporaryFile()
+        self._last = None
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._ring)
+
+    def append(self, memento: ConcreteMemento) -> None:
+        tag, data = _encode_state(memento.get_state())
+        index = len(self)
+        if index % self.keyframe_interval == 0 or self._last is None:
+            record = (_KEYFRAME, tag, 0, 0, zlib.compress(data, self.level))
+        else:
+            previous = self._last
+            prefix = _common_prefix(previous, data)
+            suffix = _common_suffix(previous, data, min(len(previous), len(data)) - prefix)
+            middle = data[prefix:len(data) - suffix]
+            record = (_DELTA, tag, prefix, suffix, zlib.compress(middle, self.level))
+        self._ring.append((memento.get_date(), record))
+        self._last = data
+        self.raw_bytes += len(data)
+        self.stored_bytes += len(record[4])
+        while len(self._ring) > self.max_in_memory:
+            self._spill_oldest()
+
+    def __getitem__(self, index: int) -> ConcreteMemento:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("memento index out of range")
+        date, (_, tag, _, _, _) = self._record(index)
+        return ConcreteMemento(_decode_state(tag, self._reconstruct(index)), date)
+
+    def __iter__(self) -> Iterator[ConcreteMemento]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def pop(self) -> ConcreteMemento:
+        """Removes and returns the newest memento."""
+        if not len(self):
+            raise IndexError("pop from empty history")
+        memento = self[-1]
+        if self._ring:
+            self._ring.pop()
+        else:
+            self._spill.truncate(self._offsets.pop())
+            self._spill.seek(0, 2)
+        self._last = None
+        if len(self):
+            self._last = self._reconstruct(len(self) - 1)
+        return memento
+
+    def close(self) -> None:
+        self._spill.close()
+
+    def _spill_oldest(self):
+        entry = self._ring.popleft()
+        payload = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spill.seek(0, 2)
+        self._offsets.append(self._spill.tell())
+        self._spill.write(_LENGTH.pack(len(payload)))
+        self._spill.write(payload)
+
+    def _record(self, index):
+        spilled = len(self._offsets)
+        if index >= spilled:
+            return self._ring[index - spilled]
+        self._spill.seek(self._offsets[index])
+        (length,) = _LENGTH.unpack(self._spill.read(_LENGTH.size))
+        return pickle.loads(self._spill.read(length))
+
+    def _reconstruct(self, index):
+        if index == len(self) - 1 and self._last is not None:
+            return self._last
+        start = index - index % self.keyframe_interval
+        data = zlib.decompress(self._record(start)[1][4])
+        for i in range(start + 1, index + 1):
+            _, (kind, _, prefix, suffix, middle) = self._record(i)
+            if kind == _KEYFRAME:
+                data = zlib.decompress(middle)
+            else:
+                data = data[:prefix] + zlib.decompress(middle) + data[len(data) - suffix:]
+        return data
+
 class Caretaker:
     """
     The Caretaker works with Mementos via the base Memento interface.
     It can store and restore the Originator's state.
+
+    Mementos are kept in a MementoHistory, so frequent backups of large states stay bounded in memory.
     """
-    def __init__(self, originator: Originator) -> None:
-        self._mementos = []
+    def __init__(self, originator: Originator, history: MementoHistory = None) -> None:
+        self._mementos = history if history is not None else MementoHistory()
         self._originator = originator
 
     def backup(self) -> None:
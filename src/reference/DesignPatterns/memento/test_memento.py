@@ -1,6 +1,9 @@
+import os
+import random
+import tempfile
 import unittest
 from unittest.mock import patch
-from memento import Memento, ConcreteMemento, Originator, Caretaker
+from memento import Memento, ConcreteMemento, Originator, Caretaker, MementoHistory
 
 class TestMementoPattern(unittest.TestCase):
     def setUp(self):
@@ -37,6 +40,79 @@ class TestMementoPattern(unittest.TestCase):
         self.caretaker.undo()
         self.assertEqual(self.originator._state, "State A")
 
+class TestMementoHistory(unittest.TestCase):
+    def make_states(self, count, seed=0):
+        """Conversation-like states: mostly appends, with occasional edits and truncations."""
+        rng = random.Random(seed)
+        state = "system: you are helpful\n"
+        states = []
+        for turn in range(count):
+            roll = rng.random()
+            if roll < 0.1 and len(state) > 40:
+                cut = rng.randrange(len(state) // 2, len(state))
+                state = state[:cut]
+            elif roll < 0.2:
+                at = rng.randrange(len(state))
+                state = state[:at] + f"[edit {turn}]" + state[at + 5:]
+            else:
+                state += f"turn {turn}: " + "é" * rng.randrange(5) + "x" * rng.randrange(50) + "\n"
+            states.append(state)
+        return states
+
+    def test_every_snapshot_restores_exactly(self):
+        """Test that deltas, keyframes and spilled records all reconstruct the saved state."""
+        states = self.make_states(200)
+        history = MementoHistory(keyframe_interval=8, max_in_memory=10)
+        for state in states:
+            history.append(ConcreteMemento(state))
+        self.assertEqual(len(history), 200)
+        self.assertEqual([history[i].get_state() for i in range(200)], states)
+        self.assertEqual(history[-1].get_state(), states[-1])
+
+    def test_ring_is_bounded_and_spills_to_file(self):
+        """Test that only max_in_memory records stay in memory and the rest go to spill_path."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.bin")
+            history = MementoHistory(keyframe_interval=4, max_in_memory=5, spill_path=path)
+            for state in self.make_states(50):
+                history.append(ConcreteMemento(state))
+            self.assertEqual(len(history._ring), 5)
+            self.assertGreater(os.path.getsize(path), 0)
+            history.close()
+
+    def test_pop_across_the_spill_boundary(self):
+        """Test that popping keeps working after the ring is empty and new appends follow."""
+        states = self.make_states(30, seed=1)
+        history = MementoHistory(keyframe_interval=4, max_in_memory=3)
+        for state in states:
+            history.append(ConcreteMemento(state))
+        popped = [history.pop().get_state() for _ in range(10)]
+        self.assertEqual(popped, states[:-11:-1])
+        history.append(ConcreteMemento("fresh"))
+        self.assertEqual(history[-1].get_state(), "fresh")
+        self.assertEqual(history[-2].get_state(), states[19])
+
+    def test_deltas_compress_append_only_history(self):
+        """Test that growing states cost far less than storing full copies."""
+        history = MementoHistory()
+        state = ""
+        for turn in range(300):
+            state += f"user: question {turn}\nassistant: " + "answer " * 20 + "\n"
+            history.append(ConcreteMemento(state))
+        self.assertLess(history.stored_bytes * 50, history.raw_bytes)
+
+    def test_non_string_states(self):
+        history = MementoHistory(keyframe_interval=2)
+        for turn in range(5):
+            history.append(ConcreteMemento({"turn": turn, "messages": ["hi"] * turn}))
+        self.assertEqual(history[3].get_state(), {"turn": 3, "messages": ["hi"] * 3})
+
+    def test_dates_survive_round_trip(self):
+        history = MementoHistory(max_in_memory=1)
+        history.append(ConcreteMemento("a", "2024-01-01 00:00:00"))
+        history.append(ConcreteMemento("b", "2024-01-02 00:00:00"))
+        self.assertEqual(history[0].get_date(), "2024-01-01 00:00:00")
+
 def main():
     unittest.main()
 
@@ -1 +1,2 @@
-from .memoize import *
\ No newline at end of file
+from .memoize import *
+from .disk_cache import *
\ No newline at end of file
@@ -0,0 +1,62 @@
+# benchmark_keys.py
+# Measures memoize key construction for chat-style message lists, against
+# the original (args, frozenset(kwargs.items())) key built from tuples.
+# Use: python3 benchmark_keys.py --messages 10 100 1000 --calls 2000
+
+import argparse
+import time
+
+from memoize import KeyBuilder
+
+
+def chat(messages, model="gpt-4", temperature=0.7, max_tokens=None):
+    return None
+
+
+def make_messages(count):
+    roles = ["system", "user", "assistant"]
+    return [{"role": roles[i % 3], "content": f"Message {i}: " + "lorem ipsum dolor sit amet " * 8}
+            for i in range(count)]
+
+
+def freeze(value):
+    """The usual workaround: recursively turn lists and dicts into tuples so they hash."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def legacy_key(args, kwargs):
+    """The original (args, frozenset(kwargs.items())) key over frozen arguments."""
+    return (freeze(args), frozenset((k, freeze(v)) for k, v in kwargs.items()))
+
+
+def measure(build, messages, calls):
+    """Returns microseconds per cache hit: build the key, then find it in a dict holding an equal key."""
+    table = {build((make_messages(len(messages)),), {"temperature": 0.2}): None}
+    start = time.perf_counter()
+    for _ in range(calls):
+        table[build((messages,), {"temperature": 0.2})]
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memoize key construction")
+    parser.add_argument("--messages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    builder = KeyBuilder(chat)
+    print(f"{'messages':>10} {'legacy us/hit':>14} {'builder us/hit':>15}")
+    for count in args.messages:
+        messages = make_messages(count)
+        calls = max(10, args.calls * 10 // max(count, 10))
+        legacy = measure(legacy_key, messages, calls)
+        built = measure(builder, messages, calls)
+        print(f"{count:>10} {legacy:>14.1f} {built:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmark_memoize.py
+# Measures memoize hit and miss latency as max_size grows, against the
+# original timestamp-scanning implementation.
+# Use: python3 benchmark_memoize.py --sizes 100 1000 10000 100000
+
+import argparse
+import functools
+import time
+
+from memoize import memoize
+
+
+def legacy_memoize(max_size=100, timeout=None):
+    """The original decorator: O(n) expiry scan per call and O(n) eviction."""
+    def memoize_decorator(func):
+        cache = {}
+        timestamps = {}
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, frozenset(kwargs.items()))
+            if timeout:
+                for k in list(timestamps.keys()):
+                    if time.time() - timestamps[k] > timeout:
+                        del cache[k]
+                        del timestamps[k]
+            if key in cache:
+                return cache[key]
+            if len(cache) >= max_size:
+                oldest_key = min(timestamps, key=timestamps.get)
+                del cache[oldest_key]
+                del timestamps[oldest_key]
+            result = func(*args, **kwargs)
+            cache[key] = result
+            timestamps[key] = time.time()
+            return result
+        return wrapper
+    return memoize_decorator
+
+
+def measure(decorator, size, calls):
+    func = decorator(max_size=size, timeout=300)(lambda x: x)
+    for i in range(size):
+        func(i)
+
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i % size)
+    hit = (time.perf_counter() - start) / calls
+
+    start = time.perf_counter()
+    for i in range(calls):
+        func(size + i)  # every call misses and evicts
+    miss = (time.perf_counter() - start) / calls
+    return hit, miss
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memoize latency against max_size.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--calls', type=int, default=20000)
+    parser.add_argument('--legacy_limit', type=int, default=1000,
+                        help='Largest max_size to run the legacy decorator at (it is O(n) per call)')
+    args = parser.parse_args()
+
+    print(f"{'max_size':>10} {'hit (us)':>10} {'miss (us)':>10} {'legacy hit':>11} {'legacy miss':>12}")
+    for size in args.sizes:
+        hit, miss = measure(memoize, size, args.calls)
+        legacy = ""
+        if size <= args.legacy_limit:
+            legacy_hit, legacy_miss = measure(legacy_memoize, size, max(args.calls // 20, 100))
+            legacy = f"{legacy_hit * 1e6:11.2f} {legacy_miss * 1e6:12.2f}"
+        print(f"{size:>10} {hit * 1e6:10.2f} {miss * 1e6:10.2f} {legacy}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+import argparse
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise RuntimeError("msgpack serialization requires the 'msgpack' package")
+    return msgpack
+
+SERIALIZERS = {
+    "pickle": (lambda value: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+    "json": (lambda value: json.dumps(value).encode("utf-8"), lambda data: json.loads(data.decode("utf-8"))),
+    "msgpack": (lambda value: _msgpack().packb(value), lambda data: _msgpack().unpackb(data)),
+}
+
+# json and msgpack turn tuples into lists and non-str dict keys into strings, so values written with them
+# are checked to read back equal before they are stored
+_LOSSY_SERIALIZERS = {"json", "msgpack"}
+
+class SerializationError(ValueError):
+    """Raised by DiskCache.set when a value cannot be stored faithfully with the chosen serializer."""
+
+class DiskCache:
+    """
+    SQLite-backed second tier for memoize that survives process restarts.
+
+    Values are serialized with pickle (the default), json or msgpack and stored with their size and last
+    access time. json and msgpack only accept values that read back equal, so a tuple result is rejected
+    rather than returned as a list on a warm read. When the stored bytes exceed max_bytes the least recently
+    used entries are deleted, so the store stays within its budget across runs. Rows that can no longer be
+    deserialized are dropped and treated as misses.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, serializer="pickle", timeout=None):
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown serializer {serializer!r}; expected one of {sorted(SERIALIZERS)}")
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.serializer = serializer
+        self._dumps, self._loads = SERIALIZERS[serializer]
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def get(self, key, default=_MISSING):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or (row[1] is not None and now > row[1]):
+                if row is not None:
+                    self._delete(key)
+                self.misses += 1
+                return default
+            try:
+                value = self._loads(row[0])
+            except Exception as e:
+                logger.warning("Dropping unreadable disk cache entry %r: %s", key, e)
+                self._delete(key)
+                self.errors += 1
+                self.misses += 1
+                return default
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return value
+
+    def set(self, key, value, namespace="", timeout=_MISSING):
+        """
+        Stores value under key.
+
+        Args:
+        timeout (float): Seconds until the entry expires, overriding the cache's own timeout; None never
+            expires.
+
+        Raises:
+        SerializationError: If value cannot be serialized, or would not read back equal.
+        """
+        try:
+            data = self._dumps(value)
+            exact = self.serializer not in _LOSSY_SERIALIZERS or self._loads(data) == value
+        except Exception as e:
+            raise SerializationError(f"Cannot store {type(value).__name__!r} with {self.serializer}: {e}") from e
+        if not exact:
+            raise SerializationError(f"{type(value).__name__!r} value does not round-trip through {self.serializer}")
+        now = time.time()
+        if timeout is _MISSING:
+            timeout = self.timeout
+        expires_at = now + timeout if timeout else None
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                               (key, namespace, data, len(data), now, expires_at))
+            self._total_bytes += len(data) - (previous[0] if previous else 0)
+            if self.max_bytes is not None and self._total_bytes > self.max_bytes:
+                self._evict(self.max_bytes)
+
+    def prune(self, max_bytes=None, expired=True):
+        """
+        Deletes expired entries and then least recently used entries until the store fits max_bytes.
+
+        Returns:
+        int: The number of entries deleted.
+        """
+        with self._lock:
+            deleted = 0
+            if expired:
+                deleted += self._conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?",
+                                              (time.time(),)).rowcount
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            budget = self.max_bytes if max_bytes is None else max_bytes
+            if budget is not None and self._total_bytes > budget:
+                deleted += self._evict(budget)
+            return deleted
+
+    def clear(self, namespace=None):
+        with self._lock:
+            if namespace is None:
+                self._conn.execute("DELETE FROM entries")
+            else:
+                self._conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, COUNT(*), SUM(size) FROM entries GROUP BY namespace ORDER BY SUM(size) DESC"
+            ).fetchall()
+        return {
+            "path": self.path,
+            "entries": sum(row[1] for row in rows),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "namespaces": {row[0]: {"entries": row[1], "bytes": row[2]} for row in rows},
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _delete(self, key):
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._total_bytes -= row[0]
+
+    def _evict(self, budget):
+        deleted = 0
+        cursor = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access")
+        victims = []
+        for key, size in cursor:
+            if self._total_bytes <= budget:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+        if victims:
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+            deleted = len(victims)
+            self.evictions += deleted
+        return deleted
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and prune a memoize disk cache.")
+    parser.add_argument("path", help="Path to the SQLite cache file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="Show entry counts and bytes per namespace")
+    prune_parser = subparsers.add_parser("prune", help="Drop expired entries and shrink to a byte budget")
+    prune_parser.add_argument("--max_bytes", type=int, default=None, help="Byte budget to shrink to")
+    clear_parser = subparsers.add_parser("clear", help="Delete all entries, or one namespace")
+    clear_parser.add_argument("--namespace", default=None, help="Only clear this function's entries")
+    args = parser.parse_args()
+
+    cache = DiskCache(args.path, max_bytes=None)
+    if args.command == "stats":
+        stats = cache.stats()
+        print(f"{stats['path']}: {stats['entries']} entries, {stats['bytes']} bytes")
+        for namespace, info in stats["namespaces"].items():
+            print(f"  {namespace}: {info['entries']} entries, {info['bytes']} bytes")
+    elif args.command == "prune":
+        print(f"Deleted {cache.prune(max_bytes=args.max_bytes)} entries")
+    elif args.command == "clear":
+        cache.clear(args.namespace)
+        print("Cleared")
+    cache.close()
+
+if __name__ == "__main__":
+    main()
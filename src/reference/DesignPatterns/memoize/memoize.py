@@ -1,35 +1,379 @@
+import asyncio
+import dataclasses
 import functools
+import hashlib
+import inspect
+import logging
+import sqlite3
 import time
+from collections import OrderedDict, namedtuple
+from threading import Event, Lock
 
-def memoize(max_size=100, timeout=None):
+logger = logging.getLogger(__name__)
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "expirations", "max_size", "current_size"])
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with optional per-entry time-to-live.
+
+    Entries live in an OrderedDict ordered from least to most recently used, so lookups, inserts and
+    evictions are all O(1). Expired entries are dropped lazily when they are looked up, or when they
+    reach the LRU end during eviction, instead of scanning every timestamp on every call.
+    """
+
+    def __init__(self, max_size=100, timeout=None):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or time.time() <= expires_at:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def peek(self, key, default=_MISSING):
+        """Returns a live entry without touching its LRU position or the statistics."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and (entry[1] is None or time.time() <= entry[1]):
+                return entry[0]
+            return default
+
+    def set(self, key, value):
+        expires_at = time.time() + self.timeout if self.timeout else None
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            elif self.max_size is not None:
+                while len(self._data) >= self.max_size and self._data:
+                    _, (_, oldest_expiry) = self._data.popitem(last=False)
+                    if oldest_expiry is not None and time.time() > oldest_expiry:
+                        self.expirations += 1
+                    else:
+                        self.evictions += 1
+            self._data[key] = (value, expires_at)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.expirations, self.max_size, len(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+# bool and float are left out because 1 == True == 1.0 would give f(1), f(True) and f(1.0) one tuple key;
+# the canonical encoding tags each type
+_SIMPLE_TYPES = frozenset([str, int, type(None), bytes])
+
+def _is_simple(values):
+    for value in values:
+        value_type = type(value)
+        if value_type not in _SIMPLE_TYPES and not (value_type is tuple and _is_simple(value)):
+            return False
+    return True
+
+def _encode(append, value, opaque):
+    """Appends a canonical, type-tagged text encoding of value, one piece at a time."""
+    value_type = type(value)
+    if value_type is str:
+        append("s%d:" % len(value))
+        append(value)
+    elif value_type is dict:
+        # Equal dicts must produce equal keys whatever their insertion order
+        append("d%d{" % len(value))
+        try:
+            keys = sorted(value)
+        except TypeError:
+            keys = sorted(value, key=lambda k: _digest(k, opaque))
+        for k in keys:
+            item = value[k]
+            # Inlined str case: message dicts are almost entirely str -> str
+            if type(k) is str and type(item) is str:
+                append("s%d:%ss%d:" % (len(k), k, len(item)))
+                append(item)
+            else:
+                _encode(append, k, opaque)
+                _encode(append, item, opaque)
+        append("}")
+    elif value_type is list or value_type is tuple:
+        append(("l%d[" if value_type is list else "t%d[") % len(value))
+        for item in value:
+            _encode(append, item, opaque)
+        append("]")
+    elif value_type is int:
+        append("i%d;" % value)
+    elif value_type is bool:
+        append("T" if value else "F")
+    elif value_type is float:
+        append("f%r;" % value)
+    elif value is None:
+        append("N")
+    elif value_type is bytes:
+        append("y%s;" % value.hex())
+    elif value_type is set or value_type is frozenset:
+        append("S%d{" % len(value))
+        for item_digest in sorted(_digest(item, opaque) for item in value):
+            append(item_digest.hex())
+        append("}")
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        append("D%s.%s(" % (value_type.__module__, value_type.__qualname__))
+        for field in dataclasses.fields(value):
+            _encode(append, field.name, opaque)
+            _encode(append, getattr(value, field.name), opaque)
+        append(")")
+    else:
+        try:
+            hash(value)
+        except TypeError:
+            raise TypeError(f"memoize cannot build a key for unhashable {value_type.__name__!r} arguments; "
+                            f"pass key= to memoize") from None
+        # Other hashable objects are compared by their own __eq__/__hash__
+        append("o%d;" % len(opaque))
+        opaque.append(value)
+
+def _digest(value, opaque):
+    parts = []
+    _encode(parts.append, value, opaque)
+    return hashlib.blake2b("".join(parts).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+def stable_digest(value):
+    """
+    Returns a hex digest of value that is stable across processes.
+
+    Raises TypeError if value contains objects with no canonical encoding.
+    """
+    opaque = []
+    digest = _digest(value, opaque)
+    if opaque:
+        raise TypeError(f"{type(opaque[0]).__name__!r} values have no stable encoding")
+    return digest.hex()
+
+class KeyBuilder:
+    """
+    Builds canonical cache keys for calls to one function.
+
+    Arguments are bound to the function's signature with defaults applied, so f(1, b=2), f(1, 2) and
+    f(1) (when b defaults to 2) share a key. Calls made only of str, int, bytes and None (or tuples of
+    them) use a plain tuple key. Anything else, including bools, floats, lists, dicts, sets and dataclasses,
+    is hashed incrementally into a type-tagged digest, so large chat payloads never become big nested tuples.
+    """
+
+    def __init__(self, func):
+        self.signature = inspect.signature(func)
+        params = list(self.signature.parameters.values())
+        self.names = [p.name for p in params]
+        self.index = {p.name: i for i, p in enumerate(params)}
+        self.defaults = [p.default for p in params]
+        self.simple_signature = all(p.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD for p in params)
+
+    def bind(self, args, kwargs):
+        """Returns the call's arguments as a tuple in signature order, with defaults filled in."""
+        if self.simple_signature and len(args) <= len(self.names):
+            if not kwargs and len(args) == len(self.names):
+                return args
+            values = list(args) + [_MISSING] * (len(self.names) - len(args))
+            bound = True
+            for name, value in kwargs.items():
+                i = self.index.get(name)
+                if i is None or values[i] is not _MISSING:
+                    bound = False
+                    break
+                values[i] = value
+            if bound:
+                for i, value in enumerate(values):
+                    if value is _MISSING:
+                        if self.defaults[i] is inspect.Parameter.empty:
+                            bound = False
+                            break
+                        values[i] = self.defaults[i]
+            if bound:
+                return tuple(values)
+
+        # *args, **kwargs, keyword-only parameters and bad calls take the general path (and its errors)
+        bound_arguments = self.signature.bind(*args, **kwargs)
+        bound_arguments.apply_defaults()
+        values = []
+        for name, value in bound_arguments.arguments.items():
+            kind = self.signature.parameters[name].kind
+            if kind is inspect.Parameter.VAR_KEYWORD:
+                value = tuple(sorted(value.items()))
+            values.append(value)
+        return tuple(values)
+
+    def __call__(self, args, kwargs):
+        values = self.bind(args, kwargs)
+        if _is_simple(values):
+            return values
+        opaque = []
+        digest = _digest(values, opaque)
+        return (digest, tuple(opaque)) if opaque else digest
+
+class _Flight:
+    """A computation in progress that concurrent callers with the same key wait on."""
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error = None
+
+def memoize(max_size=100, timeout=None, single_flight=False, disk=None, key=None):
+    """
+    Caches a function's results in an LRUCache.
+
+    Keys come from KeyBuilder, so list and dict arguments work and keyword/positional spellings of the
+    same call share an entry. Pass key=callable(*args, **kwargs) to supply your own hashable key instead.
+
+    With disk set to a DiskCache, lookups go memory, then disk, then compute, and computed results are
+    written to both tiers so later processes start warm. timeout, when set, also applies to the disk
+    entries. Calls whose arguments cannot be keyed for disk, and results the disk's serializer cannot
+    store, still use the memory tier; failed disk writes are logged.
+
+    With single_flight=True, concurrent calls with the same arguments share one computation: the first
+    caller computes and the others wait for its result. Exceptions reach every waiter and are never
+    cached. Coroutine functions are supported; their awaited results are cached, and single-flight
+    waiters share one task, so cancelling one waiter does not cancel the computation.
+    """
     def memoize_decorator(func):
-        cache = {}
-        timestamps = {}
+        cache = LRUCache(max_size=max_size, timeout=timeout)
+        flights = {}
+        flights_lock = Lock()
+        namespace = f"{func.__module__}.{func.__qualname__}"
+        build_key = (lambda args, kwargs: key(*args, **kwargs)) if key is not None else KeyBuilder(func)
+
+        def from_disk(key, args, kwargs):
+            if disk is None:
+                return _MISSING, None
+            try:
+                dkey = f"{namespace}:{stable_digest(key)}"
+            except TypeError:
+                dkey = None
+            if dkey is None:
+                return _MISSING, None
+            try:
+                result = disk.get(dkey, _MISSING)
+            except sqlite3.Error as e:
+                # A broken disk tier degrades to memory-only caching; skip the write as well
+                logger.warning("Not reading %s result from disk: %s", namespace, e)
+                return _MISSING, None
+            if result is not _MISSING:
+                cache.set(key, result)
+            return result, dkey
+
+        def store(key, dkey, result):
+            cache.set(key, result)
+            if dkey is not None:
+                try:
+                    if timeout is None:
+                        disk.set(dkey, result, namespace)
+                    else:
+                        disk.set(dkey, result, namespace, timeout=timeout)
+                except (ValueError, sqlite3.Error) as e:
+                    # DiskCache.set raises SerializationError, a ValueError, for results it cannot store
+                    logger.warning("Not caching %s result on disk: %s", namespace, e)
+
+        def compute(key, args, kwargs):
+            result, dkey = from_disk(key, args, kwargs)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                store(key, dkey, result)
+            return result
+
+        def call_single_flight(key, args, kwargs):
+            with flights_lock:
+                flight = flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = flights[key] = _Flight()
+            if not leader:
+                flight.done.wait()
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+
+            try:
+                # A previous leader may have finished between our cache miss and taking the flight
+                result = cache.peek(key)
+                if result is _MISSING:
+                    result = compute(key, args, kwargs)
+                flight.result = result
+                return result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                with flights_lock:
+                    del flights[key]
+                flight.done.set()
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            key = (args, frozenset(kwargs.items()))
-
-            # Check for expired cache entries
-            if timeout:
-                for k in list(timestamps.keys()):
-                    if time.time() - timestamps[k] > timeout:
-                        del cache[k]
-                        del timestamps[k]
-
-            if key in cache:
-                return cache[key]
-
-            # If cache size limit is reached, remove the oldest item
-            if len(cache) >= max_size:
-                oldest_key = min(timestamps, key=timestamps.get)
-                del cache[oldest_key]
-                del timestamps[oldest_key]
-
-            result = func(*args, **kwargs)
-            cache[key] = result
-            timestamps[key] = time.time()
+            key = build_key(args, kwargs)
+
+            result = cache.get(key)
+            if result is not _MISSING:
+                return result
+
+            if single_flight:
+                return call_single_flight(key, args, kwargs)
+            return compute(key, args, kwargs)
+
+        async def compute_async(key, args, kwargs):
+            result, dkey = from_disk(key, args, kwargs)
+            if result is _MISSING:
+                result = await func(*args, **kwargs)
+                store(key, dkey, result)
             return result
-        return wrapper
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            key = build_key(args, kwargs)
+
+            result = cache.get(key)
+            if result is not _MISSING:
+                return result
+
+            if not single_flight:
+                return await compute_async(key, args, kwargs)
+
+            loop = asyncio.get_running_loop()
+            flight_key = (loop, key)
+            task = flights.get(flight_key)
+            if task is None:
+                result = cache.peek(key)
+                if result is not _MISSING:
+                    return result
+                task = loop.create_task(compute_async(key, args, kwargs))
+                flights[flight_key] = task
+                task.add_done_callback(lambda _: flights.pop(flight_key, None))
+            return await asyncio.shield(task)
+
+        decorated = async_wrapper if inspect.iscoroutinefunction(func) else wrapper
+        decorated.cache = cache
+        decorated.cache_info = cache.cache_info
+        decorated.cache_clear = cache.clear
+        decorated.disk = disk
+        return decorated
     return memoize_decorator
 
 # Example usage
@@ -38,4 +382,5 @@ def some_function(arg1, arg2, **kwargs):
     # Your function implementation
     return arg1 + arg2  # Replace with actual computation
 
-print(some_function(3, 4, option='value'))
+if __name__ == "__main__":
+    print(some_function(3, 4, option='value'))
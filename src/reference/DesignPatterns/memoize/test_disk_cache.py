@@ -0,0 +1,166 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import time
+from memoize import memoize, DiskCache, SerializationError
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "memo.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_values_survive_reopen(self):
+        """Test that a new DiskCache on the same file sees earlier entries."""
+        cache = DiskCache(self.path)
+        cache.set("k", {"answer": [4, 2]}, "ns")
+        cache.close()
+        reopened = DiskCache(self.path)
+        self.assertEqual(reopened.get("k"), {"answer": [4, 2]})
+        self.assertEqual(reopened.stats()["namespaces"]["ns"]["entries"], 1)
+        reopened.close()
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        """Test LRU eviction once the byte budget is exceeded."""
+        cache = DiskCache(self.path, max_bytes=250, serializer="json")
+        for i in range(3):
+            cache.set(f"k{i}", "x" * 100)
+            time.sleep(0.01)
+        self.assertIsNone(cache.get("k0", None))
+        self.assertEqual(cache.get("k2"), "x" * 100)
+        self.assertLessEqual(cache.stats()["bytes"], 250)
+        cache.close()
+
+    def test_expired_entries_are_dropped(self):
+        """Test TTL expiry on the disk tier and prune()."""
+        cache = DiskCache(self.path, timeout=1)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        with patch('time.time', return_value=time.time() + 2):
+            self.assertIsNone(cache.get("a", None))
+            self.assertEqual(cache.prune(), 1)
+        self.assertEqual(cache.stats()["entries"], 0)
+        cache.close()
+
+    def test_lossy_serializers_reject_values_that_change(self):
+        """Test that json refuses tuples and sets instead of returning something else later."""
+        cache = DiskCache(self.path, serializer="json")
+        with self.assertRaises(SerializationError):
+            cache.set("t", (1, 2))
+        with self.assertRaises(SerializationError):
+            cache.set("s", {1, 2})
+        cache.set("l", [1, 2])
+        self.assertEqual(cache.get("l"), [1, 2])
+        self.assertEqual(cache.stats()["entries"], 1)
+        cache.close()
+
+    def test_unreadable_rows_are_misses(self):
+        """Test that a row that fails to deserialize is dropped and reported as a miss."""
+        cache = DiskCache(self.path)
+        cache._conn.execute("INSERT INTO entries VALUES ('bad', '', x'00', 1, 0, NULL)")
+        self.assertIsNone(cache.get("bad", None))
+        self.assertEqual((cache.misses, cache.errors), (1, 1))
+        self.assertEqual(cache.stats()["entries"], 0)
+        cache.close()
+
+    def test_set_timeout_overrides_default(self):
+        """Test that a per-entry timeout overrides the cache's own timeout."""
+        cache = DiskCache(self.path)
+        cache.set("a", 1, timeout=1)
+        cache.set("b", 2)
+        with patch('time.time', return_value=time.time() + 2):
+            self.assertIsNone(cache.get("a", None))
+            self.assertEqual(cache.get("b"), 2)
+        cache.close()
+
+    def test_unknown_serializer(self):
+        with self.assertRaises(ValueError):
+            DiskCache(self.path, serializer="yaml")
+
+class TestMemoizeWithDisk(unittest.TestCase):
+    def test_warm_start_reads_from_disk(self):
+        """Test lookup order memory -> disk -> compute across decorator instances."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "memo.sqlite")
+            calls = []
+
+            def expensive(x, scale=1):
+                calls.append(x)
+                return x * scale
+
+            first = memoize(disk=DiskCache(path))(expensive)
+            self.assertEqual(first(3, scale=2), 6)
+            first.disk.close()
+
+            # A fresh decorator simulates a new process with an empty memory tier
+            second = memoize(disk=DiskCache(path))(expensive)
+            self.assertEqual(second(3, scale=2), 6)
+            self.assertEqual(second(3, scale=2), 6)
+            self.assertEqual(calls, [3])
+            self.assertEqual(second.disk.hits, 1)
+            self.assertEqual(second.cache_info().hits, 1)
+            second.disk.close()
+
+    def test_unserializable_results_stay_in_memory(self):
+        """Test that a result the disk cannot store is still returned and memoized in memory."""
+        with tempfile.TemporaryDirectory() as tmp:
+            calls = []
+
+            def make(x):
+                calls.append(x)
+                return {x}
+
+            cached = memoize(disk=DiskCache(os.path.join(tmp, "memo.sqlite"), serializer="json"))(make)
+            with self.assertLogs("memoize", level="WARNING"):
+                self.assertEqual(cached(1), {1})
+            self.assertEqual(cached(1), {1})
+            self.assertEqual(calls, [1])
+            self.assertEqual(cached.disk.stats()["entries"], 0)
+            cached.disk.close()
+
+    def test_disk_errors_fall_back_to_memory(self):
+        """Test that sqlite errors on the disk tier are logged and the memory tier keeps working."""
+        with tempfile.TemporaryDirectory() as tmp:
+            calls = []
+
+            def square(x):
+                calls.append(x)
+                return x * x
+
+            cached = memoize(disk=DiskCache(os.path.join(tmp, "memo.sqlite")))(square)
+            self.assertEqual(cached(3), 9)
+            cached.disk.close()
+            with self.assertLogs("memoize", level="WARNING"):
+                self.assertEqual(cached(4), 16)
+            self.assertEqual(cached(4), 16)
+            self.assertEqual(cached(3), 9)
+            self.assertEqual(calls, [3, 4])
+
+    def test_memoize_timeout_applies_to_disk(self):
+        """Test that memoize(timeout=...) expires disk entries too."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "memo.sqlite")
+            calls = []
+
+            def expensive(x):
+                calls.append(x)
+                return x
+
+            first = memoize(timeout=1, disk=DiskCache(path))(expensive)
+            first(3)
+            first.disk.close()
+
+            second = memoize(timeout=1, disk=DiskCache(path))(expensive)
+            with patch('time.time', return_value=time.time() + 2):
+                second(3)
+            self.assertEqual(calls, [3, 3])
+            second.disk.close()
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
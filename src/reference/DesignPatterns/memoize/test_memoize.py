@@ -1,6 +1,9 @@
+import asyncio
+import dataclasses
+import threading
 import unittest
 from unittest.mock import patch
-from memoize import memoize
+from memoize import memoize, LRUCache, KeyBuilder
 import time
 
 class TestMemoizeDecorator(unittest.TestCase):
@@ -32,6 +35,251 @@ class TestMemoizeDecorator(unittest.TestCase):
             result = self.test_func(7, 8)  # Recalculate as it should be expired
             self.assertEqual(result, 15)
 
+    def test_recently_used_entry_survives_eviction(self):
+        """Test that a cache hit refreshes an entry's LRU position."""
+        calls = []
+
+        @memoize(max_size=2)
+        def tracked(x):
+            calls.append(x)
+            return x
+
+        tracked(1)
+        tracked(2)
+        tracked(1)  # 1 becomes most recently used
+        tracked(3)  # evicts 2
+        tracked(1)
+        self.assertEqual(calls, [1, 2, 3])
+
+    def test_cache_info(self):
+        """Test hit/miss/eviction statistics."""
+        self.test_func(1, 2)
+        self.test_func(1, 2)
+        self.test_func(3, 4)
+        self.test_func(5, 6)
+        info = self.test_func.cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions, info.current_size), (1, 3, 1, 2))
+        self.test_func.cache_clear()
+        self.assertEqual(self.test_func.cache_info().current_size, 0)
+
+    def test_expired_entries_are_counted(self):
+        """Test lazy expiry on lookup."""
+        self.test_func(7, 8)
+        with patch('time.time', return_value=time.time() + 2):
+            self.test_func(7, 8)
+        self.assertEqual(self.test_func.cache_info().expirations, 1)
+
+class TestLRUCacheThreadSafety(unittest.TestCase):
+    def test_concurrent_access_keeps_size_bounded(self):
+        """Test that concurrent sets and gets never exceed max_size or corrupt statistics."""
+        cache = LRUCache(max_size=50)
+
+        def worker(offset):
+            for i in range(2000):
+                key = (offset + i) % 200
+                if cache.get(key, None) is None:
+                    cache.set(key, key)
+
+        threads = [threading.Thread(target=worker, args=(n * 37,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = cache.cache_info()
+        self.assertLessEqual(info.current_size, 50)
+        self.assertEqual(info.hits + info.misses, 8 * 2000)
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_threads_share_one_computation(self):
+        """Test that only the first caller computes while others wait for its result."""
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        @memoize(single_flight=True)
+        def slow(x):
+            calls.append(x)
+            started.set()
+            release.wait(5)
+            return x * 2
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow(21))) for _ in range(8)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, [21])
+        self.assertEqual(results, [42] * 8)
+
+    def test_exceptions_reach_waiters_and_are_not_cached(self):
+        """Test that a failed computation is raised to every waiter and retried afterwards."""
+        attempts = []
+        release = threading.Event()
+
+        @memoize(single_flight=True)
+        def flaky(x):
+            attempts.append(x)
+            if len(attempts) == 1:
+                release.wait(5)
+                raise ValueError("boom")
+            return x
+
+        errors = []
+
+        def call():
+            try:
+                flaky(1)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(flaky(1), 1)
+        self.assertEqual(attempts, [1, 1])
+
+class TestAsyncMemoize(unittest.TestCase):
+    def test_async_single_flight(self):
+        """Test that concurrent awaiters share one computation and its result is cached."""
+        calls = []
+
+        @memoize(single_flight=True)
+        async def fetch(prompt):
+            calls.append(prompt)
+            await asyncio.sleep(0.01)
+            return prompt.upper()
+
+        async def run():
+            results = await asyncio.gather(*(fetch("hi") for _ in range(10)))
+            return results + [await fetch("hi")]
+
+        self.assertEqual(asyncio.run(run()), ["HI"] * 11)
+        self.assertEqual(calls, ["hi"])
+
+    def test_async_exception_propagates_to_all(self):
+        """Test that every awaiter sees the exception and nothing is cached."""
+        calls = []
+
+        @memoize(single_flight=True)
+        async def fail(x):
+            calls.append(x)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("down")
+
+        async def run():
+            return await asyncio.gather(*(fail(1) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        asyncio.run(run())
+        self.assertEqual(calls, [1, 1])
+
+class TestKeyBuilder(unittest.TestCase):
+    def test_unhashable_arguments(self):
+        """Test that list and dict arguments are cached by value."""
+        calls = []
+
+        @memoize()
+        def complete(messages, options):
+            calls.append(1)
+            return len(messages)
+
+        messages = [{"role": "user", "content": "hi"}]
+        complete(messages, {"temperature": 0.2, "top_p": 1})
+        complete([{"content": "hi", "role": "user"}], {"top_p": 1, "temperature": 0.2})
+        complete(messages + [{"role": "assistant", "content": "hello"}], {"temperature": 0.2, "top_p": 1})
+        self.assertEqual(len(calls), 2)
+
+    def test_keyword_and_positional_calls_share_a_key(self):
+        """Test that arguments are bound to the signature with defaults applied."""
+        calls = []
+
+        @memoize()
+        def add(a, b=2):
+            calls.append((a, b))
+            return a + b
+
+        self.assertEqual(add(1, b=2), 3)
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual(add(a=1), 3)
+        self.assertEqual(add(b=2, a=1), 3)
+        self.assertEqual(calls, [(1, 2)])
+
+    def test_var_keyword_order_does_not_matter(self):
+        """Test that **kwargs given in a different order share a key."""
+        build = KeyBuilder(lambda a, **kwargs: None)
+        self.assertEqual(build((1,), {"x": 1, "y": [2]}), build((1,), {"y": [2], "x": 1}))
+
+    def test_types_are_distinguished(self):
+        """Test that values that print alike but differ in type get different keys."""
+        build = KeyBuilder(lambda value: None)
+        keys = {build(([1, 2],), {}), build(((1, 2),), {}), build((["1", "2"],), {}), build(([True, 2],), {})}
+        self.assertEqual(len(keys), 4)
+
+    def test_equal_numbers_of_different_types_do_not_share_results(self):
+        """Test that f(1), f(True) and f(1.0) are cached separately."""
+        @memoize()
+        def kind(value):
+            return type(value).__name__
+
+        self.assertEqual([kind(1), kind(True), kind(1.0), kind((1,)), kind((True,))],
+                         ["int", "bool", "float", "tuple", "tuple"])
+        self.assertEqual(kind.cache_info().current_size, 5)
+
+    def test_dataclass_arguments(self):
+        """Test that dataclass instances are keyed by their field values."""
+        @dataclasses.dataclass
+        class Request:
+            prompt: str
+            stop: list
+
+        calls = []
+
+        @memoize()
+        def run(request):
+            calls.append(request)
+            return request.prompt
+
+        run(Request("hi", ["\n"]))
+        run(Request("hi", ["\n"]))
+        run(Request("hi", ["END"]))
+        self.assertEqual(len(calls), 2)
+
+    def test_custom_key(self):
+        """Test that a key= callable replaces the built-in key."""
+        calls = []
+
+        @memoize(key=lambda prompt, request_id=None: prompt)
+        def answer(prompt, request_id=None):
+            calls.append(request_id)
+            return prompt
+
+        answer("hi", request_id=1)
+        answer("hi", request_id=2)
+        self.assertEqual(calls, [1])
+
+    def test_unkeyable_argument_raises(self):
+        """Test that arguments with no canonical form raise a TypeError pointing at key=."""
+        class Unhashable:
+            __hash__ = None
+
+        @memoize()
+        def f(x):
+            return x
+
+        with self.assertRaisesRegex(TypeError, "key="):
+            f(Unhashable())
+
 def main():
     unittest.main()
 
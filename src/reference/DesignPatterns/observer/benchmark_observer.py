@@ -0,0 +1,84 @@
+# benchmark_observer.py
+# Measures Subject throughput with many observers against a synchronous
+# loop that calls every observer for every event.
+# Use: python3 benchmark_observer.py --observers 1000 --events 100000
+
+import argparse
+import time
+
+from observer import Observer, Subject
+
+
+class CountingObserver(Observer):
+    def __init__(self):
+        super().__init__()
+        self.updates = 0
+        self.last_state = None
+
+    def update(self, subject) -> None:
+        self.updates += 1
+        self.last_state = subject.state
+
+
+class BatchCountingObserver(CountingObserver):
+    def __init__(self):
+        super().__init__()
+        self.events = 0
+
+    def update_batch(self, subject, events) -> None:
+        self.updates += 1
+        self.events += len(events)
+
+
+def run_sync(observers, events):
+    class Holder:
+        state = None
+    holder = Holder()
+    start = time.perf_counter()
+    for i in range(events):
+        holder.state = i
+        for observer in observers:
+            observer.update(holder)
+    return time.perf_counter() - start
+
+
+def run_subject(observers, events, workers, max_pending):
+    subject = Subject(workers=workers, max_pending=max_pending)
+    for observer in observers:
+        subject.attach(observer)
+    start = time.perf_counter()
+    for i in range(events):
+        subject.set_state(i)
+    publish = time.perf_counter() - start
+    subject.drain()
+    total = time.perf_counter() - start
+    stats = subject.stats()
+    subject.close()
+    return publish, total, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Subject fan-out")
+    parser.add_argument("--observers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--sync_events", type=int, default=1000,
+                        help="Events for the synchronous baseline, which is extrapolated to --events")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max_pending", type=int, default=1000)
+    args = parser.parse_args()
+
+    observers = [CountingObserver() for _ in range(args.observers)]
+    sync = run_sync(observers, args.sync_events) * args.events / args.sync_events
+    print(f"synchronous loop: {sync:.2f}s for {args.events} events (extrapolated from {args.sync_events})")
+
+    for label, cls in (("update", CountingObserver), ("update_batch", BatchCountingObserver)):
+        observers = [cls() for _ in range(args.observers)]
+        publish, total, stats = run_subject(observers, args.events, args.workers, args.max_pending)
+        print(f"Subject ({label}): publish {publish:.2f}s, delivered {total:.2f}s, "
+              f"{args.events / total:,.0f} events/s, {stats['flushes']} flushes, "
+              f"{stats['deliveries']} deliveries, {stats['dropped']} dropped")
+        assert all(observer.updates for observer in observers)
+
+
+if __name__ == "__main__":
+    main()
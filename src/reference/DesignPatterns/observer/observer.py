@@ -1,4 +1,10 @@
+import os
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Lock
 
 class Observer(ABC):
     def __init__(self):
@@ -58,3 +64,170 @@ class AdvancedObserver(Observer):
         print(f"Error in AdvancedObserver: {error}")
         # Optionally, you can re-raise the exception if needed for tests
         raise error
+
+
+class _Slot:
+    """Per-observer delivery state: a bounded mailbox, and whether a delivery is queued or running."""
+
+    __slots__ = ("mailbox", "wants_events", "dirty", "running", "dropped", "delivered", "lock")
+
+    def __init__(self, observer, max_pending):
+        self.wants_events = callable(getattr(observer, "update_batch", None))
+        self.mailbox = deque(maxlen=max_pending) if self.wants_events else None
+        self.dirty = False
+        self.running = False
+        self.dropped = 0
+        self.delivered = 0
+        self.lock = Lock()
+
+
+class Subject:
+    """
+    Event hub that notifies observers on a thread pool without letting them slow the publisher down.
+
+    notify() only records the event; a flush job on the pool hands everything published since the last
+    flush to each observer as one batch. Observers are held by weak reference and dropped when collected.
+    Each observer has at most one delivery running at a time, so a slow observer coalesces the changes it
+    falls behind on instead of queueing one job per event:
+
+    - observers with update(subject) are called once per batch and read the latest subject.state;
+    - observers that also define update_batch(subject, events) receive the events themselves, from a
+      mailbox that keeps only the newest max_pending of them (the rest are counted as dropped).
+
+    Exceptions raised by an observer go to its handle_error(), and an error escaping that is counted,
+    so one failing observer never stops delivery to the others.
+    """
+
+    def __init__(self, workers=None, max_pending=1000, batch_interval=0.0):
+        self.state = None
+        self.max_pending = max_pending
+        self.batch_interval = batch_interval
+        self.errors = 0
+        self.events_published = 0
+        self.flushes = 0
+        self._observers = weakref.WeakKeyDictionary()
+        self._events = []
+        self._flush_scheduled = False
+        self._jobs = 0
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._idle = Condition(self._lock)
+        self._executor = ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4),
+                                            thread_name_prefix="subject")
+
+    def attach(self, observer) -> None:
+        with self._lock:
+            if observer not in self._observers:
+                self._observers[observer] = _Slot(observer, self.max_pending)
+
+    def detach(self, observer) -> None:
+        with self._lock:
+            self._observers.pop(observer, None)
+
+    def set_state(self, state) -> None:
+        self.state = state
+        self.notify(state)
+
+    def notify(self, event=None) -> None:
+        with self._lock:
+            self._events.append(event)
+            self.events_published += 1
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+            self._jobs += 1
+        self._executor.submit(self._flush)
+
+    def drain(self, timeout=None) -> bool:
+        """
+        Waits until every published event has been delivered.
+
+        Returns:
+        bool: False if the timeout expired first.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._jobs == 0, timeout)
+
+    def close(self) -> None:
+        self.drain()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            slots = list(self._observers.values())
+            return {
+                "observers": len(slots),
+                "events_published": self.events_published,
+                "flushes": self.flushes,
+                "deliveries": sum(slot.delivered for slot in slots),
+                "dropped": sum(slot.dropped for slot in slots),
+                "errors": self.errors,
+            }
+
+    def _flush(self):
+        try:
+            if self.batch_interval:
+                # Let a burst of changes accumulate so it is delivered as one batch
+                time.sleep(self.batch_interval)
+            # Flushes fan out one at a time so every mailbox receives batches in publish order
+            with self._flush_lock:
+                with self._lock:
+                    events, self._events = self._events, []
+                    self._flush_scheduled = False
+                    self.flushes += 1
+                    observers = list(self._observers.items())
+                self._fan_out(observers, events)
+        finally:
+            self._job_done()
+
+    def _fan_out(self, observers, events):
+        for observer, slot in observers:
+            with slot.lock:
+                if slot.wants_events:
+                    overflow = len(slot.mailbox) + len(events) - self.max_pending
+                    if overflow > 0:
+                        slot.dropped += overflow
+                    slot.mailbox.extend(events)
+                slot.dirty = True
+                if slot.running:
+                    continue
+                slot.running = True
+            with self._lock:
+                self._jobs += 1
+            self._executor.submit(self._deliver, weakref.ref(observer), slot)
+
+    def _deliver(self, observer_ref, slot):
+        try:
+            while True:
+                with slot.lock:
+                    observer = observer_ref()
+                    if not slot.dirty or observer is None:
+                        slot.running = False
+                        return
+                    slot.dirty = False
+                    events = list(slot.mailbox) if slot.wants_events else None
+                    if events is not None:
+                        slot.mailbox.clear()
+                slot.delivered += 1
+                if getattr(observer, "is_active", True) is False:
+                    continue
+                try:
+                    if events is not None:
+                        observer.update_batch(self, events)
+                    else:
+                        observer.update(self)
+                except Exception as e:
+                    try:
+                        observer.handle_error(e)
+                    except Exception:
+                        with self._lock:
+                            self.errors += 1
+                del observer
+        finally:
+            self._job_done()
+
+    def _job_done(self):
+        with self._idle:
+            self._jobs -= 1
+            if self._jobs == 0:
+                self._idle.notify_all()
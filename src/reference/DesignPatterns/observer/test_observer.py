@@ -1,9 +1,13 @@
 # # DesignPatterns/observer/test_observer.py
 
+import gc
+import threading
+import time
+
 import pytest
 from io import StringIO
 from unittest.mock import patch
-from observer import AdvancedObserver
+from observer import AdvancedObserver, Observer, Subject
 
 class MockSubject:
     """ A mock subject class for testing the observer. """
@@ -71,6 +75,124 @@ def test_post_update_hook(observer, mock_subject):
         assert "AdvancedObserver update complete." in mock_stdout.getvalue()
 
 
+class RecordingObserver(Observer):
+    """ Records the subject state it sees on each update. """
+    def __init__(self):
+        super().__init__()
+        self.states = []
+
+    def update(self, subject) -> None:
+        self.states.append(subject.state)
+
+class BatchObserver(RecordingObserver):
+    """ Receives the published events themselves. """
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def update_batch(self, subject, events) -> None:
+        self.events.extend(events)
+
+class FailingObserver(RecordingObserver):
+    def __init__(self):
+        super().__init__()
+        self.errors = []
+
+    def update(self, subject) -> None:
+        raise RuntimeError("boom")
+
+    def handle_error(self, error: Exception):
+        self.errors.append(error)
+
+@pytest.fixture
+def subject():
+    hub = Subject(workers=4)
+    yield hub
+    hub.close()
+
+def test_subject_delivers_latest_state(subject):
+    """ Test that every observer ends up seeing the final state. """
+    observers = [RecordingObserver() for _ in range(10)]
+    for observer in observers:
+        subject.attach(observer)
+    for i in range(100):
+        subject.set_state(i)
+    assert subject.drain(timeout=5)
+    for observer in observers:
+        assert observer.states and observer.states[-1] == 99
+
+def test_batch_observer_receives_every_event_in_order(subject):
+    """ Test that update_batch observers get all events when they keep up. """
+    observer = BatchObserver()
+    subject.attach(observer)
+    for i in range(500):
+        subject.notify(i)
+    subject.drain(timeout=5)
+    assert observer.events == list(range(500))
+
+def test_slow_observer_is_coalesced_and_bounded():
+    """ Test that a slow observer neither blocks the publisher nor queues unbounded work. """
+    release = threading.Event()
+
+    class SlowObserver(BatchObserver):
+        def update_batch(self, subject, events):
+            release.wait(5)
+            super().update_batch(subject, events)
+
+    hub = Subject(workers=4, max_pending=100)
+    slow, fast = SlowObserver(), BatchObserver()
+    hub.attach(slow)
+    hub.attach(fast)
+    start = time.perf_counter()
+    for i in range(1000):
+        hub.notify(i)
+    assert time.perf_counter() - start < 1
+    release.set()
+    hub.close()
+    assert fast.events == sorted(fast.events) and fast.events[-1] == 999
+    assert slow.events == sorted(slow.events) and slow.events[-100:] == list(range(900, 1000))
+    assert hub.stats()["dropped"] > 0
+
+def test_errors_are_isolated_per_observer(subject):
+    """ Test that one failing observer does not stop the others. """
+    failing, healthy = FailingObserver(), RecordingObserver()
+    subject.attach(failing)
+    subject.attach(healthy)
+    subject.set_state("ok")
+    subject.drain(timeout=5)
+    assert healthy.states == ["ok"]
+    assert isinstance(failing.errors[0], RuntimeError)
+
+def test_errors_escaping_handle_error_are_counted(subject):
+    """ Test that AdvancedObserver re-raising from handle_error is contained. """
+    class BrokenSubjectObserver(AdvancedObserver):
+        def update(self, subject):
+            super().update(None)
+
+    observer = BrokenSubjectObserver()
+    subject.attach(observer)
+    with patch('sys.stdout', new_callable=StringIO):
+        subject.notify()
+        subject.drain(timeout=5)
+    assert subject.stats()["errors"] == 1
+
+def test_observers_are_held_weakly(subject):
+    """ Test that a collected observer is dropped from the subject. """
+    observer = RecordingObserver()
+    subject.attach(observer)
+    del observer
+    gc.collect()
+    assert subject.stats()["observers"] == 0
+
+def test_inactive_observers_are_skipped(subject):
+    observer = RecordingObserver()
+    observer.deactivate()
+    subject.attach(observer)
+    subject.set_state(1)
+    subject.drain(timeout=5)
+    assert observer.states == []
+
+
 # import unittest
 # from unittest.mock import patch
 # from observer import Observer, AdvancedObserver
@@ -0,0 +1,81 @@
+# benchmark_prototype.py
+# Measures PrototypeRegistry copy-on-write clones against copy.deepcopy on a
+# NovaComponent graph of ~10k nodes where every node has a SelfReferencingEntity
+# pointing back at it.
+# Use: python3 benchmark_prototype.py --fan_out 100 --clones 20
+
+import argparse
+import copy
+import time
+
+from prototype import NovaComponent, PrototypeRegistry, SelfReferencingEntity
+
+
+def make_node(i, children):
+    entity = SelfReferencingEntity()
+    node = NovaComponent(i, [i, {i, i + 1}, [i, i + 1]] + children, entity)
+    entity.set_parent(node)
+    return node
+
+
+def build_graph(fan_out):
+    """A root with fan_out children, each with fan_out leaves: fan_out ** 2 + fan_out + 1 nodes."""
+    children = [make_node(c, [make_node(c * fan_out + g, []) for g in range(fan_out)]) for c in range(fan_out)]
+    return make_node(-1, children)
+
+
+def mutate(component, touches):
+    """Per-request edits: change the root and append to the lists of a few grandchildren."""
+    component.some_int = 0
+    for t in range(touches):
+        child = component.some_list_of_objects[3 + t]
+        grandchild = child.some_list_of_objects[3 + t]
+        grandchild.some_list_of_objects[2].append("request")
+        grandchild.some_circular_ref.parent.some_int += 1
+
+
+def read_all(component):
+    """Worst case for copy-on-write: every node is visited."""
+    total = 0
+    for child in component.some_list_of_objects[3:]:
+        for grandchild in child.some_list_of_objects[3:]:
+            total += grandchild.some_int
+    return total
+
+
+def measure(label, clone, clones, work=None):
+    start = time.perf_counter()
+    for _ in range(clones):
+        component = clone()
+        if work:
+            work(component)
+    elapsed = (time.perf_counter() - start) / clones * 1000
+    print(f"{label:>36}: {elapsed:9.3f} ms/clone")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark copy-on-write prototype clones against deepcopy")
+    parser.add_argument("--fan_out", type=int, default=100)
+    parser.add_argument("--clones", type=int, default=20)
+    parser.add_argument("--touches", type=int, default=10)
+    args = parser.parse_args()
+
+    template = build_graph(args.fan_out)
+    registry = PrototypeRegistry()
+    start = time.perf_counter()
+    registry.register("agent", template)
+    print(f"{args.fan_out ** 2 + args.fan_out + 1} nodes, registered in {time.perf_counter() - start:.3f}s")
+
+    prototype = registry.get("agent")
+    measure("deepcopy", lambda: copy.deepcopy(prototype), args.clones)
+    measure("registry.clone", lambda: registry.clone("agent"), args.clones)
+    mutate_work = lambda component: mutate(component, args.touches)
+    measure(f"deepcopy + mutate {args.touches}", lambda: copy.deepcopy(prototype), args.clones, mutate_work)
+    measure(f"registry.clone + mutate {args.touches}", lambda: registry.clone("agent"), args.clones, mutate_work)
+    measure("deepcopy + read all", lambda: copy.deepcopy(prototype), args.clones, read_all)
+    measure("registry.clone + read all", lambda: registry.clone("agent"), args.clones, read_all)
+
+
+if __name__ == "__main__":
+    main()
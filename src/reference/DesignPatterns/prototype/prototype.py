@@ -1,4 +1,5 @@
 import copy
+import types
 
 class SelfReferencingEntity:
     def __init__(self):
@@ -28,16 +29,261 @@ class NovaComponent:
         if memo is None:
             memo = {}
 
-        some_list_of_objects = copy.deepcopy(self.some_list_of_objects, memo)
-        some_circular_ref = copy.deepcopy(self.some_circular_ref, memo)
+        # Registered before copying the attributes, so references back to this component (such as
+        # some_circular_ref.parent) resolve to the new copy instead of copying it a second time
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        new.__dict__.update(copy.deepcopy(self.__dict__, memo))
 
-        new = self.__class__(
-            self.some_int, some_list_of_objects, some_circular_ref
-        )
-        new.__dict__ = copy.deepcopy(self.__dict__, memo)
+        return new
+
+_IMMUTABLE_TYPES = (int, float, complex, bool, str, bytes, type(None), frozenset, range, type,
+                    types.FunctionType, types.BuiltinFunctionType)
+
+def _is_immutable(value):
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return True
+    return type(value) is tuple and all(_is_immutable(item) for item in value)
+
+def _slot_names(cls):
+    """Returns the names of the __slots__ declared anywhere in cls's MRO, excluding __dict__/__weakref__."""
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name not in ("__dict__", "__weakref__") and name not in names:
+                # Private slot names are stored mangled
+                if name.startswith("__") and not name.endswith("__"):
+                    name = f"_{klass.__name__.lstrip('_')}{name}"
+                names.append(name)
+    return names
+
+def _reachable_ids(root):
+    """Returns the ids of every mutable object reachable from root, walking iteratively."""
+    seen = set()
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if _is_immutable(value) or id(value) in seen:
+            continue
+        seen.add(id(value))
+        if isinstance(value, (list, set, tuple)):
+            stack.extend(value)
+        elif isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        else:
+            if hasattr(value, "__dict__"):
+                stack.extend(vars(value).values())
+            for name in _slot_names(type(value)):
+                if hasattr(value, name):
+                    stack.append(getattr(value, name))
+    return frozenset(seen)
+
+class _CloneMemo(dict):
+    """
+    Per-clone map from prototype object id to its copy or view, plus the ids that belong to the prototype.
+
+    It doubles as the copy.deepcopy memo for objects that are copied eagerly, so a copied object that
+    points back into the prototype refers to this clone's views, and cycles through it are kept.
+    """
+    __slots__ = ("prototype_ids",)
+
+    def __init__(self, prototype_ids):
+        super().__init__()
+        self.prototype_ids = prototype_ids
+
+def _share(value, memo):
+    """
+    Returns this clone's version of a prototype object.
+
+    Immutable values, and objects the clone's user stored themselves, are returned unchanged. Lists, dicts
+    and sets become real containers of the same type holding this clone's version of each item, built when
+    the container is first reached. Objects become lazy views (see CowObject).
+    """
+    if _is_immutable(value) or id(value) not in memo.prototype_ids:
+        return value
+    shared = memo.get(id(value))
+    if shared is not None:
+        return shared
+    value_type = type(value)
+    # Containers are registered before they are filled so cycles through them resolve to the same copy
+    if value_type is list:
+        shared = memo[id(value)] = []
+        shared.extend(_share(item, memo) for item in value)
+    elif value_type is dict:
+        shared = memo[id(value)] = {}
+        for key, item in value.items():
+            shared[_share(key, memo)] = _share(item, memo)
+    elif value_type is set:
+        shared = memo[id(value)] = set()
+        shared.update(_share(item, memo) for item in value)
+    elif value_type is tuple:
+        shared = memo[id(value)] = tuple(_share(item, memo) for item in value)
+    else:
+        view_class = None
+        if hasattr(value, "__dict__") and not isinstance(value, (list, dict, set, tuple)):
+            view_class = _view_class(value_type)
+        if view_class is not None:
+            shared = memo[id(value)] = view_class._cow_create(value, memo)
+        else:
+            # Objects we cannot view are copied eagerly, through the same memo
+            shared = memo[id(value)] = copy.deepcopy(value, memo)
+    return shared
+
+class CowObject:
+    """
+    Mixin for lazy copy-on-write views of objects in a prototype.
+
+    A view of an object of class C is an instance of a subclass of C (see _view_class), so isinstance(),
+    methods, properties and dunder methods all behave as for C. Immutable attributes are copied into the
+    view's own __dict__ when it is created; every other attribute is copied in, as this clone's version of
+    the prototype's value, the first time it is read. Writes always go to the view. Reading __dict__ (or
+    vars()) copies in any attributes still pending, so it always shows the full instance state. pickle,
+    copy.copy() and copy.deepcopy() produce plain instances of C.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def _cow_create(cls, target, memo):
+        view = cls.__new__(cls)
+        object.__setattr__(view, "_cow_memo", memo)
+        real = cls._cow_dict_descriptor.__get__(view)
+        pending = set()
+        for name, value in target.__dict__.items():
+            if _is_immutable(value):
+                real[name] = value
+            else:
+                pending.add(name)
+        object.__setattr__(view, "_cow_target", target)
+        object.__setattr__(view, "_cow_pending", pending)
+        for name in cls._cow_slot_names:
+            if hasattr(target, name):
+                object.__setattr__(view, name, _share(getattr(target, name), memo))
+        return view
+
+    def _cow_load(self, name):
+        self._cow_pending.discard(name)
+        value = _share(self._cow_target.__dict__[name], self._cow_memo)
+        type(self)._cow_dict_descriptor.__get__(self)[name] = value
+        return value
+
+    def __getattr__(self, name):
+        if name.startswith("_cow_"):
+            # Only reached while a view is being built, before its slots are set
+            raise AttributeError(name)
+        if name in self._cow_pending:
+            return self._cow_load(name)
+        fallback = getattr(type(self._cow_target), "__getattr__", None)
+        if fallback is not None:
+            return fallback(self, name)
+        raise AttributeError(f"{type(self._cow_target).__name__!r} object has no attribute {name!r}")
+
+    def __setattr__(self, name, value):
+        self._cow_pending.discard(name)
+        super().__setattr__(name, value)
 
+    def __delattr__(self, name):
+        if name in self._cow_pending:
+            self._cow_load(name)
+        super().__delattr__(name)
+
+    @property
+    def __dict__(self):
+        real = type(self)._cow_dict_descriptor.__get__(self)
+        for name in list(self._cow_pending):
+            self._cow_load(name)
+        return real
+
+    def _cow_state(self):
+        state = dict(self.__dict__)
+        slots = {name: getattr(self, name) for name in self._cow_slot_names if hasattr(self, name)}
+        return (state, slots) if slots else state
+
+    def __reduce_ex__(self, protocol):
+        cls = type(self._cow_target)
+        return cls.__new__, (cls,), self._cow_state()
+
+    def __copy__(self):
+        cls = type(self._cow_target)
+        new = cls.__new__(cls)
+        new.__dict__.update(self.__dict__)
+        for name in self._cow_slot_names:
+            if hasattr(self, name):
+                setattr(new, name, getattr(self, name))
+        return new
+
+    def __deepcopy__(self, memo):
+        cls = type(self._cow_target)
+        new = cls.__new__(cls)
+        memo[id(self)] = new
+        new.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        for name in self._cow_slot_names:
+            if hasattr(self, name):
+                setattr(new, name, copy.deepcopy(getattr(self, name), memo))
         return new
 
+_view_classes = {}
+
+def _view_class(cls):
+    """Returns the CowObject subclass of cls used for views of cls instances, or None if cls cannot have one."""
+    if cls in _view_classes:
+        return _view_classes[cls]
+    descriptor = next((klass.__dict__["__dict__"] for klass in cls.__mro__ if "__dict__" in klass.__dict__), None)
+    try:
+        view_class = type(f"Cow{cls.__name__}", (CowObject, cls), {
+            "__slots__": ("_cow_target", "_cow_memo", "_cow_pending"),
+            "__module__": cls.__module__,
+            "_cow_dict_descriptor": descriptor,
+            "_cow_slot_names": tuple(_slot_names(cls)),
+            # type() would otherwise give the subclass its own __dict__ descriptor, hiding CowObject's
+            "__dict__": CowObject.__dict__["__dict__"],
+        })
+    except TypeError:
+        # e.g. subclasses of variable-size builtins, which cannot take extra slots
+        view_class = None
+    if descriptor is None:
+        view_class = None
+    _view_classes[cls] = view_class
+    return view_class
+
+class PrototypeRegistry:
+    """
+    Named prototypes that are cloned with structural sharing.
+
+    register() takes a private deep copy of the template, so later changes to the caller's object cannot
+    leak into clones. clone() returns copy-on-write views: each object is a CowObject that shares the
+    prototype's attributes until they are read or written, and each list, dict or set is copied into a real
+    container of its type when first reached. Work is proportional to the part of the prototype a caller
+    touches, not its size. Cycles are preserved: within one clone, every path to the same prototype object
+    yields the same copy. Pass deep=True for a plain copy.deepcopy instead.
+    """
+
+    def __init__(self):
+        self._prototypes = {}
+
+    def register(self, name, template):
+        prototype = copy.deepcopy(template)
+        self._prototypes[name] = (prototype, _reachable_ids(prototype))
+
+    def unregister(self, name):
+        del self._prototypes[name]
+
+    def names(self):
+        return list(self._prototypes)
+
+    def get(self, name):
+        """Returns the registered prototype itself; treat it as read-only, since clones share it."""
+        return self._prototypes[name][0]
+
+    def clone(self, name, deep=False):
+        prototype, prototype_ids = self._prototypes[name]
+        if deep:
+            return copy.deepcopy(prototype)
+        return _share(prototype, _CloneMemo(prototype_ids))
+
 # Example usage
 if __name__ == "__main__":
     list_of_objects = [1, {1, 2, 3}, [1, 2, 3]]
@@ -1,5 +1,13 @@
 import copy
-from prototype import NovaComponent, SelfReferencingEntity
+import json
+import pickle
+from prototype import NovaComponent, PrototypeRegistry, SelfReferencingEntity
+
+def make_template():
+    circular_ref = SelfReferencingEntity()
+    component = NovaComponent(23, [1, {1, 2, 3}, [1, 2, 3], {"model": "gpt"}], circular_ref)
+    circular_ref.set_parent(component)
+    return component
 
 def test_shallow_copy(nova_component):
     shallow_copied_component = copy.copy(nova_component)
@@ -23,6 +31,148 @@ def test_deep_copy(nova_component):
     else:
         print("Deep copy modification not reflected in the original object.")
 
+def test_deep_copy_preserves_cycles():
+    component = make_template()
+    copied = copy.deepcopy(component)
+    assert copied.some_circular_ref.parent is copied
+    assert copied.some_circular_ref is not component.some_circular_ref
+
+def test_registry_clone_shares_until_written():
+    registry = PrototypeRegistry()
+    registry.register("agent", make_template())
+    first, second = registry.clone("agent"), registry.clone("agent")
+
+    first.some_int = 7
+    first.some_list_of_objects.append("new item")
+    first.some_list_of_objects[1].add(4)
+    first.some_list_of_objects[2].append(4)
+    first.some_list_of_objects[3]["model"] = "local"
+
+    assert isinstance(first, NovaComponent)
+    assert first.some_int == 7 and second.some_int == 23
+    assert first.some_list_of_objects == [1, {1, 2, 3, 4}, [1, 2, 3, 4], {"model": "local"}, "new item"]
+    assert second.some_list_of_objects == [1, {1, 2, 3}, [1, 2, 3], {"model": "gpt"}]
+    assert registry.get("agent").some_list_of_objects == [1, {1, 2, 3}, [1, 2, 3], {"model": "gpt"}]
+
+def test_registry_clone_preserves_cycles():
+    registry = PrototypeRegistry()
+    registry.register("agent", make_template())
+    clone = registry.clone("agent")
+    assert clone.some_circular_ref.parent is clone
+    clone.some_circular_ref.parent.some_int = 1
+    assert clone.some_int == 1
+    assert registry.clone("agent").some_int == 23
+
+def test_registry_is_isolated_from_the_template():
+    template = make_template()
+    registry = PrototypeRegistry()
+    registry.register("agent", template)
+    template.some_list_of_objects.append("later")
+    assert "later" not in registry.clone("agent").some_list_of_objects
+
+def test_values_stored_on_a_clone_are_returned_as_is():
+    registry = PrototypeRegistry()
+    registry.register("agent", make_template())
+    clone = registry.clone("agent")
+    history = []
+    clone.history = history
+    assert clone.history is history
+
+def test_deep_clone():
+    registry = PrototypeRegistry()
+    registry.register("agent", make_template())
+    clone = registry.clone("agent", deep=True)
+    assert type(clone) is NovaComponent
+    assert clone.some_circular_ref.parent is clone
+
+def test_clone_set_operators_return_sets():
+    registry = PrototypeRegistry()
+    registry.register("agent", make_template())
+    tags = registry.clone("agent").some_list_of_objects[1]
+    assert tags | {4} == {1, 2, 3, 4}
+    assert tags & {1, 9} == {1}
+    assert tags - {1} == {2, 3}
+    assert type(tags | {4}) is set
+
+def test_clone_list_copy_sort_and_add():
+    registry = PrototypeRegistry()
+    registry.register("agent", make_template())
+    numbers = registry.clone("agent").some_list_of_objects[2]
+    assert type(numbers.copy()) is list and numbers.copy() == [1, 2, 3]
+    assert numbers + [4] == [1, 2, 3, 4]
+    assert [0] + numbers == [0, 1, 2, 3]
+    numbers.sort(reverse=True)
+    assert numbers == [3, 2, 1]
+    assert registry.get("agent").some_list_of_objects[2] == [1, 2, 3]
+
+def test_copying_a_clone_returns_real_instances():
+    registry = PrototypeRegistry()
+    registry.register("agent", make_template())
+    clone = registry.clone("agent")
+    clone.some_int = 5
+    clone.some_list_of_objects[2].append(4)
+
+    deep = copy.deepcopy(clone)
+    assert type(deep) is NovaComponent
+    assert deep.some_int == 5
+    assert deep.some_circular_ref.parent is deep
+    assert type(deep.some_list_of_objects) is list
+    assert deep.some_list_of_objects[2] == [1, 2, 3, 4]
+
+    shallow = copy.copy(clone)
+    assert type(shallow) is NovaComponent and shallow.some_int == 5
+
+def test_clones_stand_in_for_the_prototype_types():
+    registry = PrototypeRegistry()
+    registry.register("agent", make_template())
+    clone = registry.clone("agent")
+    config = clone.some_list_of_objects[3]
+    assert isinstance(clone.some_list_of_objects, list) and isinstance(config, dict)
+    assert json.dumps(config) == '{"model": "gpt"}'
+    assert set(vars(clone)) == {"some_int", "some_list_of_objects", "some_circular_ref"}
+
+    clone.some_int = 5
+    restored = pickle.loads(pickle.dumps(clone))
+    assert type(restored) is NovaComponent and restored.some_int == 5
+    assert restored.some_circular_ref.parent is restored
+    assert restored.some_list_of_objects == [1, {1, 2, 3}, [1, 2, 3], {"model": "gpt"}]
+
+class Sized:
+    def __init__(self, items):
+        self.items = items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __eq__(self, other):
+        return isinstance(other, Sized) and self.items == other.items
+
+def test_clone_forwards_dunders():
+    registry = PrototypeRegistry()
+    registry.register("sized", Sized([1, 2]))
+    clone = registry.clone("sized")
+    assert len(clone) == 2
+    assert clone == Sized([1, 2])
+    clone.items.append(3)
+    assert len(clone) == 3 and len(registry.get("sized")) == 2
+
+class Pointer:
+    __slots__ = ("target",)
+
+    def __init__(self, target):
+        self.target = target
+
+def test_eager_copies_share_the_clone_views():
+    shared = [1, 2]
+    registry = PrototypeRegistry()
+    registry.register("graph", {"list": shared, "tuple": (shared, []), "pointer": Pointer(shared)})
+    clone = registry.clone("graph")
+    assert clone["tuple"][0] is clone["list"]
+    assert clone["pointer"].target is clone["list"]
+    clone["list"].append(3)
+    assert clone["pointer"].target == [1, 2, 3]
+    assert registry.get("graph")["list"] == [1, 2]
+
 def main():
     list_of_objects = [1, {1, 2, 3}, [1, 2, 3]]
     circular_ref = SelfReferencingEntity()
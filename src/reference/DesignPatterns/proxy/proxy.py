@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
+import bisect
 import datetime
-now = datetime.datetime.now()
+import inspect
+import time
+from collections import OrderedDict, deque
+from threading import Event, Lock
 
 class Subject(ABC):
     """
@@ -35,7 +39,253 @@ class Proxy(Subject):
 
     def log_access(self) -> None:
         print("Proxy: Logging the time of request.", end="")
-        print(f"Time: {now.time()}")
+        print(f"Time: {datetime.datetime.now().time()}")
+
+class RateLimitExceeded(Exception):
+    pass
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: `rate` tokens per second are added up to `capacity`, and each call spends one.
+
+    acquire() waits with `sleep`, which should advance the same time source as `clock`.
+    """
+    def __init__(self, rate: float, capacity: float = None, clock=time.monotonic, sleep=time.sleep) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = Lock()
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        Takes tokens if available.
+
+        Returns:
+        float: 0 if the tokens were taken, otherwise the seconds to wait until they will be.
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1, timeout: float = None) -> bool:
+        """
+        Waits for tokens; returns False if that would take longer than timeout.
+
+        Raises:
+        ValueError: If more tokens are asked for than the bucket can ever hold.
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket with capacity {self.capacity}")
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return True
+            if deadline is not None and self.clock() + wait > deadline:
+                return False
+            self.sleep(wait)
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram plus a ring of the most recent calls with their wall-clock timestamps.
+    """
+    DEFAULT_BOUNDS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, bounds=DEFAULT_BOUNDS, recent: int = 1000) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=recent)
+        self._lock = Lock()
+
+    def record(self, started_at: datetime.datetime, latency: float, outcome: str = "ok") -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, latency)] += 1
+            self.count += 1
+            self.total += latency
+            self.max = max(self.max, latency)
+            self.recent.append((started_at, latency, outcome))
+
+    def percentile(self, p: float) -> float:
+        """Returns the upper bound of the bucket holding the p-th percentile (max for the overflow bucket)."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = p / 100 * self.count
+            seen = 0
+            for i, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return self.bounds[i] if i < len(self.bounds) else self.max
+            return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+def _freeze(value):
+    """Returns a hashable, type-tagged stand-in for value, so list and dict arguments can key the cache."""
+    value_type = type(value)
+    if value_type is list or value_type is tuple:
+        return (value_type, tuple(_freeze(item) for item in value))
+    if value_type is dict:
+        return (dict, frozenset((_freeze(k), _freeze(v)) for k, v in value.items()))
+    if value_type is set or value_type is frozenset:
+        return (value_type, frozenset(_freeze(item) for item in value))
+    # Tagged with the type so 1, True and 1.0 stay distinct; unhashable values raise TypeError here
+    hash(value)
+    return (value_type, value)
+
+class CallKey:
+    """
+    Builds cache keys for calls to one function.
+
+    Arguments are bound to the function's signature with defaults applied, so positional, keyword and
+    default spellings of a call share a key. Functions without an introspectable signature are keyed on
+    the raw arguments.
+    """
+    def __init__(self, func) -> None:
+        try:
+            self.signature = inspect.signature(func)
+        except (TypeError, ValueError):
+            self.signature = None
+
+    def __call__(self, args, kwargs):
+        if self.signature is None:
+            return _freeze((args, kwargs))
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return _freeze(bound.arguments)
+
+class _Flight:
+    """A call in progress that concurrent identical requests wait on."""
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result = None
+        self.error = None
+
+class RemoteProxy(Subject):
+    """
+    Proxy for an expensive remote subject such as an LLM or HTTP client.
+
+    request(*args, **kwargs) forwards to the subject's `method`, but first serves results cached within
+    `ttl` seconds, then joins an identical call already in flight, and only then spends a token from the
+    rate limiter and calls the subject. Every real call is timed into `latency` together with the
+    wall-clock time it started. Errors are never cached; they reach the caller and any coalesced waiters.
+
+    Args:
+    subject: The object to wrap.
+    method (str): Name of the subject method to call.
+    ttl (float): Seconds a result stays cached; None caches until evicted, 0 disables caching.
+    max_size (int): Maximum cached results (least recently used are evicted).
+    rate (float): Calls per second allowed through to the subject; None disables rate limiting.
+    burst (float): Token bucket capacity; defaults to max(1, rate).
+    block (bool): Wait for a token (True) or raise RateLimitExceeded (False).
+    key (callable): key(*args, **kwargs) builds a hashable cache key; by default CallKey keys the call, so
+        list and dict arguments such as messages=[...] work.
+    clock, sleep: Time source and matching sleep function, replaceable in tests.
+    """
+    def __init__(self, subject, method: str = "request", ttl: float = 60.0, max_size: int = 1024,
+                 rate: float = None, burst: float = None, block: bool = True, key=None,
+                 clock=time.monotonic, sleep=time.sleep) -> None:
+        self._subject = subject
+        self._call = getattr(subject, method)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.block = block
+        self.clock = clock
+        self.limiter = TokenBucket(rate, burst, clock, sleep) if rate else None
+        self.latency = LatencyHistogram()
+        self._key = (lambda args, kwargs: key(*args, **kwargs)) if key is not None else CallKey(self._call)
+        self._cache = OrderedDict()
+        self._flights = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def request(self, *args, **kwargs):
+        key = self._key(args, kwargs)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry[1] is None or self.clock() < entry[1]:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._cache[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._forward(key, args, kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _forward(self, key, args, kwargs):
+        if self.limiter is not None:
+            if self.block:
+                self.limiter.acquire()
+            elif self.limiter.try_acquire() > 0:
+                raise RateLimitExceeded("Rate limit exceeded for remote subject")
+        started_at = datetime.datetime.now()
+        start = time.perf_counter()
+        try:
+            result = self._call(*args, **kwargs)
+        except Exception:
+            self.latency.record(started_at, time.perf_counter() - start, "error")
+            with self._lock:
+                self.errors += 1
+            raise
+        self.latency.record(started_at, time.perf_counter() - start)
+        if self.ttl != 0:
+            expires_at = None if self.ttl is None else self.clock() + self.ttl
+            with self._lock:
+                self._cache[key] = (result, expires_at)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                     "errors": self.errors, "cached": len(self._cache)}
+        stats["latency"] = self.latency.summary()
+        return stats
 
 # Client code example
 def client_code(subject: Subject) -> None:
@@ -51,3 +301,9 @@ if __name__ == "__main__":
 
     print("\nClient: Executing with Proxy:")
     client_code(proxy)
+
+    print("\nClient: Executing twice with RemoteProxy (the second call is served from cache):")
+    remote = RemoteProxy(real_subject, ttl=30, rate=10)
+    client_code(remote)
+    client_code(remote)
+    print(remote.stats())
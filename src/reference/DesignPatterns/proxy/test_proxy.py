@@ -1,4 +1,36 @@
+import datetime
+import threading
+import time
+
+import pytest
+
 from proxy import RealSubject, Proxy, client_code
+from proxy import CallKey, LatencyHistogram, RateLimitExceeded, RemoteProxy, TokenBucket
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class FakeRemoteSubject:
+    """ In-process stand-in for an LLM or HTTP client. """
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    def complete(self, prompt, temperature=0.0):
+        self.calls.append(prompt)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("remote unavailable")
+        return f"echo: {prompt}"
 
 def test_real_subject():
     print("Testing RealSubject:")
@@ -11,6 +43,132 @@ def test_proxy():
     proxy = Proxy(real_subject)
     client_code(proxy)
 
+def test_remote_proxy_caches_with_ttl():
+    clock = FakeClock()
+    subject = FakeRemoteSubject()
+    proxy = RemoteProxy(subject, method="complete", ttl=10, clock=clock)
+    assert proxy.request("hi") == "echo: hi"
+    assert proxy.request("hi") == "echo: hi"
+    assert proxy.request("hi", temperature=0.5) == "echo: hi"
+    assert len(subject.calls) == 2
+    clock.now = 11
+    proxy.request("hi")
+    assert len(subject.calls) == 3
+    assert proxy.stats()["hits"] == 1
+
+def test_remote_proxy_evicts_least_recently_used():
+    subject = FakeRemoteSubject()
+    proxy = RemoteProxy(subject, method="complete", max_size=2)
+    for prompt in ["a", "b", "a", "c", "a", "b"]:
+        proxy.request(prompt)
+    assert subject.calls == ["a", "b", "c", "b"]
+
+def test_remote_proxy_coalesces_in_flight_requests():
+    subject = FakeRemoteSubject(delay=0.05)
+    proxy = RemoteProxy(subject, method="complete", ttl=0)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(proxy.request("same"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["echo: same"] * 8
+    assert subject.calls == ["same"]
+    assert proxy.stats()["coalesced"] == 7
+
+def test_remote_proxy_errors_are_not_cached():
+    subject = FakeRemoteSubject(fail=True)
+    proxy = RemoteProxy(subject, method="complete")
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            proxy.request("hi")
+    assert len(subject.calls) == 2
+    stats = proxy.stats()
+    assert stats["errors"] == 2
+    assert [outcome for _, _, outcome in proxy.latency.recent] == ["error", "error"]
+
+def test_remote_proxy_rate_limit():
+    clock = FakeClock()
+    proxy = RemoteProxy(FakeRemoteSubject(), method="complete", ttl=0, rate=1, burst=2, block=False, clock=clock)
+    proxy.request("a")
+    proxy.request("b")
+    with pytest.raises(RateLimitExceeded):
+        proxy.request("c")
+    clock.now = 1.0
+    assert proxy.request("c") == "echo: c"
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    assert bucket.try_acquire() == 0 and bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    clock.now = 0.5
+    assert bucket.try_acquire() == 0
+    assert not bucket.acquire(timeout=0.1)
+
+def test_token_bucket_acquire_sleeps_on_the_injected_clock():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=1, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire()
+    started = time.monotonic()
+    assert bucket.acquire()
+    assert bucket.acquire()
+    assert clock.now == pytest.approx(1.0)
+    assert time.monotonic() - started < 0.5
+
+def test_token_bucket_rejects_more_tokens_than_capacity():
+    bucket = TokenBucket(rate=1, capacity=2, clock=FakeClock())
+    with pytest.raises(ValueError):
+        bucket.acquire(3)
+
+def test_remote_proxy_keys_list_and_dict_arguments():
+    class Chat:
+        def __init__(self):
+            self.calls = 0
+
+        def complete(self, messages, options=None):
+            self.calls += 1
+            return messages[-1]["content"]
+
+    chat = Chat()
+    proxy = RemoteProxy(chat, method="complete")
+    messages = [{"role": "user", "content": "hi"}]
+    assert proxy.request(messages) == "hi"
+    assert proxy.request(messages=[{"content": "hi", "role": "user"}], options=None) == "hi"
+    assert proxy.request(messages, {"temperature": 0.5}) == "hi"
+    assert chat.calls == 2
+
+def test_call_key_distinguishes_types_and_handles_builtins():
+    build = CallKey(lambda value: None)
+    assert len({build((1,), {}), build((True,), {}), build((1.0,), {}), build(([1],), {}), build(((1,),), {})}) == 5
+    assert CallKey(len)(([1, 2],), {}) == CallKey(len)(([1, 2],), {})
+
+def test_latency_histogram_records_real_timestamps():
+    proxy = RemoteProxy(FakeRemoteSubject(delay=0.01), method="complete", ttl=0)
+    before = datetime.datetime.now()
+    proxy.request("a")
+    proxy.request("b")
+    (first, first_latency, _), (second, _, _) = proxy.latency.recent
+    assert before <= first <= second
+    assert first_latency >= 0.01
+    summary = proxy.stats()["latency"]
+    assert summary["count"] == 2 and summary["p50"] >= 0.01
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram(bounds=(0.1, 1.0))
+    now = datetime.datetime.now()
+    for latency in [0.05] * 90 + [0.5] * 9 + [3.0]:
+        histogram.record(now, latency)
+    assert histogram.percentile(50) == 0.1
+    assert histogram.percentile(95) == 1.0
+    assert histogram.percentile(100) == 3.0
+
 def main():
     test_real_subject()
     test_proxy()
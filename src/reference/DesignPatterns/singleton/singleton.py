@@ -1,33 +1,158 @@
+from collections.abc import Mapping
 from threading import Lock
+from types import MappingProxyType
 
 class SingletonMeta(type):
     """
     Thread-safe implementation of Singleton for managing AI model configurations.
+
+    Uses double-checked locking: once the instance exists, construction is a plain dict lookup and the
+    lock is only taken while the first instance is being created.
     """
     _instances = {}
     _lock: Lock = Lock()
 
     def __call__(cls, *args, **kwargs):
-        with cls._lock:
-            if cls not in cls._instances:
-                instance = super().__call__(*args, **kwargs)
-                cls._instances[cls] = instance
-        return cls._instances[cls]
+        instance = cls._instances.get(cls)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = super().__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
+        return instance
+
+def _freeze(value):
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+class ConfigSnapshot(Mapping):
+    """
+    Immutable view of a configuration at one version.
+
+    Nested dicts are frozen into read-only mappings and lists into tuples, so a snapshot can be shared
+    across threads and will never change under a reader.
+    """
+    __slots__ = ("_data", "version")
+
+    def __init__(self, data, version):
+        self._data = MappingProxyType({k: _freeze(v) for k, v in data.items()})
+        self.version = version
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(dict(self._data))
+
+class ConfigRegistry:
+    """
+    Versioned configuration store whose readers never take a lock.
+
+    Writers copy the current snapshot, apply their change and publish a new ConfigSnapshot with the next
+    version number in a single attribute assignment. Readers only ever load that attribute, so they always
+    see a whole version, never a half-applied update. Subscribers are called after each publish with the
+    old and new snapshots.
+    """
+
+    def __init__(self, initial=None):
+        self._snapshot = ConfigSnapshot(initial or {}, 0)
+        self._write_lock = Lock()
+        self._subscribers = []
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def snapshot(self):
+        return self._snapshot
+
+    def get(self, key, default=None):
+        return self._snapshot.get(key, default)
+
+    def set(self, key, value):
+        return self.update({key: value})
+
+    def update(self, changes):
+        """
+        Applies several changes as one new version.
+
+        Args:
+        changes (dict): Keys and their new values.
+
+        Returns:
+        ConfigSnapshot: The published snapshot.
+        """
+        with self._write_lock:
+            old = self._snapshot
+            data = dict(old._data)
+            data.update(changes)
+            new = ConfigSnapshot(data, old.version + 1)
+            self._snapshot = new
+            subscribers = list(self._subscribers)
+        self._notify(subscribers, old, new)
+        return new
+
+    def subscribe(self, callback):
+        """
+        Registers callback(old_snapshot, new_snapshot) to run after every change.
+
+        Returns:
+        callable: Call it to unsubscribe.
+        """
+        with self._write_lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._write_lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _notify(self, subscribers, old, new):
+        # Every subscriber runs even if an earlier one fails; the first error is re-raised afterwards
+        first_error = None
+        for callback in subscribers:
+            try:
+                callback(old, new)
+            except Exception as e:
+                if first_error is None:
+                    first_error = e
+        if first_error is not None:
+            raise first_error
 
 class AIModelManager(metaclass=SingletonMeta):
     def __init__(self):
         # Initialize with default configuration
-        self.config = {
+        self.registry = ConfigRegistry({
             "language_model": "GPT-3",
             "response_length": 128,
             "custom_behavior": {}
-        }
+        })
+
+    @property
+    def config(self):
+        return self.registry.snapshot()
 
     def update_config(self, key, value):
-        self.config[key] = value
+        self.registry.set(key, value)
 
     def get_config(self, key):
-        return self.config.get(key, None)
+        return self.registry.get(key)
+
+    def subscribe(self, callback):
+        return self.registry.subscribe(callback)
 
     def perform_ai_logic(self):
         # Method to perform AI-related operations
@@ -1,6 +1,10 @@
 # test_singleton.py
 
-from singleton import AIModelManager
+import threading
+
+import pytest
+
+from singleton import AIModelManager, ConfigRegistry, SingletonMeta
 
 def test_singleton_instance_creation():
     """
@@ -32,10 +36,91 @@ def test_singleton_configuration_persistence():
     assert initial_config != new_config, "Initial and new configurations are the same"
     print("PASS: Singleton configuration persistence test")
 
+def test_concurrent_construction_creates_one_instance():
+    """
+    Test that racing threads all get the same instance of a fresh singleton class.
+    """
+    created = []
+
+    class Service(metaclass=SingletonMeta):
+        def __init__(self):
+            created.append(self)
+
+    barrier = threading.Barrier(8)
+    instances = []
+
+    def worker():
+        barrier.wait()
+        instances.append(Service())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+    assert all(instance is created[0] for instance in instances)
+
+def test_registry_versions_and_snapshots():
+    """
+    Test that each change publishes a new version and old snapshots stay unchanged.
+    """
+    registry = ConfigRegistry({"model": "a", "options": {"stop": ["\n"]}})
+    before = registry.snapshot()
+    registry.set("model", "b")
+    registry.update({"model": "c", "temperature": 0.1})
+    assert registry.version == 2
+    assert before.version == 0 and before["model"] == "a"
+    assert registry.get("model") == "c" and registry.get("temperature") == 0.1
+
+    with pytest.raises(TypeError):
+        before["options"]["stop"] = []
+    assert registry.get("options")["stop"] == ("\n",)
+
+def test_registry_subscriptions():
+    """
+    Test that subscribers see each change until they unsubscribe.
+    """
+    registry = ConfigRegistry({"model": "a"})
+    seen = []
+    unsubscribe = registry.subscribe(lambda old, new: seen.append((old["model"], new["model"], new.version)))
+    registry.set("model", "b")
+    unsubscribe()
+    registry.set("model", "c")
+    assert seen == [("a", "b", 1)]
+
+def test_readers_never_see_partial_updates():
+    """
+    Test that keys written together are always read together.
+    """
+    registry = ConfigRegistry({"low": 0, "high": 0})
+    stop = threading.Event()
+    torn = []
+
+    def reader():
+        while not stop.is_set():
+            snapshot = registry.snapshot()
+            if snapshot["low"] != snapshot["high"]:
+                torn.append(snapshot.version)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for i in range(1, 2000):
+        registry.update({"low": i, "high": i})
+    stop.set()
+    for thread in readers:
+        thread.join()
+    assert torn == []
+    assert registry.version == 1999
 
 def main():
     test_singleton_instance_creation()
     test_singleton_configuration_persistence()
+    test_concurrent_construction_creates_one_instance()
+    test_registry_versions_and_snapshots()
+    test_registry_subscriptions()
+    test_readers_never_see_partial_updates()
 
 if __name__ == "__main__":
     main()
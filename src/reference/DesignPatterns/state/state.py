@@ -1,50 +1,161 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Callable, Optional
+from dataclasses import dataclass, fields
+from typing import Callable, Iterable, Optional
 
 @dataclass
 class StateContext:
     condition: bool = False
     special_case: bool = False
 
+FLAGS = tuple(field.name for field in fields(StateContext))
+
 class State(ABC):
+    """
+    States are stateless flyweights: each subclass has exactly one instance, so ConcreteStateA() is
+    ConcreteStateA(). A state describes its transition in next_state(); handle() prints and applies it.
+    label names the state in handle()'s output.
+    """
+    _instances = {}
+    label = None
+
+    def __new__(cls):
+        instance = State._instances.get(cls)
+        if instance is None:
+            instance = State._instances[cls] = super().__new__(cls)
+        return instance
+
     @abstractmethod
-    def handle(self, context: StateContext) -> None:
+    def next_state(self, data: StateContext) -> 'State':
         pass
 
+    def describe(self) -> str:
+        return f"State {self.label or type(self).__name__} handling context."
+
+    def handle(self, context: 'Context') -> None:
+        print(self.describe())
+        context.change_state(self.next_state(context.context_data))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
 class ConcreteStateA(State):
-    def handle(self, context: StateContext) -> None:
-        print("State A handling context.")
-        next_state = ConcreteStateB() if context.condition else ConcreteStateC()
-        context.change_state(next_state)
+    label = "A"
+
+    def next_state(self, data: StateContext) -> State:
+        return ConcreteStateB() if data.condition else ConcreteStateC()
 
 class ConcreteStateB(State):
-    def handle(self, context: StateContext) -> None:
-        print("State B handling context.")
-        context.change_state(ConcreteStateA())
+    label = "B"
+
+    def next_state(self, data: StateContext) -> State:
+        return ConcreteStateA()
 
 class ConcreteStateC(State):
-    def handle(self, context: StateContext) -> None:
-        print("State C handling context.")
-        next_state = ConcreteStateD() if context.special_case else ConcreteStateA()
-        context.change_state(next_state)
+    label = "C"
+
+    def next_state(self, data: StateContext) -> State:
+        return ConcreteStateD() if data.special_case else ConcreteStateA()
 
 class ConcreteStateD(State):
-    def handle(self, context: StateContext) -> None:
-        print("State D handling context (Special Case).")
-        context.change_state(ConcreteStateA())
+    label = "D"
+
+    def next_state(self, data: StateContext) -> State:
+        return ConcreteStateA()
+
+    def describe(self) -> str:
+        return f"State {self.label} handling context (Special Case)."
+
+def event(condition: bool = False, special_case: bool = False) -> int:
+    """Packs StateContext flags into the integer event that StateMachine.run() consumes."""
+    return int(condition) | int(special_case) << 1
+
+class StateMachine:
+    """
+    Table-driven engine for the State classes above.
+
+    At construction every (state, flags) pair is evaluated once through next_state() and the answers are
+    compiled into a transition table. An event is the StateContext flags packed into an int (see event()),
+    bit i being FLAGS[i]. Each table row is a dict from event to the next row, so run() advances a session
+    with one lookup per event and no allocation, and an event outside the table misses instead of wrapping
+    around into another row. The table holds no session state, so one machine can serve any number of
+    sessions.
+    """
+
+    def __init__(self, states: Iterable[State], initial: State = None) -> None:
+        self.states = list(dict.fromkeys(states))
+        self.initial = initial if initial is not None else self.states[0]
+        self.width = 1 << len(FLAGS)
+        self._rows = [{} for _ in self.states]
+        self._row_of = {state: row for state, row in zip(self.states, self._rows)}
+        self._state_of = {id(row): state for state, row in zip(self.states, self._rows)}
+        for state, row in zip(self.states, self._rows):
+            for bits in range(self.width):
+                data = StateContext(**{name: bool(bits >> i & 1) for i, name in enumerate(FLAGS)})
+                target = state.next_state(data)
+                if target not in self._row_of:
+                    raise ValueError(f"{state!r} can move to {target!r}, which is not one of the machine's states")
+                row[bits] = self._row_of[target]
+
+    def table(self) -> dict:
+        """Returns the compiled transitions as {(state, event): next_state}."""
+        return {(state, bits): self._state_of[id(row[bits])]
+                for state, row in zip(self.states, self._rows) for bits in range(self.width)}
+
+    def step(self, state: State, event: int) -> State:
+        row = self._row_of[state].get(event)
+        if row is None:
+            raise self._bad_event(event)
+        return self._state_of[id(row)]
+
+    def _bad_event(self, event):
+        return ValueError(f"Invalid event {event!r}: events are flag bitmasks in range({self.width})")
+
+    def run(self, events: Iterable[int], state: State = None,
+            trace: Optional[Callable[[State, int, State], None]] = None) -> State:
+        """
+        Feeds a stream of events through the machine.
+
+        Args:
+        events (iterable of int): Packed flag events, each in range(2 ** len(FLAGS)); anything else raises
+            ValueError.
+        state (State): Where the session starts; defaults to the machine's initial state.
+        trace (callable): Optional trace(previous, event, next) called for every transition.
+
+        Returns:
+        State: The state after the last event.
+        """
+        row = self._row_of[state if state is not None else self.initial]
+        if trace is None:
+            try:
+                for event in events:
+                    row = row[event]
+            except KeyError:
+                raise self._bad_event(event) from None
+            return self._state_of[id(row)]
+
+        state_of = self._state_of
+        for event in events:
+            previous = row
+            row = row.get(event)
+            if row is None:
+                raise self._bad_event(event)
+            trace(state_of[id(previous)], event, state_of[id(row)])
+        return state_of[id(row)]
+
+DEFAULT_MACHINE = StateMachine([ConcreteStateA(), ConcreteStateB(), ConcreteStateC(), ConcreteStateD()])
 
 class Context:
-    def __init__(self, state: State):
+    def __init__(self, state: State, machine: StateMachine = None):
         self.state = state
         self.context_data = StateContext()
+        self.machine = machine if machine is not None else DEFAULT_MACHINE
 
     def change_state(self, state: State) -> None:
         self.state = state
 
     def request(self) -> None:
         try:
-            self.state.handle(self.context_data)
+            self.state.handle(self)
         except Exception as e:
             print(f"Error occurred: {e}")
 
@@ -54,6 +165,11 @@ class Context:
     def set_special_case(self, special_case: bool) -> None:
         self.context_data.special_case = special_case
 
+    def run(self, events: Iterable[int], trace: Optional[Callable[[State, int, State], None]] = None) -> State:
+        """Processes a whole event stream through the compiled machine, without printing."""
+        self.state = self.machine.run(events, self.state, trace)
+        return self.state
+
 # Example usage
 if __name__ == "__main__":
     context = Context(ConcreteStateA())
@@ -62,3 +178,9 @@ if __name__ == "__main__":
     context.request()
     context.set_special_case(True)
     context.request()
+
+    transitions = []
+    context.run([event(), event(condition=True), event(special_case=True)] * 2,
+                trace=lambda previous, e, next_state: transitions.append((previous, e, next_state)))
+    for previous, e, next_state in transitions:
+        print(f"{previous!r} --{e}--> {next_state!r}")
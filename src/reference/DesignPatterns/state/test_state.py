@@ -1,5 +1,8 @@
 import unittest
-from state import Context, ConcreteStateA, ConcreteStateB, ConcreteStateC, ConcreteStateD, StateContext
+import random
+
+from state import (Context, ConcreteStateA, ConcreteStateB, ConcreteStateC, ConcreteStateD, StateContext,
+                   StateMachine, DEFAULT_MACHINE, event)
 
 class TestStatePattern(unittest.TestCase):
     def test_initial_state(self):
@@ -31,6 +34,74 @@ class TestStatePattern(unittest.TestCase):
 
     # Optional: Add a test for exception handling if relevant
 
+class TestStateMachine(unittest.TestCase):
+    def test_states_are_singletons(self):
+        """Constructing a state returns its one shared instance."""
+        self.assertIs(ConcreteStateA(), ConcreteStateA())
+        self.assertIsNot(ConcreteStateA(), ConcreteStateB())
+
+    def test_table_matches_handlers(self):
+        """The compiled table agrees with next_state() for every state and flag combination."""
+        for (state, bits), target in DEFAULT_MACHINE.table().items():
+            data = StateContext(condition=bool(bits & 1), special_case=bool(bits & 2))
+            self.assertIs(state.next_state(data), target)
+        self.assertEqual(len(DEFAULT_MACHINE.table()), 16)
+
+    def test_run_matches_request(self):
+        """run() ends in the same state as handling each event through request()."""
+        rng = random.Random(7)
+        flags = [(rng.random() < 0.5, rng.random() < 0.5) for _ in range(500)]
+        slow = Context(ConcreteStateA())
+        for condition, special_case in flags:
+            slow.set_condition(condition)
+            slow.set_special_case(special_case)
+            slow.state = slow.state.next_state(slow.context_data)
+        fast = Context(ConcreteStateA())
+        self.assertIs(fast.run(event(c, s) for c, s in flags), slow.state)
+        self.assertIs(fast.state, slow.state)
+
+    def test_trace(self):
+        """Tracing reports every transition in order."""
+        transitions = []
+        final = DEFAULT_MACHINE.run([event(condition=True), event(), event(special_case=True), event()],
+                                    trace=lambda *t: transitions.append(t))
+        self.assertEqual(transitions, [
+            (ConcreteStateA(), 1, ConcreteStateB()),
+            (ConcreteStateB(), 0, ConcreteStateA()),
+            (ConcreteStateA(), 2, ConcreteStateC()),
+            (ConcreteStateC(), 0, ConcreteStateA()),
+        ])
+        self.assertIs(final, ConcreteStateA())
+
+    def test_step_and_sessions(self):
+        """One machine serves independent sessions from their own start states."""
+        self.assertIs(DEFAULT_MACHINE.step(ConcreteStateC(), event(special_case=True)), ConcreteStateD())
+        self.assertIs(DEFAULT_MACHINE.run([], ConcreteStateD()), ConcreteStateD())
+        self.assertIs(DEFAULT_MACHINE.run([0], ConcreteStateD()), ConcreteStateA())
+
+    def test_unknown_target_rejected(self):
+        """A state that can reach a state outside the machine fails at compile time."""
+        with self.assertRaises(ValueError):
+            StateMachine([ConcreteStateA(), ConcreteStateB()])
+
+    def test_bad_event(self):
+        """Events outside the flag range raise ValueError naming the event instead of wrapping around."""
+        for bad in (4, -1):
+            with self.assertRaisesRegex(ValueError, f"Invalid event {bad}"):
+                DEFAULT_MACHINE.run([0, bad])
+            with self.assertRaisesRegex(ValueError, f"Invalid event {bad}"):
+                DEFAULT_MACHINE.run([bad], trace=lambda *t: None)
+            with self.assertRaises(ValueError):
+                DEFAULT_MACHINE.step(ConcreteStateA(), bad)
+
+    def test_labels_survive_subclassing(self):
+        """handle() output comes from the explicit label, not the class name."""
+        class Greeting(ConcreteStateB):
+            label = "greeting"
+
+        self.assertEqual(ConcreteStateD().describe(), "State D handling context (Special Case).")
+        self.assertEqual(Greeting().describe(), "State greeting handling context.")
+
 def main():
     unittest.main()
 
@@ -0,0 +1,84 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from copy_codebase_to_file import Deduplicator, DuplicateOf, iter_file_contents, write_to_json, write_to_txt, write_to_xml
+
+FILE_DATA = {'pkg/a.py': 'print("héllo")\n', 'pkg/b.py': 'x = "<tag> & more"\n'}
+
+
+class TestStreamingWriters(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_json_matches_json_dump(self):
+        for data in (FILE_DATA, {}):
+            write_to_json(iter(data.items()), self.path('out.json'))
+            with open(self.path('out.json')) as f:
+                self.assertEqual(f.read(), json.dumps(data, indent=4))
+
+    def test_xml_matches_element_tree(self):
+        root = ET.Element("files")
+        for file_path, content in FILE_DATA.items():
+            ET.SubElement(ET.SubElement(root, "file", path=file_path), "content").text = content
+        ET.ElementTree(root).write(self.path('expected.xml'))
+
+        write_to_xml(iter(FILE_DATA.items()), self.path('out.xml'))
+        with open(self.path('out.xml'), 'rb') as out, open(self.path('expected.xml'), 'rb') as expected:
+            self.assertEqual(out.read(), expected.read())
+
+    def test_gzip_output(self):
+        write_to_json(FILE_DATA, self.path('out.json.gz'), compression='gzip')
+        with gzip.open(self.path('out.json.gz'), 'rt') as f:
+            self.assertEqual(json.load(f), FILE_DATA)
+
+
+class TestDeduplication(unittest.TestCase):
+    def test_duplicates_become_references(self):
+        deduplicator = Deduplicator()
+        data = [('a.py', 'same'), ('b.py', 'other'), ('copy/a.py', 'same')]
+        result = list(deduplicator.dedup(data))
+        self.assertEqual(result[2], ('copy/a.py', DuplicateOf('a.py')))
+        self.assertEqual((deduplicator.duplicates, deduplicator.bytes_saved), (1, 4))
+
+    def test_references_in_outputs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data = [('a.py', 'same'), ('copy/a.py', DuplicateOf('a.py'))]
+            write_to_json(data, os.path.join(tmp, 'out.json'))
+            with open(os.path.join(tmp, 'out.json')) as f:
+                self.assertEqual(json.load(f)['copy/a.py'], {'duplicate_of': 'a.py'})
+            write_to_xml(data, os.path.join(tmp, 'out.xml'))
+            elem = ET.parse(os.path.join(tmp, 'out.xml')).getroot()[1]
+            self.assertEqual((elem.get('duplicate_of'), len(elem)), ('a.py', 0))
+            write_to_txt(data, os.path.join(tmp, 'out.txt'))
+            with open(os.path.join(tmp, 'out.txt')) as f:
+                self.assertIn('# File: copy/a.py\n# Duplicate of: a.py\n', f.read())
+
+
+class TestParallelRead(unittest.TestCase):
+    def test_threaded_matches_sequential_order_and_filters(self):
+        with tempfile.TemporaryDirectory() as root:
+            for i in range(120):
+                directory = os.path.join(root, f'pkg{i % 7}')
+                os.makedirs(directory, exist_ok=True)
+                with open(os.path.join(directory, f'm{i}.py' if i % 4 else f'm{i}.txt'), 'w') as f:
+                    f.write('x = 1\n' * (i % 10))
+
+            sequential = list(iter_file_contents(root, 12, None, None, workers=1))
+            threaded = list(iter_file_contents(root, 12, None, None, workers=4, max_pending=2, chunk_size=5))
+            self.assertEqual(threaded, sequential)
+            self.assertTrue(sequential)
+            self.assertTrue(all(path.endswith('.py') and len(content) >= 12 for path, content in sequential))
+
+
+if __name__ == '__main__':
+    unittest.main()
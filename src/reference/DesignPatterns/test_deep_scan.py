@@ -0,0 +1,46 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+from deep_scan import DeepScanPool
+from file_index import hash_file
+
+
+class TestHashFile(unittest.TestCase):
+    def test_buffered_and_mmap_paths_match_hashlib(self):
+        data = os.urandom(300000)
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(data)
+        try:
+            expected = hashlib.sha256(data).hexdigest()
+            self.assertEqual(hash_file(f.name, block_size=4096), expected)
+            self.assertEqual(hash_file(f.name, block_size=4096, mmap_threshold=1), expected)
+        finally:
+            os.remove(f.name)
+
+
+class TestDeepScanPool(unittest.TestCase):
+    def test_results_keep_submission_order(self):
+        pool = DeepScanPool(workers=4, max_pending=2, hasher=lambda path: path.upper())
+        jobs = [(i, f'file{i}' if i % 3 else None, 10) for i in range(20)]
+        results = list(pool.map_ordered(jobs))
+        self.assertEqual([item for item, _, _ in results], list(range(20)))
+        self.assertEqual(results[1][1], 'FILE1')
+        self.assertIsNone(results[3][1])
+        self.assertEqual(pool.throughput()['files'], 13)
+        self.assertEqual(pool.throughput()['bytes'], 130)
+
+    def test_errors_are_reported_per_file(self):
+        def hasher(path):
+            if path == 'bad':
+                raise OSError('unreadable')
+            return 'ok'
+
+        results = list(DeepScanPool(workers=2, hasher=hasher).map_ordered([('a', 'good', 1), ('b', 'bad', 1)]))
+        self.assertEqual(results[0], ('a', 'ok', None))
+        self.assertIsInstance(results[1][2], OSError)
+
+
+if __name__ == '__main__':
+    unittest.main()
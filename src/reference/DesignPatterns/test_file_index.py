@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from file_index import INDEX_FILENAME, FileIndex
+
+
+class TestFileIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.db_path = os.path.join(self.root, 'runs', INDEX_FILENAME)
+        for name in ('a.txt', 'b.txt', 'c.txt'):
+            self.write(name, name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content):
+        with open(os.path.join(self.root, name), 'w') as f:
+            f.write(content)
+
+    def scan(self):
+        hashed = []
+
+        def hasher(path):
+            hashed.append(os.path.basename(path))
+            return 'hash-' + open(path).read()
+
+        index = FileIndex(self.db_path)
+        hashes = {}
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            if os.path.isfile(path):
+                hashes[name] = index.check(name, path, os.stat(path), want_hash=True, hasher=hasher)
+        return index.finish(), hashes, hashed
+
+    def test_first_scan_adds_everything(self):
+        diff, hashes, hashed = self.scan()
+        self.assertEqual(diff['added'], ['a.txt', 'b.txt', 'c.txt'])
+        self.assertEqual(hashes['a.txt'], 'hash-a.txt')
+        self.assertEqual(len(hashed), 3)
+
+    def test_unchanged_files_are_not_rehashed(self):
+        self.scan()
+        diff, hashes, hashed = self.scan()
+        self.assertEqual(diff, {'added': [], 'removed': [], 'modified': []})
+        self.assertEqual(hashes['b.txt'], 'hash-b.txt')
+        self.assertEqual(hashed, [])
+
+    def test_diff_reports_changes(self):
+        self.scan()
+        self.write('a.txt', 'changed content')
+        os.remove(os.path.join(self.root, 'b.txt'))
+        self.write('d.txt', 'new')
+        diff, _, hashed = self.scan()
+        self.assertEqual(diff, {'added': ['d.txt'], 'removed': ['b.txt'], 'modified': ['a.txt']})
+        self.assertEqual(sorted(hashed), ['a.txt', 'd.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import tempfile
+import unittest
+
+from git_history import NOT_AVAILABLE, GitHistory
+
+
+class TestGitHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = self.tmp.name
+        self.git('init', '-q')
+        for n in range(5):
+            self.commit({'a file.txt': f'a{n}', 'b.txt': 'b'} if n == 0 else {'a file.txt': f'a{n}'}, f'change {n}')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def git(self, *args):
+        env = dict(os.environ, GIT_AUTHOR_NAME='t', GIT_AUTHOR_EMAIL='t@t', GIT_COMMITTER_NAME='t', GIT_COMMITTER_EMAIL='t@t')
+        return subprocess.run(['git', *args], cwd=self.repo, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+
+    def commit(self, files, message):
+        for name, content in files.items():
+            with open(os.path.join(self.repo, name), 'w') as f:
+                f.write(content)
+        self.git('add', '-A')
+        self.git('commit', '-q', '-m', message)
+
+    def test_matches_per_file_git_log(self):
+        history = GitHistory(self.repo)
+        for name in ('a file.txt', 'b.txt'):
+            expected = self.git('log', '-n', '3', '--pretty=format:%h - %s (%cr)', '--', name).strip()
+            self.assertEqual(history.get(os.path.join(self.repo, name)), expected)
+        self.assertEqual(len(history.get('a file.txt').splitlines()), 3)
+
+    def test_untracked_and_non_repo_paths(self):
+        self.assertEqual(GitHistory(self.repo).get('missing.txt'), NOT_AVAILABLE)
+        with tempfile.TemporaryDirectory() as not_a_repo:
+            self.assertEqual(GitHistory(not_a_repo).get('x.txt'), NOT_AVAILABLE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# benchmark_visitor.py
+# Measures visiting 1M elements through the classic accept()/visit_* path
+# against the dispatch table (visit), grouped visit_all, and batch handlers.
+# Use: python3 benchmark_visitor.py --elements 1000000
+
+import argparse
+import time
+
+from visitor import ConcreteElementA, ConcreteElementB, Visitor, visits
+
+
+class CountingVisitor(Visitor):
+    def __init__(self):
+        self.a = 0
+        self.b = 0
+
+    def visit_concrete_element_a(self, element):
+        self.a += 1
+
+    def visit_concrete_element_b(self, element):
+        self.b += 1
+
+
+class BatchCountingVisitor(CountingVisitor):
+    @visits(ConcreteElementA, batch=True)
+    def visit_a_group(self, elements):
+        self.a += len(elements)
+
+    @visits(ConcreteElementB, batch=True)
+    def visit_b_group(self, elements):
+        self.b += len(elements)
+
+
+def run_accept(visitor, elements):
+    for element in elements:
+        element.accept(visitor)
+
+
+def run_visit(visitor, elements):
+    visit = visitor.visit
+    for element in elements:
+        visit(element)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Visitor dispatch strategies")
+    parser.add_argument("--elements", type=int, default=1000000)
+    args = parser.parse_args()
+
+    elements = [ConcreteElementA() if i % 3 else ConcreteElementB() for i in range(args.elements)]
+    cases = [
+        ("accept/visit_*", CountingVisitor, run_accept),
+        ("visit (table)", CountingVisitor, run_visit),
+        ("visit_all", CountingVisitor, lambda visitor, items: visitor.visit_all(items)),
+        ("visit_all batch", BatchCountingVisitor, lambda visitor, items: visitor.visit_all(items)),
+    ]
+    baseline = None
+    for name, cls, run in cases:
+        visitor = cls()
+        start = time.perf_counter()
+        run(visitor, elements)
+        elapsed = time.perf_counter() - start
+        assert visitor.a + visitor.b == args.elements
+        baseline = baseline or elapsed
+        print(f"{name:>16}: {elapsed:.3f}s ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch
 from visitor import ConcreteVisitor1, ConcreteVisitor2, ConcreteElementA, ConcreteElementB
+from visitor import DispatchVisitor, visits
 
 class TestConcreteVisitor1(unittest.TestCase):
     @patch('sys.stdout')
@@ -32,6 +33,82 @@ class TestConcreteVisitor2(unittest.TestCase):
         element_b.accept(visitor2)
         mock_stdout.write.assert_called_with("ConcreteElementB + ConcreteVisitor2\n")
 
+class Node:
+    pass
+
+class Call(Node):
+    pass
+
+class Name(Node):
+    pass
+
+class Constant(Node):
+    pass
+
+class CountingVisitor(DispatchVisitor):
+    def __init__(self):
+        self.seen = []
+
+    @visits(Call)
+    def visit_call(self, node):
+        self.seen.append(("call", node))
+
+    @visits(Name, Constant, batch=True)
+    def visit_leaves(self, nodes):
+        self.seen.append(("leaves", len(nodes)))
+
+class FallbackVisitor(CountingVisitor):
+    def generic_visit(self, node):
+        self.seen.append(("generic", node))
+
+class TestDispatchVisitor(unittest.TestCase):
+    def test_visit_uses_decorated_handlers(self):
+        visitor = CountingVisitor()
+        call = Call()
+        visitor.visit(call)
+        visitor.visit(Name())
+        self.assertEqual(visitor.seen, [("call", call), ("leaves", 1)])
+
+    def test_visit_all_groups_by_type(self):
+        """Batch handlers get one call per type group; per-element handlers keep order within the group."""
+        visitor = CountingVisitor()
+        calls = [Call(), Call()]
+        visitor.visit_all([calls[0], Name(), Constant(), calls[1], Name()])
+        self.assertEqual(visitor.seen, [("call", calls[0]), ("call", calls[1]), ("leaves", 2), ("leaves", 1)])
+
+    def test_subclasses_of_handled_types_use_the_handler(self):
+        class AsyncCall(Call):
+            pass
+
+        visitor = CountingVisitor()
+        node = AsyncCall()
+        visitor.visit(node)
+        self.assertEqual(visitor.seen, [("call", node)])
+
+    def test_generic_fallback(self):
+        node = Node()
+        with self.assertRaises(TypeError):
+            CountingVisitor().visit(node)
+        visitor = FallbackVisitor()
+        visitor.visit_all([node, Call()])
+        self.assertEqual(visitor.seen[0], ("generic", node))
+
+    def test_undecorated_override_wins(self):
+        class Override(CountingVisitor):
+            def visit_call(self, node):
+                self.seen.append("override")
+
+        visitor = Override()
+        visitor.visit(Call())
+        self.assertEqual(visitor.seen, ["override"])
+
+    @patch('sys.stdout')
+    def test_existing_visitors_dispatch_by_visit_method(self, mock_stdout):
+        visitor = ConcreteVisitor2()
+        visitor.visit_all([ConcreteElementA(), ConcreteElementB()])
+        mock_stdout.write.assert_any_call("ConcreteElementA + ConcreteVisitor2")
+        mock_stdout.write.assert_any_call("ConcreteElementB + ConcreteVisitor2")
+
 def main():
     unittest.main()
 
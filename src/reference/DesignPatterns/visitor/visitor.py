@@ -1,6 +1,101 @@
 from abc import ABC, abstractmethod
+from collections import deque
+from itertools import repeat
 
-class Visitor(ABC):
+def visits(*element_types, batch=False):
+    """
+    Marks a DispatchVisitor method as the handler for the given element types (and their subclasses).
+
+    Args:
+    element_types (type): Element classes the method handles.
+    batch (bool): If True the method is called once with a list of elements by visit_all().
+    """
+    def decorator(func):
+        func._visits = element_types
+        func._visits_batch = batch
+        return func
+    return decorator
+
+class DispatchVisitor:
+    """
+    Visitor base that dispatches through a per-class type-to-handler table instead of accept().
+
+    Handlers are found, in order, from methods marked with @visits, then from the element class's
+    `visit_method` name (e.g. "visit_concrete_element_a"), walking the element's MRO, and finally from
+    generic_visit(), which subclasses can override as a fallback. Each element type is resolved once per
+    visitor class; after that, dispatch is one dict lookup and a plain function call.
+    """
+    _handlers = {}
+    _dispatch = {}
+    _group_dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        handlers = {}
+        for klass in reversed(cls.__mro__):
+            for name, attr in vars(klass).items():
+                for element_type in getattr(attr, "_visits", ()):
+                    handlers[element_type] = (name, attr._visits_batch)
+        cls._handlers = handlers
+        cls._dispatch = {}
+        cls._group_dispatch = {}
+
+    @classmethod
+    def _resolve(cls, element_type):
+        """Finds and caches the handler for element_type; returns (handler, batch)."""
+        entry = None
+        for klass in element_type.__mro__:
+            handler = cls._handlers.get(klass)
+            if handler is not None:
+                # Looked up by name so an undecorated override in a subclass still wins
+                entry = (getattr(cls, handler[0]), handler[1])
+                break
+            name = vars(klass).get("visit_method")
+            if name is not None and callable(getattr(cls, name, None)):
+                entry = (getattr(cls, name), False)
+                break
+        if entry is None:
+            entry = (cls.generic_visit, False)
+        handler, batch = entry
+        cls._group_dispatch[element_type] = entry
+        cls._dispatch[element_type] = (lambda self, element: handler(self, [element])) if batch else handler
+        return entry
+
+    def generic_visit(self, element):
+        raise TypeError(f"{type(self).__name__} has no handler for {type(element).__name__}")
+
+    def visit(self, element):
+        try:
+            handler = self._dispatch[type(element)]
+        except KeyError:
+            self._resolve(type(element))
+            handler = self._dispatch[type(element)]
+        return handler(self, element)
+
+    def visit_all(self, elements) -> None:
+        """
+        Visits many elements, grouped by type.
+
+        Each type's handler is looked up once per call; batch handlers receive the whole group as a list,
+        others are called per element. Order is kept within a type but not across types.
+        """
+        groups = {}
+        for element in elements:
+            group = groups.get(type(element))
+            if group is None:
+                groups[type(element)] = [element]
+            else:
+                group.append(element)
+        group_dispatch = type(self)._group_dispatch
+        for element_type, group in groups.items():
+            handler, batch = group_dispatch.get(element_type) or self._resolve(element_type)
+            if batch:
+                handler(self, group)
+            else:
+                # Drives the per-element calls from C instead of a Python for loop
+                deque(map(handler, repeat(self), group), maxlen=0)
+
+class Visitor(DispatchVisitor, ABC):
     """
     The Visitor interface declares a set of visiting methods that correspond to
     element classes. The signature of a visiting method allows the visitor to
@@ -38,6 +133,8 @@ class Element(ABC):
         pass
 
 class ConcreteElementA(Element):
+    visit_method = "visit_concrete_element_a"
+
     def accept(self, visitor: Visitor):
         visitor.visit_concrete_element_a(self)
 
@@ -45,6 +142,8 @@ class ConcreteElementA(Element):
         return "ConcreteElementA"
 
 class ConcreteElementB(Element):
+    visit_method = "visit_concrete_element_b"
+
     def accept(self, visitor: Visitor):
         visitor.visit_concrete_element_b(self)
 
@@ -62,3 +161,6 @@ if __name__ == "__main__":
     visitor2 = ConcreteVisitor2()
     for element in elements:
         element.accept(visitor2)
+
+    # The same visits through the dispatch table, grouped by element type
+    visitor1.visit_all(elements)